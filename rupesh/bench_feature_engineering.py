@@ -0,0 +1,79 @@
+# ─────────────────────────────────────────────────────────────
+#  RUPESH — Feature Engineering Benchmark
+#  Rolling case features: per-ward lambda vs vectorised pass
+# ─────────────────────────────────────────────────────────────
+#
+#  Synthesises health data at 1x / 100x / 1000x the row count of
+#  datasets/health_sample.csv (more wards *and* longer history)
+#  and times both implementations.
+#
+#  Run:  python -m rupesh.bench_feature_engineering [--scales 1 100 1000]
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import DATA_DIR, ROLLING_WINDOWS, compute_rolling_features
+
+SAMPLE_WARDS = 3
+SAMPLE_DAYS_PER_WARD = 8
+
+
+def synthetic_health(scale: int, seed: int = 42) -> pd.DataFrame:
+    k = math.ceil(math.sqrt(scale))
+    n_wards = SAMPLE_WARDS * k
+    n_days = math.ceil(SAMPLE_DAYS_PER_WARD * scale / k)
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "ward_id": np.repeat(np.arange(1, n_wards + 1), n_days),
+        "report_date": np.tile(pd.date_range("2020-01-01", periods=n_days, freq="D"), n_wards),
+        "cases_reported": rng.poisson(6, n_wards * n_days),
+    })
+
+
+def legacy_rolling(df: pd.DataFrame) -> pd.DataFrame:
+    """The previous per-ward lambda implementation, one transform per window/statistic."""
+    df = df.sort_values(["ward_id", "report_date"])
+    grouped = df.groupby("ward_id")["cases_reported"]
+    for w in ROLLING_WINDOWS:
+        for stat, suffix in (("mean", "avg"), ("sum", "sum"), ("max", "max")):
+            df[f"cases_{w}d_{suffix}"] = grouped.transform(
+                lambda x: getattr(x.rolling(w, min_periods=1), stat)()
+            )
+    df["cases_ewm7"] = grouped.transform(lambda x: x.ewm(span=7, adjust=False).mean())
+    return df
+
+
+def _best_of(fn, df: pd.DataFrame, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(df.copy())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(scales, repeats: int = 3):
+    base_rows = len(pd.read_csv(DATA_DIR / "health_sample.csv"))
+    print(f"Sample CSV rows: {base_rows} | windows {ROLLING_WINDOWS} × mean/sum/max + EWMA")
+    print(f"{'scale':>6} {'rows':>10} {'wards':>6} {'legacy s':>10} {'vector s':>10} {'speedup':>8}")
+    for scale in scales:
+        df = synthetic_health(scale)
+        legacy = _best_of(legacy_rolling, df, repeats)
+        vector = _best_of(compute_rolling_features, df, repeats)
+        print(
+            f"{scale:>5}x {len(df):>10,} {df['ward_id'].nunique():>6} "
+            f"{legacy:>10.4f} {vector:>10.4f} {legacy / vector:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rolling case-feature benchmark")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(args.scales, args.repeats)
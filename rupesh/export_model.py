@@ -0,0 +1,167 @@
+# ─────────────────────────────────────────────────────────────
+#  RUPESH — Serving Export
+#  Writes trained models in formats tarun can load without
+#  unpickling sklearn / XGBoost objects
+# ─────────────────────────────────────────────────────────────
+#
+#  For every trained model:
+#    trained_models/<family>_h<N>.npz  ← flattened tree arrays (all families)
+#    trained_models/xgb_h<N>.ubj       ← XGBoost native booster (portable)
+#
+#  .npz layout — every tree's nodes concatenated, child indices global:
+#    feature      int32    split feature per node (0 at leaves)
+#    threshold    float64  go left iff x < threshold
+#    left, right  int32    children; leaves point to themselves
+#    default_left bool     direction for NaN inputs
+#    value        float64  leaf output (margin for xgb, P(class 1) for rf)
+#    roots        int32    root node of each tree
+#    depth        int      maximum tree depth
+#    link         str      "logistic" → sigmoid(base_margin + Σ trees)
+#                          "mean"     → mean over trees
+#    base_margin  float64
+#    source_sha256 str     SHA-256 of the .pkl it was compiled from;
+#                          tarun builds model_version from it, so the
+#                          .npz and the .pkl report the same version
+#
+#  Inputs are compared as float32, as both XGBoost and sklearn do.
+#
+#  Run:  python -m rupesh.export_model        (re-export every .pkl in trained_models/)
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import joblib
+import numpy as np
+
+MODELS_DIR = Path(__file__).parent / "trained_models"
+
+
+def _flatten(trees: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Concatenate per-tree node arrays, offsetting children and looping leaves."""
+    parts = {k: [] for k in ("feature", "threshold", "left", "right", "default_left", "value")}
+    roots, depth, offset = [], 0, 0
+    for tree in trees:
+        n = len(tree["left"])
+        is_leaf = tree["left"] < 0
+        own = np.arange(n) + offset
+        parts["feature"].append(np.where(is_leaf, 0, tree["feature"]))
+        parts["threshold"].append(np.where(is_leaf, 0.0, tree["threshold"]))
+        parts["left"].append(np.where(is_leaf, own, tree["left"] + offset))
+        parts["right"].append(np.where(is_leaf, own, tree["right"] + offset))
+        parts["default_left"].append(tree["default_left"].astype(bool))
+        parts["value"].append(np.where(is_leaf, tree["value"], 0.0))
+        roots.append(offset)
+        depth = max(depth, _depth(tree["left"], tree["right"]))
+        offset += n
+
+    arrays = {k: np.concatenate(v) for k, v in parts.items()}
+    arrays["feature"] = arrays["feature"].astype(np.int32)
+    arrays["left"] = arrays["left"].astype(np.int32)
+    arrays["right"] = arrays["right"].astype(np.int32)
+    arrays["roots"] = np.asarray(roots, dtype=np.int32)
+    arrays["depth"] = np.asarray(depth)
+    return arrays
+
+
+def _depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth, level = 0, [0]
+    while True:
+        level = [c for n in level for c in (left[n], right[n]) if c >= 0]
+        if not level:
+            return depth
+        depth += 1
+
+
+def compile_xgb(model) -> Dict[str, np.ndarray]:
+    booster = model.get_booster()
+    learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+    if learner["gradient_booster"]["name"] != "gbtree" or learner["objective"]["name"] != "binary:logistic":
+        raise ValueError("Only gbtree boosters with binary:logistic can be compiled")
+
+    trees = learner["gradient_booster"]["model"]["trees"]
+    # predict_proba stops at best_iteration when the model was early-stopped
+    best = getattr(model, "best_iteration", None)
+    if best is not None:
+        parallel = int(learner["gradient_booster"]["model"]["gbtree_model_param"]["num_parallel_tree"])
+        trees = trees[: (best + 1) * parallel]
+
+    base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+    arrays = _flatten([
+        {
+            "feature": np.asarray(t["split_indices"]),
+            # XGBoost compares float32(x) < float32(split)
+            "threshold": np.asarray(t["split_conditions"], dtype=np.float32).astype(np.float64),
+            "left": np.asarray(t["left_children"]),
+            "right": np.asarray(t["right_children"]),
+            "default_left": np.asarray(t["default_left"]),
+            "value": np.asarray(t["split_conditions"], dtype=np.float32).astype(np.float64),
+        }
+        for t in trees
+    ])
+    arrays["link"] = np.asarray("logistic")
+    arrays["base_margin"] = np.asarray(np.log(base_score / (1 - base_score)))
+    return arrays
+
+
+def compile_forest(model) -> Dict[str, np.ndarray]:
+    positive = list(model.classes_).index(1)
+    trees = []
+    for estimator in model.estimators_:
+        t = estimator.tree_
+        counts = t.value[:, 0, :]
+        trees.append({
+            "feature": t.feature,
+            # sklearn goes left on x <= t; the next float up makes that a strict x < t'
+            "threshold": np.nextafter(t.threshold, np.inf),
+            "left": t.children_left,
+            "right": t.children_right,
+            "default_left": getattr(t, "missing_go_to_left", np.zeros(t.node_count, dtype=bool)),
+            "value": counts[:, positive] / counts.sum(axis=1),
+        })
+    arrays = _flatten(trees)
+    arrays["link"] = np.asarray("mean")
+    arrays["base_margin"] = np.asarray(0.0)
+    return arrays
+
+
+COMPILERS = {"xgb": compile_xgb, "rf": compile_forest}
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def export_model(model, family: str, horizon_days: int, models_dir: Path = MODELS_DIR) -> List[Path]:
+    """Write the serving artefacts for one trained model (after its .pkl). Returns the paths written."""
+    written = []
+    if family == "xgb":
+        path = models_dir / f"xgb_h{horizon_days}.ubj"
+        model.get_booster().save_model(str(path))
+        written.append(path)
+    if family in COMPILERS:
+        path = models_dir / f"{family}_h{horizon_days}.npz"
+        # Write then rename so tarun never hot-reloads a half-written file
+        tmp = path.with_suffix(".tmp.npz")
+        arrays = COMPILERS[family](model)
+        pkl = models_dir / f"{family}_h{horizon_days}.pkl"
+        arrays["source_sha256"] = np.asarray(_sha256(pkl) if pkl.exists() else "")
+        np.savez(tmp, **arrays)
+        tmp.replace(path)
+        written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    for pkl in sorted(MODELS_DIR.glob("*_h*.pkl")):
+        family, horizon = pkl.stem.split("_h")
+        if family not in COMPILERS:
+            continue
+        for path in export_model(joblib.load(pkl), family, int(horizon)):
+            print(f"{pkl.name} → {path.name}")
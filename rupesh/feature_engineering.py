@@ -6,28 +6,78 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from typing import List, Optional
+from .data_loading import read_health, read_water
 
 DATA_DIR = Path(__file__).parent / "datasets"
 
 
-def load_health_data() -> pd.DataFrame:
-    """Load ward-level health case data."""
-    return pd.read_csv(DATA_DIR / "health_sample.csv", parse_dates=["report_date"])
+def load_health_data(path: Optional[Path] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load ward-level health case data (CSV/Parquet/Feather, compact dtypes)."""
+    return read_health(path or DATA_DIR / "health_sample.csv", columns)
 
 
-def load_water_quality_data() -> pd.DataFrame:
-    """Load water quality samples."""
-    return pd.read_csv(DATA_DIR / "water_quality_sample.csv", parse_dates=["sample_date"])
+def load_water_quality_data(path: Optional[Path] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load water quality samples (CSV/Parquet/Feather, compact dtypes)."""
+    return read_water(path or DATA_DIR / "water_quality_sample.csv", columns)
+
+
+ROLLING_WINDOWS = (3, 7, 14, 28)
+ROLLING_STATS = ("mean", "sum", "max")
+
+
+def compute_rolling_features(
+    df: pd.DataFrame,
+    column: str = "cases_reported",
+    windows: tuple = ROLLING_WINDOWS,
+    stats: tuple = ROLLING_STATS,
+    ewm_span: Optional[int] = 7,
+    prefix: str = "cases",
+) -> pd.DataFrame:
+    """
+    Per-ward trailing-window statistics of `column` for several windows in one pass.
+
+    Windows count rows (one report per ward per day), matching
+    rolling(window, min_periods=1). Sums and means come from a single
+    cumulative sum over the sorted array; max and EWMA use pandas'
+    grouped rolling/ewm kernels — no Python call per ward.
+
+    Adds `{prefix}_{w}d_{avg|sum|max}` for each window and `{prefix}_ewm{span}`.
+    """
+    df = df.sort_values(["ward_id", "report_date"], kind="stable")
+    values = df[column].to_numpy(dtype="float64", na_value=np.nan)
+    valid = ~np.isnan(values)
+
+    n = len(values)
+    idx = np.arange(n)
+    group_start = idx - df.groupby("ward_id", sort=False, observed=True).cumcount().to_numpy()
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+
+    grouped = df.groupby("ward_id", sort=False, observed=True)[column]
+    for w in windows:
+        lo = np.maximum(idx + 1 - w, group_start)
+        window_sum = csum[idx + 1] - csum[lo]
+        window_count = ccount[idx + 1] - ccount[lo]
+        has_data = window_count > 0
+        if "sum" in stats:
+            df[f"{prefix}_{w}d_sum"] = np.where(has_data, window_sum, np.nan)
+        if "mean" in stats:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                df[f"{prefix}_{w}d_avg"] = np.where(has_data, window_sum / window_count, np.nan)
+        if "max" in stats:
+            # Data is sorted by ward, so grouped output is already in row order
+            df[f"{prefix}_{w}d_max"] = grouped.rolling(w, min_periods=1).max().to_numpy()
+
+    if ewm_span:
+        df[f"{prefix}_ewm{ewm_span}"] = grouped.ewm(span=ewm_span, adjust=False).mean().to_numpy()
+    return df
 
 
 def compute_rolling_case_rate(df: pd.DataFrame, window: int = 7) -> pd.DataFrame:
     """7-day rolling average of cases per ward."""
-    df = df.sort_values(["ward_id", "report_date"])
-    df["cases_7d_avg"] = (
-        df.groupby("ward_id")["cases_reported"]
-        .transform(lambda x: x.rolling(window, min_periods=1).mean())
-    )
-    return df
+    df = compute_rolling_features(df, windows=(window,), stats=("mean",), ewm_span=None)
+    return df.rename(columns={f"cases_{window}d_avg": "cases_7d_avg"})
 
 
 def compute_water_risk_score(df: pd.DataFrame) -> pd.DataFrame:
@@ -41,47 +91,108 @@ def compute_water_risk_score(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def build_feature_matrix(
+WATER_LOOKBACK_DAYS = 14
+
+
+def _naive_utc(ts: pd.Series) -> pd.Series:
+    ts = pd.to_datetime(ts)
+    return ts.dt.tz_convert(None) if ts.dt.tz is not None else ts
+
+
+def asof_water_features(
     health: pd.DataFrame,
     water: pd.DataFrame,
-    horizon_days: int = 7,
+    lookback_days: int = WATER_LOOKBACK_DAYS,
 ) -> pd.DataFrame:
     """
-    Merge all feature sources for a given prediction horizon.
-    Returns feature matrix X and target y (outbreak flag).
+    Point-in-time water aggregates for every health row.
+
+    For each (ward_id, report_date) only samples with
+    report_date - lookback_days < sample_date <= report_date are used,
+    so no future reading leaks into a past row. Health rows are
+    interleaved into the sorted water timeline as empty query points
+    and a time-based grouped rolling window is evaluated once:
+    O((n + m) log(n + m)) for the sort, linear afterwards.
+
+    Returns avg_water_risk / max_coliform / avg_ph aligned to health.index.
     """
-    health = compute_rolling_case_rate(health)
-    water = compute_water_risk_score(water)
+    samples = pd.DataFrame({
+        "ward_id": water["ward_id"].to_numpy(),
+        "_t": _naive_utc(water["sample_date"]).to_numpy(),
+        "_order": 0,
+        "_row": -1,
+        "water_risk": water["water_risk"].to_numpy(dtype="float64", na_value=np.nan),
+        "coliform_cfu": water["coliform_cfu"].to_numpy(dtype="float64", na_value=np.nan),
+        "ph": water["ph"].to_numpy(dtype="float64", na_value=np.nan),
+    })
+    queries = pd.DataFrame({
+        "ward_id": health["ward_id"].to_numpy(),
+        "_t": _naive_utc(health["report_date"]).to_numpy(),
+        "_order": 1,  # at equal timestamps, samples sort before the query
+        "_row": np.arange(len(health)),
+    })
+    timeline = (
+        pd.concat([samples, queries], ignore_index=True)
+        .sort_values(["ward_id", "_t", "_order"], kind="stable")
+        .reset_index(drop=True)
+    )
+
+    rolling = timeline.groupby("ward_id", sort=False, observed=True).rolling(
+        f"{lookback_days}D", on="_t", closed="right"
+    )
+    # Rolling stats skip the NaN query rows; output is in timeline row order
+    stats = pd.DataFrame({
+        "avg_water_risk": rolling["water_risk"].mean().to_numpy(),
+        "max_coliform": rolling["coliform_cfu"].max().to_numpy(),
+        "avg_ph": rolling["ph"].mean().to_numpy(),
+    })
+
+    is_query = (timeline["_order"] == 1).to_numpy()
+    out = np.full((len(health), 3), np.nan)
+    out[timeline.loc[is_query, "_row"].to_numpy()] = stats.to_numpy()[is_query]
+    return pd.DataFrame(out, columns=stats.columns, index=health.index)
+
+
+MODEL_FEATURES = ["cases_7d_avg", "avg_water_risk", "max_coliform", "avg_ph"]
 
-    # Create target: did cases spike horizon_days later?
+
+def add_outbreak_target(health: pd.DataFrame, horizon_days: int) -> pd.DataFrame:
+    """Target: did cases horizon_days later exceed 1.5× the 7-day average?"""
     health = health.sort_values(["ward_id", "report_date"])
     health["future_cases"] = (
-        health.groupby("ward_id")["cases_reported"]
+        health.groupby("ward_id", observed=True)["cases_reported"]
         .shift(-horizon_days)
     )
-    health["outbreak_risk"] = (health["future_cases"] > health["cases_7d_avg"] * 1.5).astype(int)
-
-    # Merge on ward_id + nearest date
-    water_agg = (
-        water.groupby("ward_id")
-        .agg(
-            avg_water_risk=("water_risk", "mean"),
-            max_coliform=("coliform_cfu", "max"),
-            avg_ph=("ph", "mean"),
-        )
-        .reset_index()
-    )
+    # Nullable Int16 counts give <NA> past the end of the series; treat as "no spike"
+    spike = health["future_cases"] > health["cases_7d_avg"] * 1.5
+    health["outbreak_risk"] = spike.fillna(False).astype(int)
+    return health
+
+
+def build_base_features(health: pd.DataFrame, water: pd.DataFrame) -> pd.DataFrame:
+    """Horizon-independent features: rolling case rate + point-in-time water aggregates."""
+    health = compute_rolling_case_rate(health)
+    water = compute_water_risk_score(water)
+    # Point-in-time join: only water samples from the lookback window before each report
+    return health.join(asof_water_features(health, water))
 
-    merged = health.merge(water_agg, on="ward_id", how="left")
 
-    feature_cols = [
-        "ward_id",
-        "cases_7d_avg",
-        "avg_water_risk",
-        "max_coliform",
-        "avg_ph",
-    ]
-    return merged[feature_cols + ["outbreak_risk"]].dropna()
+def feature_matrix_for_horizon(base: pd.DataFrame, horizon_days: int) -> pd.DataFrame:
+    """Attach the outbreak target for one horizon to build_base_features() output."""
+    df = add_outbreak_target(base, horizon_days)
+    return df[["ward_id"] + MODEL_FEATURES + ["outbreak_risk"]].dropna()
+
+
+def build_feature_matrix(
+    health: pd.DataFrame,
+    water: pd.DataFrame,
+    horizon_days: int = 7,
+) -> pd.DataFrame:
+    """
+    Merge all feature sources for a given prediction horizon.
+    Returns feature matrix X and target y (outbreak flag).
+    """
+    return feature_matrix_for_horizon(build_base_features(health, water), horizon_days)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,310 @@
+# ─────────────────────────────────────────────────────────────
+#  RUPESH — Incremental Feature Store
+#  Persisted per-ward features so new data only recomputes tails
+# ─────────────────────────────────────────────────────────────
+#
+#  Layout (Parquet, partitioned by ward and month):
+#    feature_store/
+#    ├── health/ward_id=<id>/month=<YYYY-MM>/part.parquet  ← raw cases + all features
+#    ├── water/ward_id=<id>/month=<YYYY-MM>/part.parquet   ← scored water samples
+#    └── latest.parquet                                    ← newest row per ward (serving)
+#
+#  append() finds, per ward, the earliest date touched by the new
+#  health or water rows and recomputes only rows from that date on,
+#  using the previous max(ROLLING_WINDOWS) - 1 rows and the stored
+#  EWMA value as rolling state. Late-arriving data is handled the
+#  same way — the tail simply starts earlier.
+#
+#  Run:  python -m rupesh.feature_store rebuild
+#        python -m rupesh.feature_store ingest --health h.parquet --water w.parquet
+# ─────────────────────────────────────────────────────────────
+
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .data_loading import DEFAULT_CHUNK_ROWS, iter_health_chunks, iter_water_chunks
+from .feature_engineering import (
+    MODEL_FEATURES,
+    ROLLING_WINDOWS,
+    WATER_LOOKBACK_DAYS,
+    _naive_utc,
+    add_outbreak_target,
+    asof_water_features,
+    compute_rolling_features,
+    compute_water_risk_score,
+    load_health_data,
+    load_water_quality_data,
+)
+
+STORE_DIR = Path(__file__).parent / "feature_store"
+
+EWM_SPAN = 7
+EWM_COL = f"cases_ewm{EWM_SPAN}"
+CONTEXT_ROWS = max(ROLLING_WINDOWS) - 1
+WATER_FEATURES = ["avg_water_risk", "max_coliform", "avg_ph"]
+
+
+def _is_feature_column(col: str) -> bool:
+    return (col.startswith("cases_") and col != "cases_reported") or col in WATER_FEATURES
+
+
+def _month(ts: pd.Series) -> pd.Series:
+    return ts.dt.strftime("%Y-%m")
+
+
+class FeatureStore:
+    def __init__(self, root: Path = STORE_DIR, lookback_days: int = WATER_LOOKBACK_DAYS):
+        self.root = Path(root)
+        self.lookback_days = lookback_days
+
+    # ── Partition I/O ─────────────────────────────────────────
+
+    def _ward_dir(self, kind: str, ward) -> Path:
+        return self.root / kind / f"ward_id={ward}"
+
+    def _months(self, kind: str, ward) -> List[str]:
+        ward_dir = self._ward_dir(kind, ward)
+        if not ward_dir.exists():
+            return []
+        return sorted(p.name.split("=", 1)[1] for p in ward_dir.iterdir() if p.name.startswith("month="))
+
+    def _read(self, kind: str, ward, months: List[str]) -> pd.DataFrame:
+        frames = [
+            pd.read_parquet(self._ward_dir(kind, ward) / f"month={m}" / "part.parquet")
+            for m in months
+        ]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _write(self, kind: str, df: pd.DataFrame, date_col: str) -> None:
+        for (ward, month), part in df.groupby(["ward_id", _month(df[date_col])], sort=False, observed=True):
+            path = self._ward_dir(kind, ward) / f"month={month}" / "part.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            part.sort_values(date_col).to_parquet(path, index=False)
+
+    @staticmethod
+    def _water_key(water: pd.DataFrame) -> List[str]:
+        return ["ward_id", "sample_date"] + (["source_type"] if "source_type" in water.columns else [])
+
+    def _merge_water(self, water: pd.DataFrame) -> None:
+        """Upsert scored water samples into their ward/month partitions."""
+        key = self._water_key(water)
+        merged = []
+        for (ward, month), part in water.groupby(["ward_id", _month(water["sample_date"])], sort=False, observed=True):
+            existing = self._read("water", ward, [m for m in self._months("water", ward) if m == month])
+            merged.append(
+                pd.concat([existing, part], ignore_index=True).drop_duplicates(key, keep="last")
+            )
+        if merged:
+            self._write("water", pd.concat(merged, ignore_index=True), "sample_date")
+
+    # ── Build / update ────────────────────────────────────────
+
+    def rebuild(self, health: pd.DataFrame, water: pd.DataFrame) -> int:
+        """Recompute every feature from scratch. Returns the number of feature rows written."""
+        for kind in ("health", "water"):
+            shutil.rmtree(self.root / kind, ignore_errors=True)
+
+        health, water = self._prepare(health, water)
+        water = water.drop_duplicates(self._water_key(water), keep="last")
+        features = compute_rolling_features(health, ewm_span=EWM_SPAN)
+        features = features.join(asof_water_features(features, water, self.lookback_days))
+
+        self._write("water", water, "sample_date")
+        self._write("health", features, "report_date")
+        self._write_latest(features, replace_all=True)
+        return len(features)
+
+    def append(self, health: Optional[pd.DataFrame] = None, water: Optional[pd.DataFrame] = None) -> int:
+        """
+        Add new health reports and/or water samples, recomputing only the
+        affected tail of each ward. Returns the number of feature rows rewritten.
+        """
+        health, water = self._prepare(health, water)
+        if len(water):
+            self._merge_water(water)
+
+        touched = pd.concat([
+            health[["ward_id", "report_date"]].set_axis(["ward_id", "t"], axis=1),
+            water[["ward_id", "sample_date"]].set_axis(["ward_id", "t"], axis=1),
+        ])
+        if touched.empty:
+            return 0
+        starts: Dict = touched.groupby("ward_id", observed=True)["t"].min().to_dict()
+
+        new_by_ward = dict(tuple(health.groupby("ward_id", sort=False, observed=True)))
+        segments, water_ctx, seeds = [], [], {}
+        for ward, start in starts.items():
+            context, stored = self._history(ward, start)
+            stored_raw = stored[[c for c in stored.columns if not _is_feature_column(c)]]
+            tail = (
+                pd.concat([stored_raw, new_by_ward.get(ward, health.iloc[0:0])], ignore_index=True)
+                .drop_duplicates(["ward_id", "report_date"], keep="last")
+            )
+            if tail.empty:
+                continue
+            context = context.tail(CONTEXT_ROWS)
+            parts = [tail.assign(_context=False)]
+            if len(context):
+                # An empty, column-less context would upcast ward_id to float on concat
+                parts.insert(0, context[[c for c in tail.columns if c in context.columns]].assign(_context=True))
+            segments.append(pd.concat(parts, ignore_index=True))
+            seeds[ward] = context[EWM_COL].iloc[-1] if len(context) else np.nan
+
+            lookback_start = start - pd.Timedelta(days=self.lookback_days)
+            months = [m for m in self._months("water", ward) if m >= lookback_start.strftime("%Y-%m")]
+            water_ctx.append(self._read("water", ward, months))
+
+        if not segments:
+            return 0
+
+        combined = pd.concat(segments, ignore_index=True)
+        combined["_context"] = combined["_context"].astype(bool)
+        features = compute_rolling_features(combined, ewm_span=None)
+        features = self._continue_ewm(features, seeds)
+        features = features[~features["_context"]].drop(columns="_context")
+
+        # Seed with the (possibly empty) prepared frame so the columns always exist
+        water_ctx = pd.concat([water.iloc[0:0]] + water_ctx, ignore_index=True)
+        features = features.join(asof_water_features(features, water_ctx, self.lookback_days))
+
+        self._rewrite_tails(features, starts)
+        self._write_latest(features)
+        return len(features)
+
+    def ingest(self, health_path: Path, water_path: Path, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+        """
+        Stream source files through append() chunk by chunk, so memory is
+        bounded by chunk_rows rather than file size. Water goes first so
+        each health chunk finds its lookback samples already stored.
+        """
+        rows = 0
+        for chunk in iter_water_chunks(water_path, chunk_rows=chunk_rows):
+            rows += self.append(water=chunk)
+        for chunk in iter_health_chunks(health_path, chunk_rows=chunk_rows):
+            rows += self.append(health=chunk)
+        return rows
+
+    def _prepare(self, health: Optional[pd.DataFrame], water: Optional[pd.DataFrame]):
+        health = pd.DataFrame(columns=["ward_id", "report_date", "cases_reported"]) if health is None else health.copy()
+        water = (
+            pd.DataFrame(columns=["ward_id", "sample_date", "ph", "turbidity_ntu", "coliform_cfu"])
+            if water is None else water.copy()
+        )
+        for df in (health, water):
+            # Partitions are keyed by plain ward ids; per-chunk categories would not line up
+            if isinstance(df["ward_id"].dtype, pd.CategoricalDtype):
+                df["ward_id"] = df["ward_id"].astype(df["ward_id"].cat.categories.dtype)
+        health["report_date"] = _naive_utc(health["report_date"])
+        water["sample_date"] = _naive_utc(water["sample_date"])
+        for col in ("ph", "turbidity_ntu", "coliform_cfu"):
+            water[col] = water[col].astype("float64")
+        water = compute_water_risk_score(water)
+        return health, water
+
+    def _history(self, ward, start: pd.Timestamp):
+        """Stored rows for ward split into (rows before start, rows from start on)."""
+        months = self._months("health", ward)
+        if not months:
+            return pd.DataFrame(), pd.DataFrame()
+        start_month = start.strftime("%Y-%m")
+        tail = self._read("health", ward, [m for m in months if m >= start_month])
+        earlier = [m for m in months if m < start_month]
+
+        before = tail[tail["report_date"] < start] if len(tail) else tail
+        tail = tail[tail["report_date"] >= start] if len(tail) else tail
+        # Walk back month by month until there is enough rolling context
+        context_frames = [before]
+        have = len(before)
+        while earlier and have < CONTEXT_ROWS:
+            frame = self._read("health", ward, [earlier.pop()])
+            context_frames.insert(0, frame)
+            have += len(frame)
+        if not have:
+            return pd.DataFrame(), tail
+        return pd.concat(context_frames, ignore_index=True).sort_values("report_date"), tail
+
+    @staticmethod
+    def _continue_ewm(features: pd.DataFrame, seeds: Dict) -> pd.DataFrame:
+        """EWMA over recomputed rows, continuing from each ward's last stored value."""
+        fresh_mask = ~features["_context"].to_numpy()
+        fresh = features.loc[fresh_mask, ["ward_id", "cases_reported"]].reset_index(drop=True)
+        fresh["_pos"] = np.flatnonzero(fresh_mask)
+        seed_rows = pd.DataFrame({
+            "ward_id": list(seeds.keys()),
+            "cases_reported": list(seeds.values()),
+            "_pos": -1,
+        }).dropna(subset=["cases_reported"])
+
+        # Seed first within each ward, then the recomputed rows in date order
+        series = pd.concat([seed_rows, fresh], ignore_index=True).sort_values("ward_id", kind="stable")
+        series["_ewm"] = (
+            series.groupby("ward_id", sort=False, observed=True)["cases_reported"]
+            .ewm(span=EWM_SPAN, adjust=False).mean()
+            .to_numpy()
+        )
+        series = series[series["_pos"] >= 0]
+
+        ewm = np.full(len(features), np.nan)
+        ewm[series["_pos"].to_numpy()] = series["_ewm"].to_numpy()
+        features[EWM_COL] = ewm
+        return features
+
+    def _rewrite_tails(self, features: pd.DataFrame, starts: Dict) -> None:
+        rewritten = []
+        for (ward, month), part in features.groupby(["ward_id", _month(features["report_date"])], sort=False, observed=True):
+            existing = self._read("health", ward, [m for m in self._months("health", ward) if m == month])
+            if len(existing):
+                existing = existing[existing["report_date"] < starts[ward]]
+            rewritten.append(pd.concat([existing, part], ignore_index=True))
+        if rewritten:
+            self._write("health", pd.concat(rewritten, ignore_index=True), "report_date")
+
+    def _write_latest(self, features: pd.DataFrame, replace_all: bool = False) -> None:
+        newest = features.sort_values("report_date").groupby("ward_id", sort=False, observed=True).tail(1)
+        path = self.root / "latest.parquet"
+        if not replace_all and path.exists():
+            previous = pd.read_parquet(path)
+            previous = previous[~previous["ward_id"].isin(newest["ward_id"])]
+            newest = pd.concat([previous, newest], ignore_index=True)
+        self.root.mkdir(parents=True, exist_ok=True)
+        newest.sort_values("ward_id").to_parquet(path, index=False)
+
+    # ── Reads ─────────────────────────────────────────────────
+
+    def latest(self, ward_ids: Optional[list] = None) -> pd.DataFrame:
+        """Newest feature row per ward — what the serving path scores."""
+        df = pd.read_parquet(self.root / "latest.parquet")
+        return df if ward_ids is None else df[df["ward_id"].isin(ward_ids)]
+
+    def load_features(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        parts = sorted((self.root / "health").glob("ward_id=*/month=*/part.parquet"))
+        return pd.concat([pd.read_parquet(p, columns=columns) for p in parts], ignore_index=True)
+
+    def training_frame(self, horizon_days: int = 7) -> pd.DataFrame:
+        """Same shape as build_feature_matrix(), without re-reading the CSVs."""
+        df = self.load_features(columns=["ward_id", "report_date", "cases_reported"] + MODEL_FEATURES)
+        df = add_outbreak_target(df, horizon_days)
+        return df[["ward_id"] + MODEL_FEATURES + ["outbreak_risk"]].dropna()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or update the rupesh feature store")
+    parser.add_argument("command", choices=["rebuild", "ingest"])
+    parser.add_argument("--health", type=Path, help="health cases file (.csv/.parquet/.feather)")
+    parser.add_argument("--water", type=Path, help="water quality file (.csv/.parquet/.feather)")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    store = FeatureStore()
+    if args.command == "rebuild":
+        rows = store.rebuild(load_health_data(args.health), load_water_quality_data(args.water))
+        print(f"Feature store rebuilt at {store.root} — {rows} rows")
+    else:
+        rows = store.ingest(args.health, args.water, chunk_rows=args.chunk_rows)
+        print(f"Ingested into {store.root} — {rows} feature rows recomputed")
@@ -2,86 +2,200 @@
 #  RUPESH — Model Training Script
 #  Trains XGBoost + Random Forest baselines and logs to MLflow
 # ─────────────────────────────────────────────────────────────
+#
+#  Features are built once and shared by every horizon (only the
+#  target differs). Each (model family × horizon × CV fold) fit,
+#  plus the final refit per family/horizon, is an independent task
+#  run in a process pool. Each worker is capped at
+#  cpu_count // workers threads so XGBoost / sklearn / BLAS do not
+#  oversubscribe the machine.
+#
+#  Run:  python -m rupesh.train_model                   (MLflow at localhost:5000)
+#        python -m rupesh.train_model --offline         (MLflow file store in rupesh/mlruns)
+#        python -m rupesh.train_model --horizons 7 --families xgb --workers 4
+# ─────────────────────────────────────────────────────────────
 
-import mlflow
-import mlflow.sklearn
-import numpy as np
-import joblib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import joblib
+import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import StratifiedKFold, cross_val_score
-from sklearn.metrics import (
-    classification_report, roc_auc_score, f1_score
-)
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+from threadpoolctl import threadpool_limits
 from xgboost import XGBClassifier
-from .feature_engineering import load_health_data, load_water_quality_data, build_feature_matrix
+
+from .export_model import export_model
+from .feature_engineering import (
+    MODEL_FEATURES,
+    build_base_features,
+    feature_matrix_for_horizon,
+    load_health_data,
+    load_water_quality_data,
+)
 
 MODELS_DIR = Path(__file__).parent / "trained_models"
 MODELS_DIR.mkdir(exist_ok=True)
 
-MLFLOW_TRACKING_URI = "http://localhost:5000"
+MLFLOW_TRACKING_URI = os.environ.get("MLFLOW_TRACKING_URI", "http://localhost:5000")
+MLFLOW_OFFLINE_DIR = Path(__file__).parent / "mlruns"
 EXPERIMENT_NAME = "neervazh-kavalan-risk-model"
 
+HORIZONS = (7, 14)
+CV_FOLDS = 5
+CV_SEED = 42
 
-def train(horizon_days: int = 7):
-    mlflow.set_tracking_uri(MLFLOW_TRACKING_URI)
-    mlflow.set_experiment(EXPERIMENT_NAME)
 
-    health = load_health_data()
-    water = load_water_quality_data()
-    df = build_feature_matrix(health, water, horizon_days=horizon_days)
-
-    feature_cols = ["cases_7d_avg", "avg_water_risk", "max_coliform", "avg_ph"]
-    X = df[feature_cols].values
-    y = df["outbreak_risk"].values
-
-    print(f"Training on {len(X)} samples | Positive rate: {y.mean():.2%}")
-
-    cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-
-    # ── XGBoost ──────────────────────────────────────────────
-    with mlflow.start_run(run_name=f"xgb-horizon{horizon_days}d"):
-        xgb = XGBClassifier(
-            n_estimators=200,
-            max_depth=4,
-            learning_rate=0.05,
-            subsample=0.8,
-            use_label_encoder=False,
-            eval_metric="logloss",
-            random_state=42,
-        )
-        scores = cross_val_score(xgb, X, y, cv=cv, scoring="roc_auc")
-        xgb.fit(X, y)
-
-        mlflow.log_params({"model": "XGBoost", "horizon_days": horizon_days})
-        mlflow.log_metrics({
-            "cv_roc_auc_mean": scores.mean(),
-            "cv_roc_auc_std": scores.std(),
-        })
-        mlflow.sklearn.log_model(xgb, "model")
-
-        joblib.dump(xgb, MODELS_DIR / f"xgb_h{horizon_days}.pkl")
-        print(f"XGBoost CV AUC: {scores.mean():.3f} ± {scores.std():.3f}")
-
-    # ── Random Forest ─────────────────────────────────────────
-    with mlflow.start_run(run_name=f"rf-horizon{horizon_days}d"):
-        rf = RandomForestClassifier(
-            n_estimators=300, max_depth=6, random_state=42, n_jobs=-1
-        )
-        scores = cross_val_score(rf, X, y, cv=cv, scoring="roc_auc")
-        rf.fit(X, y)
-
-        mlflow.log_params({"model": "RandomForest", "horizon_days": horizon_days})
-        mlflow.log_metrics({
-            "cv_roc_auc_mean": scores.mean(),
-            "cv_roc_auc_std": scores.std(),
-        })
-        mlflow.sklearn.log_model(rf, "model")
-
-        joblib.dump(rf, MODELS_DIR / f"rf_h{horizon_days}.pkl")
-        print(f"RandomForest CV AUC: {scores.mean():.3f} ± {scores.std():.3f}")
+def make_xgb(n_jobs: int) -> XGBClassifier:
+    return XGBClassifier(
+        n_estimators=200,
+        max_depth=4,
+        learning_rate=0.05,
+        subsample=0.8,
+        use_label_encoder=False,
+        eval_metric="logloss",
+        random_state=42,
+        n_jobs=n_jobs,
+    )
+
+
+def make_rf(n_jobs: int) -> RandomForestClassifier:
+    return RandomForestClassifier(n_estimators=300, max_depth=6, random_state=42, n_jobs=n_jobs)
+
+
+MODEL_FAMILIES: Dict[str, Tuple[str, Callable]] = {
+    "xgb": ("XGBoost", make_xgb),
+    "rf": ("RandomForest", make_rf),
+}
+
+Dataset = Tuple[np.ndarray, np.ndarray]
+
+
+# ── Worker side ───────────────────────────────────────────────
+
+_datasets: Dict[int, Dataset] = {}
+_threads = 1
+
+
+def _init_worker(datasets: Dict[int, Dataset], threads: int) -> None:
+    """Runs once per worker: receive the shared arrays and cap native thread pools."""
+    global _datasets, _threads
+    _datasets, _threads = datasets, threads
+    # BLAS/OpenMP are already loaded here, so their env vars would be ignored;
+    # threadpoolctl resizes the live pools. Models also get n_jobs=threads.
+    threadpool_limits(threads)
+
+
+def _fit_task(family: str, horizon: int, fold: Optional[int]):
+    """Fit one CV fold (returns its ROC AUC) or, with fold=None, the final model."""
+    X, y = _datasets[horizon]
+    model = MODEL_FAMILIES[family][1](_threads)
+    if fold is None:
+        model.fit(X, y)
+        return family, horizon, fold, model
+
+    cv = StratifiedKFold(n_splits=CV_FOLDS, shuffle=True, random_state=CV_SEED)
+    train_idx, test_idx = list(cv.split(X, y))[fold]
+    model.fit(X[train_idx], y[train_idx])
+    score = roc_auc_score(y[test_idx], model.predict_proba(X[test_idx])[:, 1])
+    return family, horizon, fold, score
+
+
+# ── Driver ────────────────────────────────────────────────────
+
+def build_datasets(horizons: Sequence[int]) -> Dict[int, Dataset]:
+    """Rolling/water features once, then one target column per horizon."""
+    base = build_base_features(load_health_data(), load_water_quality_data())
+    datasets = {}
+    for h in horizons:
+        df = feature_matrix_for_horizon(base, h)
+        datasets[h] = (df[MODEL_FEATURES].to_numpy(dtype="float64"), df["outbreak_risk"].to_numpy())
+    return datasets
+
+
+def plan_workers(n_tasks: int, workers: Optional[int] = None) -> Tuple[int, int]:
+    """(process count, threads per process) such that processes × threads ≤ CPUs."""
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers or cpus, n_tasks, cpus))
+    return workers, max(1, cpus // workers)
+
+
+def configure_mlflow(offline: bool = False):
+    import mlflow
+
+    uri = MLFLOW_OFFLINE_DIR.resolve().as_uri() if offline else MLFLOW_TRACKING_URI
+    mlflow.set_tracking_uri(uri)
+    mlflow.set_experiment(EXPERIMENT_NAME)
+    return mlflow
+
+
+def run_tasks(tasks: List[tuple], datasets: Dict[int, Dataset], workers: int, threads: int) -> List[tuple]:
+    if workers == 1:
+        _init_worker(datasets, threads)
+        return [_fit_task(*t) for t in tasks]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(datasets, threads)) as pool:
+        futures = [pool.submit(_fit_task, *t) for t in tasks]
+        return [f.result() for f in futures]
+
+
+def train(
+    horizons: Sequence[int] = HORIZONS,
+    families: Sequence[str] = tuple(MODEL_FAMILIES),
+    workers: Optional[int] = None,
+    offline: bool = False,
+) -> Dict[Tuple[str, int], Dict[str, float]]:
+    mlflow = configure_mlflow(offline)
+    import mlflow.sklearn
+
+    datasets = build_datasets(horizons)
+    for h, (X, y) in datasets.items():
+        print(f"Horizon {h}d: {len(X)} samples | Positive rate: {y.mean():.2%}")
+
+    # Final refits first: they are the longest tasks, so they should not start last
+    tasks = [(f, h, None) for f in families for h in horizons]
+    tasks += [(f, h, k) for f in families for h in horizons for k in range(CV_FOLDS)]
+    workers, threads = plan_workers(len(tasks), workers)
+    print(f"{len(tasks)} fits on {workers} processes × {threads} threads")
+
+    started = time.perf_counter()
+    results = run_tasks(tasks, datasets, workers, threads)
+    print(f"All fits done in {time.perf_counter() - started:.1f}s")
+
+    models, scores = {}, {}
+    for family, horizon, fold, value in results:
+        if fold is None:
+            models[(family, horizon)] = value
+        else:
+            scores.setdefault((family, horizon), []).append(value)
+
+    summary = {}
+    for (family, horizon), model in models.items():
+        name = MODEL_FAMILIES[family][0]
+        fold_scores = np.array(scores[(family, horizon)])
+        metrics = {"cv_roc_auc_mean": fold_scores.mean(), "cv_roc_auc_std": fold_scores.std()}
+        with mlflow.start_run(run_name=f"{family}-horizon{horizon}d"):
+            mlflow.log_params({"model": name, "horizon_days": horizon, "cv_folds": CV_FOLDS})
+            mlflow.log_metrics(metrics)
+            mlflow.sklearn.log_model(model, "model")
+
+        joblib.dump(model, MODELS_DIR / f"{family}_h{horizon}.pkl")
+        export_model(model, family, horizon, MODELS_DIR)
+        print(f"{name} h{horizon} CV AUC: {metrics['cv_roc_auc_mean']:.3f} ± {metrics['cv_roc_auc_std']:.3f}")
+        summary[(family, horizon)] = metrics
+    return summary
 
 
 if __name__ == "__main__":
-    train(horizon_days=7)
-    train(horizon_days=14)
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train rupesh outbreak-risk models")
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(HORIZONS))
+    parser.add_argument("--families", nargs="+", choices=list(MODEL_FAMILIES), default=list(MODEL_FAMILIES))
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--offline", action="store_true", help=f"log MLflow runs to {MLFLOW_OFFLINE_DIR}")
+    args = parser.parse_args()
+    train(args.horizons, args.families, args.workers, args.offline)
@@ -0,0 +1,290 @@
+# ─────────────────────────────────────────────────────────────
+#  RUPESH — Hyperparameter Search
+#  Successive halving over XGBoost + LightGBM with early stopping
+# ─────────────────────────────────────────────────────────────
+#
+#  Every trial is a random configuration from SEARCH_SPACES. The
+#  resource is the number of CV folds a trial has been scored on:
+#
+#    rung 0: all trials        × 1 fold
+#    rung 1: best 1/eta        × eta folds
+#    rung 2: best 1/eta²       × all CV_FOLDS folds …
+#
+#  so weak configurations are pruned after one cheap fit. Inside a
+#  fold the booster trains up to MAX_ROUNDS trees but stops once a
+#  held-out slice of the training fold has not improved for
+#  EARLY_STOPPING_ROUNDS rounds; the fold's own test split is only
+#  used for the reported AUC.
+#
+#  Each trial is an MLflow run nested under one parent run per
+#  (family, horizon), with its AUC logged at every rung it reached.
+#
+#  Run:  python -m rupesh.tune_model --offline
+#        python -m rupesh.tune_model --families xgb --horizons 7 --trials 81 --save
+#        (--save exports the model for tarun, so lgbm is search-only)
+# ─────────────────────────────────────────────────────────────
+
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+from lightgbm import LGBMClassifier, early_stopping
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from xgboost import XGBClassifier
+
+from . import train_model
+from .export_model import COMPILERS, export_model
+from .train_model import (
+    CV_FOLDS,
+    CV_SEED,
+    HORIZONS,
+    MODELS_DIR,
+    build_datasets,
+    configure_mlflow,
+    plan_workers,
+)
+
+MAX_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 50
+EARLY_STOPPING_FRACTION = 0.15
+
+# name → (kind, low, high); "log" samples uniformly in log space
+SEARCH_SPACES: Dict[str, Dict[str, tuple]] = {
+    "xgb": {
+        "max_depth": ("int", 2, 8),
+        "learning_rate": ("log", 0.01, 0.3),
+        "subsample": ("float", 0.6, 1.0),
+        "colsample_bytree": ("float", 0.6, 1.0),
+        "min_child_weight": ("log", 1.0, 20.0),
+        "reg_lambda": ("log", 0.1, 10.0),
+    },
+    "lgbm": {
+        "num_leaves": ("int", 8, 128),
+        "learning_rate": ("log", 0.01, 0.3),
+        "subsample": ("float", 0.6, 1.0),
+        "colsample_bytree": ("float", 0.6, 1.0),
+        "min_child_samples": ("int", 5, 100),
+        "reg_lambda": ("log", 0.1, 10.0),
+    },
+}
+
+# Families --save may export: tarun only serves what export_model can compile
+SAVABLE = [family for family in SEARCH_SPACES if family in COMPILERS]
+
+
+def sample_params(family: str, rng: np.random.Generator) -> Dict[str, float]:
+    params = {}
+    for name, (kind, low, high) in SEARCH_SPACES[family].items():
+        if kind == "int":
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == "log":
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+
+def make_model(family: str, params: Dict[str, float], n_estimators: int, n_jobs: int):
+    if family == "xgb":
+        return XGBClassifier(
+            n_estimators=n_estimators, eval_metric="auc", random_state=42, n_jobs=n_jobs, **params
+        )
+    return LGBMClassifier(
+        n_estimators=n_estimators, subsample_freq=1, random_state=42, n_jobs=n_jobs, verbose=-1, **params
+    )
+
+
+def _fit_early_stopped(family: str, model, X, y, X_val, y_val) -> int:
+    """Fit with early stopping on (X_val, y_val); returns the number of trees kept."""
+    if family == "xgb":
+        model.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+        model.fit(X, y, eval_set=[(X_val, y_val)], verbose=False)
+        return model.best_iteration + 1
+    model.fit(
+        X, y, eval_set=[(X_val, y_val)], eval_metric="auc",
+        callbacks=[early_stopping(EARLY_STOPPING_ROUNDS, verbose=False)],
+    )
+    return model.best_iteration_ or model.n_estimators
+
+
+# ── Worker side (runs in train_model's process pool) ──────────
+
+def _trial_fold(family: str, horizon: int, trial: int, params: Dict[str, float], fold: int):
+    """Score one trial on one CV fold. Returns (trial, fold, auc, trees, seconds)."""
+    started = time.perf_counter()
+    X, y = train_model._datasets[horizon]
+    cv = StratifiedKFold(n_splits=CV_FOLDS, shuffle=True, random_state=CV_SEED)
+    train_idx, test_idx = list(cv.split(X, y))[fold]
+    fit_idx, stop_idx = train_test_split(
+        train_idx, test_size=EARLY_STOPPING_FRACTION, stratify=y[train_idx], random_state=CV_SEED
+    )
+
+    model = make_model(family, params, MAX_ROUNDS, train_model._threads)
+    trees = _fit_early_stopped(family, model, X[fit_idx], y[fit_idx], X[stop_idx], y[stop_idx])
+    auc = roc_auc_score(y[test_idx], model.predict_proba(X[test_idx])[:, 1])
+    return trial, fold, float(auc), int(trees), time.perf_counter() - started
+
+
+# ── Driver ────────────────────────────────────────────────────
+
+def rung_folds(eta: int) -> List[int]:
+    """Cumulative folds per rung: 1, eta, eta², … capped at CV_FOLDS."""
+    if eta < 2:
+        raise ValueError("eta must be at least 2")
+    rungs = [min(eta ** r, CV_FOLDS) for r in range(math.ceil(math.log(CV_FOLDS, eta)) + 1)]
+    return sorted(set(rungs))
+
+
+class Trial:
+    def __init__(self, number: int, params: Dict[str, float]):
+        self.number = number
+        self.params = params
+        self.fold_auc: Dict[int, float] = {}
+        self.fold_trees: Dict[int, int] = {}
+
+    @property
+    def auc(self) -> float:
+        return float(np.mean(list(self.fold_auc.values())))
+
+    @property
+    def trees(self) -> int:
+        return int(np.median(list(self.fold_trees.values())))
+
+
+def search(
+    pool,
+    family: str,
+    horizon: int,
+    n_trials: int,
+    eta: int,
+    threads: int,
+    mlflow,
+    seed: int = CV_SEED,
+) -> Dict:
+    rng = np.random.default_rng(seed)
+    trials = [Trial(i, sample_params(family, rng)) for i in range(n_trials)]
+    alive = trials
+    cpu_seconds = 0.0
+    fits = 0
+
+    with mlflow.start_run(run_name=f"search-{family}-h{horizon}") as parent:
+        mlflow.log_params({
+            "model": family, "horizon_days": horizon, "trials": n_trials, "eta": eta,
+            "max_rounds": MAX_ROUNDS, "early_stopping_rounds": EARLY_STOPPING_ROUNDS,
+        })
+        runs = {}
+        for t in trials:
+            with mlflow.start_run(run_name=f"{family}-h{horizon}-trial{t.number}", nested=True) as run:
+                mlflow.log_params(t.params)
+                runs[t.number] = run.info.run_id
+
+        by_number = {t.number: t for t in trials}
+        for rung, folds in enumerate(rung_folds(eta)):
+            jobs = [
+                (family, horizon, t.number, t.params, k)
+                for t in alive for k in range(folds) if k not in t.fold_auc
+            ]
+            for number, fold, auc, trees, seconds in pool(jobs):
+                by_number[number].fold_auc[fold] = auc
+                by_number[number].fold_trees[fold] = trees
+                cpu_seconds += seconds * threads
+                fits += 1
+
+            for t in alive:
+                with mlflow.start_run(run_id=runs[t.number], nested=True):
+                    mlflow.log_metrics({"cv_roc_auc": t.auc, "folds": len(t.fold_auc), "trees": t.trees}, step=rung)
+
+            if folds == CV_FOLDS:
+                break
+            alive = sorted(alive, key=lambda t: t.auc, reverse=True)
+            keep = max(1, len(alive) // eta)
+            for t in alive[keep:]:
+                with mlflow.start_run(run_id=runs[t.number], nested=True):
+                    mlflow.set_tag("pruned_at_rung", rung)
+            alive = alive[:keep]
+
+        best = max(alive, key=lambda t: t.auc)
+        full_fits = n_trials * CV_FOLDS
+        mlflow.log_metrics({
+            "best_cv_roc_auc": best.auc,
+            "fold_fits": fits,
+            "fold_fits_saved_pct": 100.0 * (1 - fits / full_fits),
+            "cpu_seconds": cpu_seconds,
+        })
+        mlflow.log_params({"best_trial": best.number, "best_trees": best.trees})
+        mlflow.set_tag("best_run_id", runs[best.number])
+
+    print(
+        f"{family} h{horizon}: best trial {best.number} AUC {best.auc:.3f} "
+        f"({best.trees} trees) | {fits}/{full_fits} fold fits, {cpu_seconds:.1f} CPU-s"
+    )
+    return {
+        "family": family,
+        "horizon_days": horizon,
+        "cv_roc_auc": best.auc,
+        "n_estimators": best.trees,
+        "params": best.params,
+        "parent_run_id": parent.info.run_id,
+    }
+
+
+def tune(
+    horizons: Sequence[int] = HORIZONS,
+    families: Sequence[str] = tuple(SEARCH_SPACES),
+    n_trials: int = 27,
+    eta: int = 3,
+    workers: Optional[int] = None,
+    offline: bool = False,
+    save: bool = False,
+) -> List[Dict]:
+    unservable = [family for family in families if family not in SAVABLE]
+    if save and unservable:
+        raise ValueError(f"save supports {', '.join(SAVABLE)} only; tarun cannot serve {', '.join(unservable)}")
+    mlflow = configure_mlflow(offline)
+    datasets = build_datasets(horizons)
+    workers, threads = plan_workers(n_trials, workers)
+    print(f"Successive halving: {n_trials} trials, eta={eta}, rungs {rung_folds(eta)} folds "
+          f"on {workers} processes × {threads} threads")
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=train_model._init_worker, initargs=(datasets, threads)
+    ) as executor:
+        def pool(jobs):
+            return [f.result() for f in [executor.submit(_trial_fold, *job) for job in jobs]]
+
+        for horizon in horizons:
+            for family in families:
+                best = search(pool, family, horizon, n_trials, eta, threads, mlflow)
+                results.append(best)
+                if save:
+                    X, y = datasets[horizon]
+                    model = make_model(family, best["params"], best["n_estimators"], -1).fit(X, y)
+                    joblib.dump(model, MODELS_DIR / f"{family}_h{horizon}.pkl")
+                    export_model(model, family, horizon, MODELS_DIR)
+                    (MODELS_DIR / f"{family}_h{horizon}.params.json").write_text(json.dumps(best, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Budgeted hyperparameter search (successive halving)")
+    parser.add_argument("--horizons", type=int, nargs="+", default=list(HORIZONS))
+    parser.add_argument("--families", nargs="+", choices=list(SEARCH_SPACES), default=list(SEARCH_SPACES))
+    parser.add_argument("--trials", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3, help="keep the best 1/eta trials at each rung")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--offline", action="store_true", help="log MLflow runs to rupesh/mlruns")
+    parser.add_argument("--save", action="store_true",
+                        help=f"refit the best trial and export it for tarun ({', '.join(SAVABLE)} only)")
+    args = parser.parse_args()
+    unservable = [family for family in args.families if family not in SAVABLE]
+    if args.save and unservable:
+        parser.error(f"--save needs --families {' '.join(SAVABLE)}; tarun cannot serve {', '.join(unservable)}")
+    tune(args.horizons, args.families, args.trials, args.eta, args.workers, args.offline, args.save)
@@ -0,0 +1,118 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Time-bucketed Aggregation
+#  GROUP BY date_trunc(bucket) in SQL instead of in the browser
+# ─────────────────────────────────────────────────────────────
+#
+#  aggregate() answers from the rollup tables (see rollups.py) when
+#  ROLLUPS_ENABLED is set, the requested bucket is at least as coarse
+#  as the rollup's and the from/to bounds fall on rollup bucket
+#  boundaries; otherwise it aggregates the raw table. Both paths
+#  return the same shape.
+# ─────────────────────────────────────────────────────────────
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .rollups import BUCKETS, SOURCES, STATS, Source, date_trunc, settings
+
+AGG_STATS = STATS + ("avg",)
+
+
+def _parse_list(value: Optional[str], allowed, default, what: str) -> List[str]:
+    if not value:
+        return list(default)
+    items = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [v for v in items if v not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown {what}: {', '.join(unknown)}")
+    return items
+
+
+def _aligned(ts: Optional[datetime], unit: str) -> bool:
+    if ts is None:
+        return True
+    if unit == "hour":
+        return ts.minute == ts.second == ts.microsecond == 0
+    return ts.hour == ts.minute == ts.second == ts.microsecond == 0
+
+
+def _use_rollup(source: Source, bucket: str, start, end) -> bool:
+    return (
+        settings.ROLLUPS_ENABLED
+        and BUCKETS.index(bucket) >= BUCKETS.index(source.rollup_bucket)
+        and _aligned(start, source.rollup_bucket)
+        and _aligned(end, source.rollup_bucket)
+    )
+
+
+def _raw_columns(source: Source, metric: str, stats: List[str]):
+    col = getattr(source.model, metric)
+    exprs = {"sum": func.sum(col), "count": func.count(col), "min": func.min(col),
+             "max": func.max(col), "avg": func.avg(col)}
+    return [exprs[s].label(f"{metric}_{s}") for s in stats]
+
+
+def _rollup_columns(source: Source, metric: str, stats: List[str]):
+    c = source.rollup.c
+    total, count = func.sum(c[f"{metric}_sum"]), func.sum(c[f"{metric}_count"])
+    exprs = {"sum": total, "count": count, "min": func.min(c[f"{metric}_min"]),
+             "max": func.max(c[f"{metric}_max"]), "avg": total / func.nullif(count, 0)}
+    return [exprs[s].label(f"{metric}_{s}") for s in stats]
+
+
+async def aggregate(
+    db: AsyncSession,
+    source_name: str,
+    bucket: str,
+    metrics: Optional[str] = None,
+    stats: Optional[str] = None,
+    ward_id: Optional[int] = None,
+    by_ward: bool = False,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    source = SOURCES[source_name]
+    metric_names = _parse_list(metrics, source.metrics, source.metrics, "metrics")
+    stat_names = _parse_list(stats, AGG_STATS, AGG_STATS, "stats")
+
+    from_rollup = _use_rollup(source, bucket, start, end)
+    if from_rollup:
+        table, ward_col, date_col, to_columns = source.rollup, source.rollup.c.ward_id, source.rollup.c.bucket, _rollup_columns
+    else:
+        table, ward_col, date_col, to_columns = source.model.__table__, source.model.ward_id, source.date_col, _raw_columns
+
+    bucket_expr = date_trunc(bucket, date_col)
+    keys = [bucket_expr.label("bucket")] + ([ward_col.label("ward_id")] if by_ward else [])
+    columns = [c for m in metric_names for c in to_columns(source, m, stat_names)]
+
+    query = select(*keys, *columns).select_from(table).where(date_col.isnot(None))
+    if ward_id is not None:
+        query = query.where(ward_col == ward_id)
+    if start is not None:
+        query = query.where(date_col >= start)
+    if end is not None:
+        query = query.where(date_col < end)
+    group = [bucket_expr] + ([ward_col] if by_ward else [])
+    query = query.group_by(*group).order_by(*group)
+
+    rows = (await db.execute(query)).mappings().all()
+    buckets = []
+    for row in rows:
+        item = {"bucket": row["bucket"]}
+        if by_ward:
+            item["ward_id"] = row["ward_id"]
+        for m in metric_names:
+            item[m] = {s: row[f"{m}_{s}"] for s in stat_names}
+        buckets.append(item)
+
+    return {
+        "source": source_name,
+        "bucket": bucket,
+        "ward_id": ward_id,
+        "from_rollup": from_rollup,
+        "buckets": buckets,
+    }
@@ -0,0 +1,290 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Streaming Alert Rules
+#  Threshold / trend / anomaly alerts evaluated as data arrives
+# ─────────────────────────────────────────────────────────────
+#
+#  ingestion.py hands every loaded chunk to evaluate_batch(). Each
+#  record updates small per-(ward, metric) states in O(1):
+#    threshold  fixed drinking-water limits (coliform, turbidity, pH)
+#    trend      least-squares slope of cases over the last
+#               TREND_WINDOW reports, from running sums
+#    anomaly    z-score against an exponentially weighted mean and
+#               variance
+#  so no table is ever re-scanned. Records older than a ward's last
+#  seen timestamp still hit the thresholds but do not move the
+#  rolling states.
+#
+#  The states live in the process. The first time a process sees a
+#  ward, warm() reads that ward's last ALERT_RULES_SEED_ROWS rows
+#  back from the table (one windowed query per chunk) and folds them
+#  in without raising anything, so a CLI run or a freshly started
+#  uvicorn worker evaluates trend and anomaly rules from its first
+#  row. After that each process only folds in what it ingests
+#  itself; feeds for the same ward sent to different workers are
+#  not merged until those workers restart.
+#
+#  Alerts are deduplicated by dedup_key — "ward:rule" — through a
+#  partial unique index over unacknowledged alerts: while an alert
+#  is open the same condition does not raise another one; once it is
+#  acknowledged, the next breach does.
+# ─────────────────────────────────────────────────────────────
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from pydantic_settings import BaseSettings
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import alert_stream
+from .models import Alert, HealthCase, WaterQuality
+from .snapshot import MAX_TURBIDITY_NTU, PH_RANGE
+
+
+class Settings(BaseSettings):
+    ALERT_RULES_ENABLED: bool = True
+    TREND_WINDOW: int = 7
+    TREND_MIN_SLOPE: float = 2.0  # extra cases per day
+    ZSCORE_THRESHOLD: float = 3.0
+    ZSCORE_ALPHA: float = 0.1
+    ZSCORE_MIN_SAMPLES: int = 20
+    ALERT_RULES_SEED_ROWS: int = 50  # history read back per ward; ≥ TREND_WINDOW and ZSCORE_MIN_SAMPLES
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+SECONDS_PER_DAY = 86400.0
+
+
+@dataclass(frozen=True)
+class Threshold:
+    metric: str
+    above: bool
+    limit: float
+    severity: str
+    unit: str = ""
+
+    def breached(self, value: float) -> bool:
+        return value > self.limit if self.above else value < self.limit
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    model: type
+    time_column: str
+    thresholds: Tuple[Threshold, ...] = ()
+    trend_metric: Optional[str] = None
+    anomaly_metrics: Tuple[str, ...] = ()
+
+
+RULES: Dict[str, RuleSet] = {
+    "water": RuleSet(
+        WaterQuality,
+        "sample_date",
+        thresholds=(
+            Threshold("coliform_cfu", True, 0, "critical", " CFU"),
+            Threshold("turbidity_ntu", True, MAX_TURBIDITY_NTU, "warning", " NTU"),
+            Threshold("ph", False, PH_RANGE[0], "warning"),
+            Threshold("ph", True, PH_RANGE[1], "warning"),
+        ),
+        anomaly_metrics=("turbidity_ntu", "chlorine_mg_l", "ph"),
+    ),
+    "health": RuleSet(
+        HealthCase,
+        "report_date",
+        trend_metric="cases_reported",
+        anomaly_metrics=("cases_reported",),
+    ),
+}
+
+
+class Ewma:
+    """Exponentially weighted mean / variance; update() returns the z of x before folding it in."""
+    __slots__ = ("n", "mean", "var")
+
+    def __init__(self):
+        self.n, self.mean, self.var = 0, 0.0, 0.0
+
+    def update(self, x: float) -> Optional[float]:
+        z = None
+        if self.n >= settings.ZSCORE_MIN_SAMPLES and self.var > 0:
+            z = (x - self.mean) / math.sqrt(self.var)
+        if self.n == 0:
+            self.mean = x
+        else:
+            alpha = settings.ZSCORE_ALPHA
+            delta = x - self.mean
+            self.mean += alpha * delta
+            self.var = (1 - alpha) * (self.var + alpha * delta * delta)
+        self.n += 1
+        return z
+
+
+class RollingSlope:
+    """Least-squares slope over the last `size` points, maintained from running sums."""
+    __slots__ = ("points", "sx", "sy", "sxx", "sxy")
+
+    def __init__(self, size: int):
+        self.points = deque(maxlen=size)
+        self.sx = self.sy = self.sxx = self.sxy = 0.0
+
+    def update(self, x: float, y: float) -> Optional[float]:
+        if len(self.points) == self.points.maxlen:
+            ox, oy = self.points[0]
+            self.sx -= ox
+            self.sy -= oy
+            self.sxx -= ox * ox
+            self.sxy -= ox * oy
+        self.points.append((x, y))
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+        n = len(self.points)
+        if n < self.points.maxlen:
+            return None
+        denom = n * self.sxx - self.sx * self.sx
+        return (n * self.sxy - self.sx * self.sy) / denom if denom > 0 else None
+
+
+class RuleEngine:
+    def __init__(self):
+        self.last_seen: Dict[Tuple[str, int], datetime] = {}
+        self.slopes: Dict[int, RollingSlope] = {}
+        self.ewmas: Dict[Tuple[str, int, str], Ewma] = {}
+        self.origin: Optional[datetime] = None
+        self.seeded: Set[Tuple[str, int]] = set()
+
+    def seed(self, kind: str, wards: Iterable[int], history: Iterable[Dict[str, Any]]):
+        """Fold stored rows (oldest first) into the rolling states without raising alerts."""
+        for record in history:
+            self._roll(kind, record)
+        self.seeded.update((kind, ward) for ward in wards)
+
+    def evaluate(self, kind: str, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Fold one record into the ward's state; returns the alerts it raises."""
+        rules = RULES[kind]
+        ward, at = record["ward_id"], record[rules.time_column]
+        alerts = []
+
+        for t in rules.thresholds:
+            value = record.get(t.metric)
+            if value is not None and t.breached(value):
+                side = "above" if t.above else "below"
+                alerts.append(_alert(
+                    ward, "threshold", t.severity, f"{t.metric}:{side}",
+                    f"{t.metric} {value:g}{t.unit} is {side} the limit of {t.limit:g}{t.unit} ({at:%Y-%m-%d %H:%M})",
+                ))
+        return alerts + self._roll(kind, record)
+
+    def _roll(self, kind: str, record: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rules = RULES[kind]
+        ward, at = record["ward_id"], record[rules.time_column]
+        alerts = []
+
+        key = (kind, ward)
+        if key in self.last_seen and at < self.last_seen[key]:
+            return alerts  # late arrival: thresholds only
+        self.last_seen[key] = at
+
+        if rules.trend_metric and record.get(rules.trend_metric) is not None:
+            if self.origin is None:
+                self.origin = at
+            slope = self.slopes.setdefault(ward, RollingSlope(settings.TREND_WINDOW)).update(
+                (at - self.origin).total_seconds() / SECONDS_PER_DAY, record[rules.trend_metric]
+            )
+            if slope is not None and slope >= settings.TREND_MIN_SLOPE:
+                alerts.append(_alert(
+                    ward, "trend", "warning", f"{rules.trend_metric}:rising",
+                    f"{rules.trend_metric} rising by {slope:.1f}/day over the last {settings.TREND_WINDOW} reports",
+                ))
+
+        for metric in rules.anomaly_metrics:
+            value = record.get(metric)
+            if value is None:
+                continue
+            ewma = self.ewmas.get((kind, ward, metric))
+            if ewma is None:
+                ewma = self.ewmas[(kind, ward, metric)] = Ewma()
+            z = ewma.update(value)
+            if z is not None and abs(z) >= settings.ZSCORE_THRESHOLD:
+                alerts.append(_alert(
+                    ward, "anomaly", "warning", f"{metric}:anomaly",
+                    f"{metric} {value:g} is {z:+.1f}σ from its recent level",
+                ))
+        return alerts
+
+
+def _alert(ward_id: int, alert_type: str, severity: str, rule: str, message: str) -> Dict[str, Any]:
+    return {
+        "ward_id": ward_id,
+        "alert_type": alert_type,
+        "severity": severity,
+        "message": message,
+        "acknowledged": False,
+        "dedup_key": f"{ward_id}:{rule}",
+    }
+
+
+engine = RuleEngine()
+
+
+async def raise_alerts(db: AsyncSession, alerts: List[Dict[str, Any]]) -> int:
+    """Insert alerts that have no open duplicate and announce them; caller commits."""
+    unique = list({a["dedup_key"]: a for a in alerts}.values())
+    if not unique:
+        return 0
+    stmt = (
+        insert(Alert)
+        .values(unique)
+        .on_conflict_do_nothing(index_elements=["dedup_key"], index_where=text("acknowledged IS NOT TRUE"))
+        .returning(Alert.id)
+    )
+    ids = (await db.execute(stmt)).scalars().all()
+    for alert_id in ids:
+        await alert_stream.publish(db, alert_stream.CREATED, alert_id)
+    return len(ids)
+
+
+async def warm(db: AsyncSession, kind: str, ward_ids: Iterable[int]) -> int:
+    """Seed the rolling states of wards this process has not seen yet. Call before loading the chunk."""
+    rules = RULES[kind]
+    wards = sorted({w for w in ward_ids if (kind, w) not in engine.seeded})
+    if not wards:
+        return 0
+    table = rules.model.__table__
+    at = table.c[rules.time_column]
+    metrics = sorted({rules.trend_metric, *rules.anomaly_metrics} - {None})
+    ranked = (
+        select(
+            table.c.ward_id, at, *(table.c[m] for m in metrics),
+            func.row_number().over(partition_by=table.c.ward_id, order_by=at.desc()).label("rn"),
+        )
+        .where(table.c.ward_id.in_(wards), at.isnot(None))
+        .subquery()
+    )
+    query = (
+        select(ranked.c.ward_id, ranked.c[rules.time_column], *(ranked.c[m] for m in metrics))
+        .where(ranked.c.rn <= settings.ALERT_RULES_SEED_ROWS)
+        .order_by(ranked.c.ward_id, ranked.c[rules.time_column])
+    )
+    history = [dict(row) for row in (await db.execute(query)).mappings()]
+    engine.seed(kind, wards, history)
+    return len(history)
+
+
+async def evaluate_batch(db: AsyncSession, kind: str, records: Iterable[Dict[str, Any]]) -> int:
+    """Run one loaded chunk through the rules in time order. Returns alerts written."""
+    time_column = RULES[kind].time_column
+    alerts = []
+    for record in sorted(records, key=lambda r: r[time_column]):
+        alerts += engine.evaluate(kind, record)
+    return await raise_alerts(db, alerts)
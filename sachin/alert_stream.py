@@ -0,0 +1,242 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Alert Push (Server-Sent Events)
+#  New alerts and acknowledgements streamed to dashboards
+# ─────────────────────────────────────────────────────────────
+#
+#  Writers call publish() inside their transaction; it issues
+#  pg_notify on CHANNEL, so the event goes out only if the write
+#  commits, and from whichever process made it (API, ingestion,
+#  batch jobs). Each API process holds one LISTEN connection and
+#  fans events out to its connected clients through per-client
+#  queues — no polling and no per-client database connection.
+#
+#  Every event's SSE `id:` is a cursor over (event time, alert id).
+#  EventSource sends it back as Last-Event-ID on reconnect and the
+#  missed events are replayed from the alerts table before the
+#  live stream resumes. Event times are transaction-start now(), not
+#  commit order: an alert from a long transaction can commit after a
+#  later-stamped one was delivered. So the replay starts
+#  ALERT_STREAM_REPLAY_OVERLAP_S before the cursor and may repeat
+#  events; clients apply them idempotently by (event, alert id). A client that falls too far behind (full
+#  queue, lost LISTEN connection, replay over the limit) gets a
+#  `resync` event and should reload GET /api/alerts/.
+# ─────────────────────────────────────────────────────────────
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from pydantic_settings import BaseSettings
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import AsyncSessionLocal, engine
+from .models import Alert
+from .pagination import decode_cursor, encode_cursor
+
+
+class Settings(BaseSettings):
+    ALERT_STREAM_HEARTBEAT_S: float = 15.0
+    ALERT_STREAM_QUEUE_SIZE: int = 256
+    ALERT_STREAM_REPLAY_LIMIT: int = 1000
+    ALERT_STREAM_REPLAY_OVERLAP_S: float = 300.0  # ≥ the longest transaction that raises alerts
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "alert_events"
+CREATED, ACKNOWLEDGED = "created", "acknowledged"
+
+EventKey = Tuple[datetime, uuid.UUID]
+
+
+def _event(kind: str, alert: Alert) -> Dict[str, Any]:
+    at = alert.created_at if kind == CREATED else alert.acknowledged_at
+    return {
+        "type": kind,
+        "key": (at, alert.id),
+        "ward_id": alert.ward_id,
+        "alert": {c.name: getattr(alert, c.name) for c in Alert.__table__.columns},
+    }
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    data = json.dumps(jsonable_encoder(event["alert"]))
+    return f"id: {encode_cursor(*event['key'])}\nevent: {event['type']}\ndata: {data}\n\n"
+
+
+def _resync(reason: str) -> str:
+    return f"event: resync\ndata: {json.dumps({'reason': reason})}\n\n"
+
+
+async def publish(db: AsyncSession, kind: str, alert_id: uuid.UUID) -> None:
+    """Queue a notification; PostgreSQL delivers it when `db` commits."""
+    payload = json.dumps({"type": kind, "id": str(alert_id)})
+    await db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+class Subscription:
+    def __init__(self):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.ALERT_STREAM_QUEUE_SIZE)
+        self.dropped: Optional[str] = None
+
+
+class AlertBroker:
+    """One LISTEN connection per process, fanned out to in-memory subscriber queues."""
+
+    def __init__(self):
+        self._subscribers: Set[Subscription] = set()
+        self._notes: asyncio.Queue = asyncio.Queue()
+        self._conn = None
+        self._pump: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def _listen(self):
+        async with self._lock:
+            # Checked on every subscribe, whether or not the connection is new
+            if self._pump is None or self._pump.done():
+                self._pump = asyncio.create_task(self._run())
+            if self._conn is not None and not self._conn.is_closed():
+                return
+            import asyncpg  # the raw driver: LISTEN needs a connection outside the pool
+
+            dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+            self._conn = await asyncpg.connect(dsn)
+            self._conn.add_termination_listener(lambda _conn: self._drop_all("listener connection lost"))
+            await self._conn.add_listener(CHANNEL, lambda _c, _pid, _ch, payload: self._notes.put_nowait(payload))
+
+    async def _run(self):
+        # Sequential, so subscribers see events in commit order
+        while True:
+            payload = await self._notes.get()
+            try:
+                note = json.loads(payload)
+                kind, alert_id = note["type"], uuid.UUID(note["id"])
+            except (ValueError, KeyError, TypeError):
+                logger.error("ignoring malformed alert notification %r", payload)
+                continue
+            try:
+                async with AsyncSessionLocal() as db:
+                    alert = await db.get(Alert, alert_id)
+            except Exception:
+                # Clients reconnect with their cursor and the replay picks the event up
+                logger.exception("could not load alert %s for the stream", alert_id)
+                self._drop_all("missed an event")
+                continue
+            if alert is not None:
+                self._fan_out(_event(kind, alert))
+
+    def _fan_out(self, event: Dict[str, Any]):
+        for sub in list(self._subscribers):
+            try:
+                sub.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(sub, "client too slow")
+
+    def _drop(self, sub: Subscription, reason: str):
+        sub.dropped = reason
+        self._subscribers.discard(sub)
+        # The client will resync anyway, so make room for the wake-up sentinel
+        if sub.queue.full():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+    def _drop_all(self, reason: str):
+        for sub in list(self._subscribers):
+            self._drop(sub, reason)
+
+    async def subscribe(self) -> Subscription:
+        await self._listen()
+        sub = Subscription()
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        self._subscribers.discard(sub)
+
+    async def close(self):
+        self._drop_all("server shutting down")
+        if self._pump is not None:
+            self._pump.cancel()
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+
+
+broker = AlertBroker()
+
+
+async def replay(db: AsyncSession, after: EventKey, ward_id: Optional[int]) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Events from ALERT_STREAM_REPLAY_OVERLAP_S before `after` on, oldest first,
+    and whether the replay is complete. The overlap catches alerts that
+    committed after a later-stamped event was delivered.
+    """
+    limit = settings.ALERT_STREAM_REPLAY_LIMIT
+    since = after[0] - timedelta(seconds=settings.ALERT_STREAM_REPLAY_OVERLAP_S)
+    created = select(Alert).where(Alert.created_at > since)
+    acked = select(Alert).where(Alert.acknowledged_at > since)
+    if ward_id is not None:
+        created = created.where(Alert.ward_id == ward_id)
+        acked = acked.where(Alert.ward_id == ward_id)
+    created = created.order_by(Alert.created_at, Alert.id).limit(limit + 1)
+    acked = acked.order_by(Alert.acknowledged_at, Alert.id).limit(limit + 1)
+
+    events = [_event(CREATED, a) for a in (await db.execute(created)).scalars()]
+    events += [_event(ACKNOWLEDGED, a) for a in (await db.execute(acked)).scalars()]
+    events.sort(key=lambda e: e["key"])
+    return events[:limit], len(events) <= limit
+
+
+async def stream(request: Request, cursor: Optional[str], ward_id: Optional[int]) -> AsyncIterator[str]:
+    # Subscribe before replaying so nothing committed in between is lost.
+    # Live events the replay already sent are skipped by (type, alert id):
+    # keys are not in commit order, so comparing them would drop alerts
+    # from a transaction that committed after a later-stamped one.
+    last = decode_cursor(cursor) if cursor else None
+    sub = await broker.subscribe()
+    replayed = set()
+    try:
+        yield "retry: 3000\n\n"
+        if last is not None:
+            async with AsyncSessionLocal() as db:
+                events, complete = await replay(db, last, ward_id)
+            for event in events:
+                yield _sse(event)
+                replayed.add((event["type"], event["alert"]["id"]))
+            if not complete:
+                yield _resync("too many missed events")
+                return
+
+        while True:
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), settings.ALERT_STREAM_HEARTBEAT_S)
+            except asyncio.TimeoutError:
+                replayed.clear()  # anything buffered during the replay has been delivered by now
+                if await request.is_disconnected():
+                    return
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                yield _resync(sub.dropped or "dropped")
+                return
+            if ward_id is not None and event["ward_id"] != ward_id:
+                continue
+            if replayed:
+                seen = (event["type"], event["alert"]["id"])
+                if seen in replayed:
+                    replayed.discard(seen)
+                    continue
+            yield _sse(event)
+    finally:
+        broker.unsubscribe(sub)
@@ -0,0 +1,237 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — District Batch Prediction
+#  Scores every ward for both horizons and stores RiskPrediction rows
+# ─────────────────────────────────────────────────────────────
+#
+#  1. One query computes each ward's current model inputs at its
+#     latest report_date (as_of), with the same definitions as
+#     rupesh/feature_engineering.py:
+#       cases_7d_avg    mean cases_reported over the ward's last 7
+#                       reports (rows, not calendar days)
+#       avg_water_risk  mean composite water risk over (as_of − 14d, as_of]
+#       max_coliform    max coliform over the same window
+#       avg_ph          mean pH over the same window
+#  2. Wards whose inputs hash and model version match their latest
+#     stored prediction are skipped.
+#  3. Each horizon is one predict_proba over the remaining wards,
+#     using tarun's model registry (compiled .npz when available).
+#  4. All rows are inserted in one transaction, so they share one
+#     predicted_at and the dashboard never sees a half-written run.
+#
+#  Run:  python -m sachin.batch_predict              (once)
+#        python -m sachin.batch_predict --every 3600 (on a schedule)
+#  or set PREDICT_AFTER_INGEST=true to run after each ingestion.
+#  Needs tarun's requirements (numpy) and trained models.
+# ─────────────────────────────────────────────────────────────
+
+import asyncio
+import hashlib
+import json
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+from sqlalchemy import and_, func, insert, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import risk_map
+from .models import HealthCase, RiskPrediction, WaterQuality
+
+
+class Settings(BaseSettings):
+    BATCH_MODEL_FAMILY: str = "xgb"
+    PREDICT_AFTER_INGEST: bool = False
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+HORIZONS = (7, 14)
+CASE_WINDOW_ROWS = 7  # rupesh compute_rolling_case_rate window
+WATER_LOOKBACK_DAYS = 14  # rupesh WATER_LOOKBACK_DAYS
+
+
+def _days(n: int):
+    # Inlined: a bound timedelta leaves `timestamptz - $1` ambiguous for asyncpg
+    return literal_column(f"interval '{int(n)} days'")
+
+
+def _clip(expr, high):
+    return func.least(func.greatest(expr, 0), high)
+
+
+def case_rate_query():
+    """cases_7d_avg per ward: mean of its last CASE_WINDOW_ROWS reports, as compute_rolling_case_rate."""
+    ranked = (
+        select(
+            HealthCase.ward_id,
+            HealthCase.cases_reported,
+            func.row_number().over(
+                partition_by=HealthCase.ward_id,
+                order_by=(HealthCase.report_date.desc(), HealthCase.id.desc()),
+            ).label("rn"),
+        )
+        .where(HealthCase.report_date.isnot(None))
+        .subquery()
+    )
+    return (
+        select(ranked.c.ward_id, func.avg(ranked.c.cases_reported * 1.0).label("cases_7d_avg"))
+        .where(ranked.c.rn <= CASE_WINDOW_ROWS)
+        .group_by(ranked.c.ward_id)
+    )
+
+
+def feature_query():
+    """Latest model inputs for every ward with health data, one row per ward."""
+    anchor = (
+        select(HealthCase.ward_id, func.max(HealthCase.report_date).label("as_of"))
+        .where(HealthCase.report_date.isnot(None))
+        .group_by(HealthCase.ward_id)
+        .cte("anchor")
+    )
+    cases = case_rate_query().cte("cases")
+    # compute_water_risk_score, in SQL
+    water_risk = (
+        0.5 * _clip(WaterQuality.coliform_cfu, 500) / 500
+        + 0.3 * _clip(WaterQuality.turbidity_ntu, 10) / 10
+        + 0.2 * func.least(func.abs(WaterQuality.ph - 7.0), 3) / 3
+    ) * 100
+    water = (
+        select(
+            anchor.c.ward_id,
+            func.avg(water_risk).label("avg_water_risk"),
+            func.max(WaterQuality.coliform_cfu).label("max_coliform"),
+            func.avg(WaterQuality.ph).label("avg_ph"),
+        )
+        .join(WaterQuality, and_(
+            WaterQuality.ward_id == anchor.c.ward_id,
+            WaterQuality.sample_date > anchor.c.as_of - _days(WATER_LOOKBACK_DAYS),
+            WaterQuality.sample_date <= anchor.c.as_of,
+        ))
+        .group_by(anchor.c.ward_id)
+        .cte("water")
+    )
+    return (
+        select(
+            anchor.c.ward_id, anchor.c.as_of, cases.c.cases_7d_avg,
+            water.c.avg_water_risk, water.c.max_coliform, water.c.avg_ph,
+        )
+        .outerjoin(cases, cases.c.ward_id == anchor.c.ward_id)
+        .outerjoin(water, water.c.ward_id == anchor.c.ward_id)
+        .order_by(anchor.c.ward_id)
+    )
+
+
+def input_hash(features: Dict[str, float]) -> str:
+    rounded = {k: round(v, 6) for k, v in features.items()}
+    return hashlib.sha1(json.dumps(rounded, sort_keys=True).encode()).hexdigest()[:16]
+
+
+async def _previous_runs(db: AsyncSession) -> Dict[Tuple[int, int], Tuple[str, Optional[str]]]:
+    """(ward, horizon) → (model_version, input_hash) of the latest stored prediction."""
+    query = (
+        select(
+            RiskPrediction.ward_id, RiskPrediction.horizon_days, RiskPrediction.model_version,
+            RiskPrediction.features_snapshot["input_hash"].astext,
+        )
+        .distinct(RiskPrediction.ward_id, RiskPrediction.horizon_days)
+        .order_by(RiskPrediction.ward_id, RiskPrediction.horizon_days, RiskPrediction.predicted_at.desc())
+    )
+    return {(w, h): (version, digest) for w, h, version, digest in (await db.execute(query)).all()}
+
+
+def _model(family: str, horizon: int):
+    from tarun.model_registry import registry
+
+    return registry.get(family, horizon)
+
+
+def _predict(model, rows: List[List[float]]) -> List[float]:
+    import numpy as np
+
+    proba = model.predict_proba(np.asarray(rows, dtype=float))[:, 1]
+    return np.round(proba * 100, 2).tolist()
+
+
+async def run(db: AsyncSession, family: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+    from tarun.model_registry import FEATURE_NAMES, score_to_band
+
+    family = family or settings.BATCH_MODEL_FAMILY
+    started = time.perf_counter()
+
+    wards, incomplete = [], 0
+    for row in (await db.execute(feature_query())).mappings():
+        features = {name: row[name] for name in FEATURE_NAMES}
+        if any(v is None or (isinstance(v, float) and math.isnan(v)) for v in features.values()):
+            incomplete += 1  # no water samples in the lookback window — as feature_lookup drops them
+            continue
+        features = {k: float(v) for k, v in features.items()}
+        wards.append({"ward_id": row["ward_id"], "as_of": row["as_of"], "features": features,
+                      "input_hash": input_hash(features)})
+
+    previous = {} if force else await _previous_runs(db)
+    rows, skipped = [], 0
+    for horizon in HORIZONS:
+        model = await asyncio.to_thread(_model, family, horizon)
+        todo = [w for w in wards if previous.get((w["ward_id"], horizon)) != (model.version, w["input_hash"])]
+        skipped += len(wards) - len(todo)
+        if not todo:
+            continue
+        X = [[w["features"][name] for name in FEATURE_NAMES] for w in todo]
+        scores = await asyncio.to_thread(_predict, model.model, X)
+        for ward, score in zip(todo, scores):
+            rows.append({
+                "ward_id": ward["ward_id"],
+                "risk_score": score,
+                "risk_band": score_to_band(score),
+                "horizon_days": horizon,
+                "model_version": model.version,
+                "features_snapshot": {
+                    **ward["features"],
+                    "as_of": ward["as_of"].isoformat(),
+                    "input_hash": ward["input_hash"],
+                },
+            })
+
+    if rows:
+        await db.execute(insert(RiskPrediction), rows)
+        await db.commit()
+        risk_map.invalidate()
+
+    return {
+        "wards_scored": len({r["ward_id"] for r in rows}),
+        "predictions_written": len(rows),
+        "skipped_unchanged": skipped,
+        "wards_missing_features": incomplete,
+        "model_family": family,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import AsyncSessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Score every ward and store RiskPrediction rows")
+    parser.add_argument("--family", default=None, help=f"model family (default {settings.BATCH_MODEL_FAMILY})")
+    parser.add_argument("--force", action="store_true", help="rescore wards whose inputs did not change")
+    parser.add_argument("--every", type=float, default=None, help="repeat every N seconds")
+    args = parser.parse_args()
+
+    async def main():
+        try:
+            while True:
+                async with AsyncSessionLocal() as db:
+                    print(json.dumps(await run(db, args.family, args.force)), flush=True)
+                if args.every is None:
+                    break
+                await asyncio.sleep(args.every)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Alert Rule Engine Benchmark
+#  Events per second through alert_rules.RuleEngine.evaluate
+# ─────────────────────────────────────────────────────────────
+#
+#  Replays synthetic water samples and health reports for --wards
+#  wards in time order, in memory (no database), and reports the
+#  sustained evaluation rate plus how many alerts were raised.
+#  The per-event cost must not grow with history: the rate at
+#  --events and at 10 × --events should match.
+#
+#  Run:  python -m sachin.bench_alert_rules [--events 200000] [--wards 200]
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from .alert_rules import RuleEngine
+
+
+def synthetic_events(n: int, wards: int, seed: int = 0):
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for i in range(n):
+        ward, step = i % wards + 1, i // wards
+        if i % 2:
+            yield "water", {
+                "ward_id": ward, "sample_date": start + timedelta(hours=step),
+                "ph": rng.gauss(7.2, 0.3), "turbidity_ntu": abs(rng.gauss(2.0, 1.0)),
+                "coliform_cfu": 0.0 if rng.random() > 0.01 else rng.uniform(1, 50),
+                "chlorine_mg_l": abs(rng.gauss(0.5, 0.1)),
+            }
+        else:
+            yield "health", {
+                "ward_id": ward, "report_date": start + timedelta(days=step),
+                "cases_reported": max(0, int(rng.gauss(5, 2))), "hospitalised": 0,
+            }
+
+
+def run(events: int, wards: int):
+    stream = list(synthetic_events(events, wards))
+    engine = RuleEngine()
+    alerts = Counter()
+    started = time.perf_counter()
+    for kind, record in stream:
+        for alert in engine.evaluate(kind, record):
+            alerts[alert["alert_type"]] += 1
+    elapsed = time.perf_counter() - started
+    return events / elapsed, alerts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="alert rule engine throughput")
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--wards", type=int, default=200)
+    args = parser.parse_args()
+
+    for n in (args.events, args.events * 10):
+        rate, alerts = run(n, args.wards)
+        raised = ", ".join(f"{k} {v:,}" for k, v in sorted(alerts.items()))
+        print(f"{n:>10,} events  {rate:12,.0f} events/s  alert candidates: {raised}")
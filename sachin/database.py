@@ -7,7 +7,7 @@
 #   • Alembic migration scripts
 #   • SQLAlchemy ORM models for all core tables
 #   • FastAPI CRUD endpoints consumed by the dashboard
-#   • Data ingestion (CSV → DB) helpers
+#   • Data ingestion (CSV → DB) helpers — see ingestion.py
 # ─────────────────────────────────────────────────────────────
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
@@ -23,6 +23,7 @@ class Settings(BaseSettings):
 
     class Config:
         env_file = ".env"
+        extra = "ignore"
 
 
 settings = Settings()
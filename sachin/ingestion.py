@@ -0,0 +1,347 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Bulk CSV Ingestion
+#  Health cases, water samples and weather readings → PostgreSQL
+# ─────────────────────────────────────────────────────────────
+#
+#  The CSV is read row-chunk by row-chunk (INGEST_CHUNK_ROWS), so
+#  memory stays flat whatever the file size. Every row is parsed
+#  and range-checked; rejected rows are reported with their row
+#  number and reason instead of failing the whole file. Reading and
+#  validating a chunk runs in a worker thread (asyncio.to_thread),
+#  so a large upload never stalls the server's event loop.
+#
+#  Loading, per chunk and per transaction (both return the ids of
+#  the rows actually inserted or changed):
+#    copy         asyncpg COPY into a temp table, then one
+#                 INSERT … SELECT … ON CONFLICT (id) DO UPDATE
+#    executemany  batched INSERT … ON CONFLICT (any driver)
+#
+#  Rows that were inserted or changed then go through the streaming
+#  alert rules (alert_rules.py) in the same transaction; unchanged
+#  rows from a re-posted file do not raise alerts again.
+#
+#  Re-running a file is idempotent: the primary key is a UUIDv5 of
+#  the row's natural key (ward, timestamp, …), so a repeated row
+#  updates its earlier copy — and only if a value actually changed.
+#
+#  Run:  python -m sachin.ingestion health path/to/health.csv
+# ─────────────────────────────────────────────────────────────
+
+import asyncio
+import csv
+import io
+import itertools
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import column as sql_column, table as sql_table
+
+from . import alert_rules, batch_predict, rollups
+from .models import HealthCase, Ward, WaterQuality, WeatherRecord
+
+
+class Settings(BaseSettings):
+    INGEST_CHUNK_ROWS: int = 5000
+    INGEST_METHOD: str = "copy"  # copy | executemany
+    INGEST_MAX_REPORTED_INVALID: int = 100
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+ID_NAMESPACE = uuid.UUID("6f1c3f0e-2b8a-4c57-9a53-3d1f0b6c9e21")
+
+
+class RowError(ValueError):
+    pass
+
+
+def _timestamp(value: str) -> datetime:
+    ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # Date-only and naive values are taken as UTC
+    return ts if ts.tzinfo else ts.replace(tzinfo=timezone.utc)
+
+
+def _int(value: str) -> int:
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError
+    return int(number)
+
+
+@dataclass
+class Field:
+    name: str
+    parse: Callable[[str], Any]
+    required: bool = False
+    low: Optional[float] = None
+    high: Optional[float] = None
+    unit: str = ""
+
+    def convert(self, raw: Optional[str]):
+        raw = (raw or "").strip()
+        if not raw:
+            if self.required:
+                raise RowError(f"Missing {self.name}")
+            return None
+        try:
+            value = self.parse(raw)
+        except ValueError:
+            raise RowError(f"Invalid {self.name} {raw!r}")
+        if self.low is not None and value < self.low:
+            raise RowError(f"{self.name} out of range (< {self.low:g}{self.unit})")
+        if self.high is not None and value > self.high:
+            raise RowError(f"{self.name} out of range (> {self.high:g}{self.unit})")
+        return value
+
+
+@dataclass
+class Kind:
+    model: type
+    fields: List[Field]
+    key: Tuple[str, ...]  # natural key → deterministic id
+    aliases: Dict[str, str]  # accepted header spellings (e.g. mock_seed_data)
+    measurements: Tuple[str, ...] = ()  # at least one must be present
+
+    @property
+    def columns(self) -> List[str]:
+        return ["id"] + [f.name for f in self.fields]
+
+
+KINDS: Dict[str, Kind] = {
+    "health": Kind(
+        HealthCase,
+        [
+            Field("ward_id", _int, required=True),
+            Field("report_date", _timestamp, required=True),
+            Field("disease", str),
+            Field("cases_reported", _int, required=True, low=0),
+            Field("hospitalised", _int, low=0),
+            Field("source", str),
+        ],
+        key=("ward_id", "report_date", "disease", "source"),
+        aliases={"date": "report_date", "cases": "cases_reported", "hospitalizations": "hospitalised"},
+    ),
+    "water": Kind(
+        WaterQuality,
+        [
+            Field("ward_id", _int, required=True),
+            Field("sample_date", _timestamp, required=True),
+            Field("ph", float, low=0, high=14),
+            Field("turbidity_ntu", float, low=0, high=4000, unit=" NTU"),
+            Field("coliform_cfu", float, low=0),
+            Field("chlorine_mg_l", float, low=0, high=50, unit=" mg/L"),
+            Field("source_type", str),
+        ],
+        key=("ward_id", "sample_date", "source_type"),
+        aliases={"timestamp": "sample_date", "turbidity": "turbidity_ntu",
+                 "coliform": "coliform_cfu", "chlorine": "chlorine_mg_l"},
+        measurements=("ph", "turbidity_ntu", "coliform_cfu", "chlorine_mg_l"),
+    ),
+    "weather": Kind(
+        WeatherRecord,
+        [
+            Field("ward_id", _int, required=True),
+            Field("recorded_at", _timestamp, required=True),
+            Field("temperature_c", float, low=-10, high=50, unit="°C"),
+            Field("rainfall_mm", float, low=0, high=1000, unit=" mm"),
+            Field("humidity_pct", float, low=0, high=100, unit="%"),
+        ],
+        key=("ward_id", "recorded_at"),
+        aliases={"timestamp": "recorded_at", "temp_c": "temperature_c",
+                 "rainfall": "rainfall_mm", "humidity": "humidity_pct"},
+        measurements=("temperature_c", "rainfall_mm", "humidity_pct"),
+    ),
+}
+
+
+def row_id(kind_name: str, record: Dict[str, Any]) -> uuid.UUID:
+    parts = [kind_name]
+    for name in KINDS[kind_name].key:
+        value = record[name]
+        parts.append(value.astimezone(timezone.utc).isoformat() if isinstance(value, datetime) else str(value or ""))
+    return uuid.uuid5(ID_NAMESPACE, "|".join(parts))
+
+
+def parse_row(kind_name: str, row: Dict[str, str], ward_ids: Optional[set]) -> Dict[str, Any]:
+    kind = KINDS[kind_name]
+    record = {f.name: f.convert(row.get(f.name)) for f in kind.fields}
+    if ward_ids is not None and record["ward_id"] not in ward_ids:
+        raise RowError(f"Unknown ward_id {record['ward_id']}")
+    if kind.measurements and all(record[m] is None for m in kind.measurements):
+        raise RowError("No measurements")
+    if kind_name == "health" and (record["hospitalised"] or 0) > record["cases_reported"]:
+        raise RowError("hospitalised exceeds cases_reported")
+    record["id"] = row_id(kind_name, record)
+    return record
+
+
+def _normalise_header(kind: Kind, header: List[str]) -> List[str]:
+    names = [h.strip().lower() for h in header]
+    return [kind.aliases.get(n, n) for n in names]
+
+
+# ── Loaders ───────────────────────────────────────────────────
+def _upsert(kind: Kind, stmt):
+    """ON CONFLICT (id) DO UPDATE, skipped when nothing changed (no dead tuples on re-runs)."""
+    table = kind.model.__table__
+    values = [f.name for f in kind.fields]
+    set_ = {name: stmt.excluded[name] for name in values}
+    if "updated_at" in table.c:
+        set_["updated_at"] = func.now()  # onupdate does not apply to ON CONFLICT; rollups key off it
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_=set_,
+        where=tuple_(*(table.c[n] for n in values)).is_distinct_from(
+            tuple_(*(stmt.excluded[n] for n in values))
+        ),
+    )
+
+
+async def _load_copy(db: AsyncSession, kind: Kind, records: List[Dict[str, Any]]) -> List[uuid.UUID]:
+    table = kind.model.__table__
+    staging = f"_ingest_{table.name}"
+    await db.execute(text(f"CREATE TEMP TABLE {staging} (LIKE {table.name} INCLUDING DEFAULTS) ON COMMIT DROP"))
+    raw = await (await db.connection()).get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        staging, records=[tuple(r[c] for c in kind.columns) for r in records], columns=kind.columns,
+    )
+    source = sql_table(staging, *(sql_column(c) for c in kind.columns))
+    stmt = insert(table).from_select(kind.columns, select(*source.c))
+    result = await db.execute(_upsert(kind, stmt).returning(table.c.id))
+    return list(result.scalars())
+
+
+async def _load_executemany(db: AsyncSession, kind: Kind, records: List[Dict[str, Any]]) -> List[uuid.UUID]:
+    stmt = _upsert(kind, insert(kind.model.__table__)).returning(kind.model.__table__.c.id)
+    result = await db.execute(stmt, records)
+    return list(result.scalars())
+
+
+LOADERS = {"copy": _load_copy, "executemany": _load_executemany}
+
+
+# ── Driver ────────────────────────────────────────────────────
+def parse_chunk(
+    kind_name: str, rows: Iterator[Tuple[int, Dict[str, str]]], size: int, ward_ids: Optional[set],
+) -> Tuple[int, int, Dict[uuid.UUID, Dict[str, Any]], List[Tuple[int, str]]]:
+    """
+    Read and validate the next `size` rows. Blocking — ingest() runs it in a
+    worker thread. Returns (rows read, rows accepted, records by id, rejections).
+    """
+    total = accepted = 0
+    batch: Dict[uuid.UUID, Dict[str, Any]] = {}
+    rejected: List[Tuple[int, str]] = []
+    for number, row in itertools.islice(rows, size):
+        total += 1
+        try:
+            record = parse_row(kind_name, row, ward_ids)
+        except RowError as exc:
+            rejected.append((number, str(exc)))
+            continue
+        accepted += 1
+        batch[record["id"]] = record  # a key repeated within the chunk: last row wins
+    return total, accepted, batch, rejected
+
+
+async def ingest(
+    db: AsyncSession,
+    kind_name: str,
+    stream: io.TextIOBase,
+    method: Optional[str] = None,
+    chunk_rows: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Validate and upsert one CSV. Each chunk commits on its own, so a re-run resumes cleanly."""
+    kind = KINDS[kind_name]
+    method = method or settings.INGEST_METHOD
+    if db.get_bind().dialect.driver != "asyncpg":
+        method = "executemany"  # COPY goes through the asyncpg connection
+    load = LOADERS[method]
+    started = time.perf_counter()
+
+    reader = csv.reader(stream)
+    header = await asyncio.to_thread(next, reader, None)
+    if header is None:
+        raise RowError("Empty file")
+    names = _normalise_header(kind, header)
+    missing = [f.name for f in kind.fields if f.required and f.name not in names]
+    if missing:
+        raise RowError(f"Missing columns: {', '.join(missing)}")
+    ward_ids = set((await db.execute(select(Ward.id))).scalars())
+
+    evaluate_rules = alert_rules.settings.ALERT_RULES_ENABLED and kind_name in alert_rules.RULES
+    total = accepted = written = invalid = alerts = 0
+    reasons: List[Dict[str, Any]] = []
+    rows = enumerate((dict(zip(names, values)) for values in reader), start=1)
+    size = chunk_rows or settings.INGEST_CHUNK_ROWS
+    while True:
+        count, ok, batch, rejected = await asyncio.to_thread(parse_chunk, kind_name, rows, size, ward_ids)
+        if not count:
+            break
+        total += count
+        accepted += ok
+        invalid += len(rejected)
+        room = settings.INGEST_MAX_REPORTED_INVALID - len(reasons)
+        reasons += [{"row": number, "reason": reason} for number, reason in rejected[:max(room, 0)]]
+        if batch:
+            if evaluate_rules:
+                await alert_rules.warm(db, kind_name, {r["ward_id"] for r in batch.values()})
+            written_ids = await load(db, kind, list(batch.values()))
+            written += len(written_ids)
+            if evaluate_rules and written_ids:
+                alerts += await alert_rules.evaluate_batch(db, kind_name, [batch[i] for i in written_ids])
+            await db.commit()
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "kind": kind_name,
+        "method": method,
+        "rows_total": total,
+        "rows_accepted": accepted,
+        "rows_invalid": invalid,
+        "rows_written": written,  # inserted or changed; accepted − written were already up to date
+        "invalid_reasons": reasons,
+        "alerts_raised": alerts,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(total / elapsed, 1) if elapsed > 0 else None,
+        "ingested_at": datetime.now(timezone.utc).isoformat(),
+    }
+    if rollups.settings.ROLLUPS_ENABLED and kind_name in rollups.SOURCES and written:
+        report["rollup_buckets_refreshed"] = await rollups.refresh(db, kind_name)
+    if batch_predict.settings.PREDICT_AFTER_INGEST and kind_name in ("health", "water") and written:
+        report["batch_prediction"] = await batch_predict.run(db)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+    import json
+
+    from .database import AsyncSessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Bulk-load a CSV into health_cases / water_quality / weather_records")
+    parser.add_argument("kind", choices=list(KINDS))
+    parser.add_argument("path")
+    parser.add_argument("--method", choices=list(LOADERS), default=None)
+    parser.add_argument("--chunk-rows", type=int, default=None)
+    args = parser.parse_args()
+
+    async def main():
+        with open(args.path, newline="", encoding="utf-8-sig") as stream:
+            async with AsyncSessionLocal() as db:
+                report = await ingest(db, args.kind, stream, args.method, args.chunk_rows)
+        await engine.dispose()
+        print(json.dumps(report, indent=2))
+
+    asyncio.run(main())
@@ -3,14 +3,24 @@
 #  Database Connectivity & REST API Module
 # ─────────────────────────────────────────────────────────────
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import wards, health, water, alerts, predictions
+from .alert_stream import broker
+from .routers import wards, health, water, alerts, predictions, aggregates, ingest, dashboard
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await broker.close()  # LISTEN connection for /api/alerts/stream
+
 
 app = FastAPI(
     title="Neervazh Kavalan — Data API",
     description="REST endpoints for ward data, health cases, water quality, alerts & predictions.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -26,6 +36,9 @@ app.include_router(health.router,      prefix="/api/health",      tags=["Health
 app.include_router(water.router,       prefix="/api/water",       tags=["Water Quality"])
 app.include_router(alerts.router,      prefix="/api/alerts",      tags=["Alerts"])
 app.include_router(predictions.router, prefix="/api/predictions", tags=["Predictions"])
+app.include_router(aggregates.router,  prefix="/api/aggregates",  tags=["Aggregates"])
+app.include_router(ingest.router,      prefix="/api/ingest",      tags=["Ingestion"])
+app.include_router(dashboard.router,   prefix="/api/dashboard",   tags=["Dashboard"])
 
 
 @app.get("/health")
@@ -5,7 +5,7 @@
 
 from sqlalchemy import (
     Column, Integer, String, Float, Boolean, DateTime,
-    ForeignKey, Text, Enum as PgEnum
+    ForeignKey, Index, Text, Enum as PgEnum, text
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
@@ -26,6 +26,16 @@ class Ward(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class WardShape(Base):
+    """Ward outline pre-simplified for one map zoom level (built by risk_map.py)."""
+    __tablename__ = "ward_shapes"
+
+    ward_id = Column(Integer, ForeignKey("wards.id", ondelete="CASCADE"), primary_key=True)
+    zoom = Column(Integer, primary_key=True)
+    geojson = Column(Text, nullable=False)  # ST_AsGeoJSON, coordinates rounded for the zoom
+    built_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class HealthCase(Base):
     __tablename__ = "health_cases"
 
@@ -37,6 +47,14 @@ class HealthCase(Base):
     report_date = Column(DateTime(timezone=True), index=True)
     source = Column(String(80))  # PHC, Hospital, FieldWorker
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Moves when ingestion rewrites the row; the rollup refresh watermark
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Keyset pages: WHERE ward_id = ? AND (report_date, id) < (?, ?) ORDER BY report_date DESC, id DESC
+        Index("ix_health_cases_ward_report_date", "ward_id", "report_date", "id"),
+        Index("ix_health_cases_updated_at", "updated_at"),
+    )
 
 
 class WaterQuality(Base):
@@ -51,6 +69,12 @@ class WaterQuality(Base):
     sample_date = Column(DateTime(timezone=True), index=True)
     source_type = Column(String(80))  # tap, borewell, surface
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_water_quality_ward_sample_date", "ward_id", "sample_date", "id"),
+        Index("ix_water_quality_updated_at", "updated_at"),
+    )
 
 
 class WeatherRecord(Base):
@@ -76,6 +100,18 @@ class RiskPrediction(Base):
     features_snapshot = Column(JSONB)
     predicted_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # max(predicted_at) per horizon is the risk-map cache version
+        Index("ix_risk_predictions_horizon_predicted_at", "horizon_days", "predicted_at"),
+    )
+
+
+# Latest prediction per ward: DISTINCT ON (ward_id, horizon_days) ... ORDER BY predicted_at DESC
+Index(
+    "ix_risk_predictions_latest",
+    RiskPrediction.ward_id, RiskPrediction.horizon_days, RiskPrediction.predicted_at.desc(),
+)
+
 
 class Alert(Base):
     __tablename__ = "alerts"
@@ -89,3 +125,18 @@ class Alert(Base):
     acknowledged_by = Column(String(120))
     acknowledged_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    dedup_key = Column(String(160))  # "ward:rule" for engine-raised alerts (alert_rules.py)
+
+    __table_args__ = (
+        # At most one open alert per dedup_key
+        Index("uq_alerts_open_dedup_key", "dedup_key", unique=True,
+              postgresql_where=text("acknowledged IS NOT TRUE")),
+        # GET /api/alerts/ (newest first) and stream resume on (created_at, id)
+        Index("ix_alerts_created_at_id", "created_at", "id"),
+        # Open alerts of one ward, newest first
+        Index("ix_alerts_open_ward_created_at", "ward_id", "created_at",
+              postgresql_where=text("acknowledged IS NOT TRUE")),
+        # Stream resume for acknowledgement events
+        Index("ix_alerts_acknowledged_at_id", "acknowledged_at", "id",
+              postgresql_where=text("acknowledged_at IS NOT NULL")),
+    )
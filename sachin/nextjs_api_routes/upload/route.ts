@@ -1,41 +1,66 @@
 import { NextResponse } from 'next/server';
 
-export async function POST(req: Request) {
-    await new Promise(r => setTimeout(r, 800));
+// Proxies the upload to sachin's POST /api/ingest/{kind} and maps its report
+// onto the shape UploadModal expects.
+const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000';
+const KINDS = ['health', 'water', 'weather'];
 
-    const contentType = req.headers.get('content-type') || '';
-    let filename = 'upload.csv';
-    let rowsTotal = 120;
+interface IngestReport {
+    filename: string;
+    rows_total: number;
+    rows_accepted: number;
+    rows_invalid: number;
+    invalid_reasons: { row: number; reason: string }[];
+    ingested_at: string;
+    seconds: number;
+}
 
-    if (contentType.includes('multipart/form-data')) {
-        try {
-            const form = await req.formData();
-            const file = form.get('file') as File | null;
-            if (file) {
-                filename = file.name;
-                const text = await file.text();
-                rowsTotal = text.split('\n').length - 1; // minus header
-            }
-        } catch { }
+export async function POST(req: Request) {
+    let form: FormData;
+    try {
+        form = await req.formData();
+    } catch {
+        return NextResponse.json({ success: false, error: 'Expected multipart/form-data' }, { status: 400 });
     }
 
-    const rowsAccepted = Math.floor(rowsTotal * (Math.random() * 0.05 + 0.93));
-    const rowsInvalid = rowsTotal - rowsAccepted;
+    const file = form.get('file') as File | null;
+    const kind = String(form.get('type') || 'health');
+    if (!file) {
+        return NextResponse.json({ success: false, error: 'No file uploaded' }, { status: 400 });
+    }
+    if (!KINDS.includes(kind)) {
+        return NextResponse.json({ success: false, error: `Unknown upload type ${kind}` }, { status: 400 });
+    }
+
+    const upstream = new FormData();
+    upstream.append('file', file, file.name);
+
+    let res: Response;
+    try {
+        res = await fetch(`${API_URL}/api/ingest/${kind}`, { method: 'POST', body: upstream });
+    } catch {
+        return NextResponse.json({ success: false, error: 'Ingestion service unavailable' }, { status: 502 });
+    }
+    if (!res.ok) {
+        const body = await res.json().catch(() => ({}));
+        return NextResponse.json(
+            { success: false, error: body.detail || `Ingestion failed (${res.status})` },
+            { status: res.status },
+        );
+    }
 
+    const report: IngestReport = await res.json();
     return NextResponse.json({
         success: true,
-        jobId: `job_${Date.now()}`,
-        filename,
+        jobId: `ingest_${kind}_${Date.parse(report.ingested_at)}`,
+        filename: report.filename,
         summary: {
-            rowsTotal,
-            rowsAccepted,
-            rowsInvalid,
-            invalidReasons: rowsInvalid > 0 ? [
-                { row: 34, reason: 'Missing ward_id' },
-                { row: 67, reason: 'Temperature out of range (> 50°C)' },
-            ] : [],
-            ingestionTimestamp: new Date().toISOString(),
-            lagSeconds: Math.floor(Math.random() * 30 + 10),
+            rowsTotal: report.rows_total,
+            rowsAccepted: report.rows_accepted,
+            rowsInvalid: report.rows_invalid,
+            invalidReasons: report.invalid_reasons,
+            ingestionTimestamp: report.ingested_at,
+            lagSeconds: Math.round(report.seconds),
         },
     });
 }
@@ -0,0 +1,90 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Keyset Pagination
+#  Time-ordered, cursor-paged reads for per-ward time series
+# ─────────────────────────────────────────────────────────────
+#
+#  Pages are ordered newest first on (date, id). The cursor is the
+#  (date, id) of the last row served, so the next page is
+#
+#    WHERE ward_id = :ward AND (date, id) < (:cursor_date, :cursor_id)
+#    ORDER BY date DESC, id DESC LIMIT :limit
+#
+#  — a range scan on the (ward_id, date, id) index whatever the page
+#  depth, unlike OFFSET. `fields` projects columns so only what the
+#  caller asked for leaves the database.
+# ─────────────────────────────────────────────────────────────
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(date: datetime, row_id: uuid.UUID) -> str:
+    raw = json.dumps([date.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date, row_id = json.loads(raw)
+        return datetime.fromisoformat(date), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(model, fields: Optional[str], always: List[str]) -> List[str]:
+    """Validate a comma-separated column list; `always` columns are added for the cursor."""
+    columns = model.__table__.columns.keys()
+    if not fields:
+        return list(columns)
+    wanted = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in wanted if f not in columns]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return always + [f for f in wanted if f not in always]
+
+
+async def keyset_page(
+    db: AsyncSession,
+    model,
+    date_column: str,
+    ward_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fields: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    date_col = getattr(model, date_column)
+    names = parse_fields(model, fields, always=["id", date_column])
+
+    # Undated rows cannot be placed on the timeline (and DESC sorts NULLs first)
+    query = select(*(getattr(model, n) for n in names)).where(
+        model.ward_id == ward_id, date_col.isnot(None)
+    )
+    if start is not None:
+        query = query.where(date_col >= start)
+    if end is not None:
+        query = query.where(date_col < end)
+    if cursor:
+        query = query.where(tuple_(date_col, model.id) < tuple_(*decode_cursor(cursor)))
+    # One extra row tells us whether another page exists
+    query = query.order_by(date_col.desc(), model.id.desc()).limit(limit + 1)
+
+    rows = (await db.execute(query)).mappings().all()
+    items = [dict(r) for r in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(last[date_column], last["id"])
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,178 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Ward Risk Map
+#  Simplified ward outlines + latest risk band, as cached GeoJSON
+# ─────────────────────────────────────────────────────────────
+#
+#  `build` simplifies every ward once per zoom level in MAP_ZOOM_LEVELS
+#  (ST_SimplifyPreserveTopology, tolerance ≈ MAP_SIMPLIFY_PX screen
+#  pixels at that zoom) and stores the GeoJSON text with coordinates
+#  rounded to the same precision in ward_shapes. A map request then
+#  never touches the full-resolution polygons.
+#
+#  The FeatureCollection is assembled in one query (json_agg over
+#  ward_shapes ⋈ latest prediction per ward) and cached per
+#  (zoom, horizon). The cache version — and the ETag — is the newest
+#  predicted_at for that horizon plus the shapes' build time, so it
+#  changes only when a prediction is written or the shapes are
+#  rebuilt; everything else is a 304 or a cached body.
+#
+#  Run:  python -m sachin.risk_map build     (after loading ward geometries)
+# ─────────────────────────────────────────────────────────────
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+from sqlalchemy import JSON, Text, and_, cast, func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .http_cache import make_etag
+from .models import RiskPrediction, Ward, WardShape
+from .snapshot import latest_predictions
+
+
+class Settings(BaseSettings):
+    MAP_ZOOM_LEVELS: str = "8,10,12,14"
+    MAP_SIMPLIFY_PX: float = 0.5
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+ZOOM_LEVELS: List[int] = sorted(int(z) for z in settings.MAP_ZOOM_LEVELS.split(","))
+HORIZONS = (7, 14)  # the horizons batch_predict writes; anything else would only grow _cache
+
+# (zoom, horizon) → (etag, body)
+_cache: Dict[Tuple[int, int], Tuple[str, bytes]] = {}
+
+
+def degrees_per_pixel(zoom: int) -> float:
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def tolerance(zoom: int) -> float:
+    return degrees_per_pixel(zoom) * settings.MAP_SIMPLIFY_PX
+
+
+def coordinate_digits(zoom: int) -> int:
+    """Decimal places needed to keep coordinates within half a pixel."""
+    return max(0, math.ceil(-math.log10(degrees_per_pixel(zoom) / 2)))
+
+
+def snap_zoom(zoom: int) -> int:
+    """Closest precomputed level at or below the requested zoom."""
+    below = [z for z in ZOOM_LEVELS if z <= zoom]
+    return below[-1] if below else ZOOM_LEVELS[0]
+
+
+def _sql(value) -> literal_column:
+    # Inlined constants: json_build_object's variadic arguments give
+    # bound parameters no type for asyncpg to infer
+    return literal_column(f"'{value}'" if isinstance(value, str) else str(int(value)))
+
+
+async def build(db: AsyncSession, zooms: Optional[List[int]] = None) -> int:
+    """(Re)compute ward_shapes for every zoom level. Returns rows written."""
+    written = 0
+    for zoom in zooms or ZOOM_LEVELS:
+        simplified = func.ST_SimplifyPreserveTopology(Ward.geometry, tolerance(zoom))
+        query = select(
+            Ward.id,
+            _sql(zoom),
+            func.ST_AsGeoJSON(simplified, coordinate_digits(zoom)),
+            func.now(),
+        ).where(Ward.geometry.isnot(None))
+        stmt = insert(WardShape).from_select(["ward_id", "zoom", "geojson", "built_at"], query)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["ward_id", "zoom"],
+            set_={"geojson": stmt.excluded.geojson, "built_at": stmt.excluded.built_at},
+        )
+        written += (await db.execute(stmt)).rowcount
+    await db.commit()
+    invalidate()
+    return written
+
+
+async def current_etag(db: AsyncSession, zoom: int, horizon_days: int) -> Optional[str]:
+    """ETag of the map as it stands; None when ward_shapes has not been built."""
+    latest = (
+        select(func.max(RiskPrediction.predicted_at))
+        .where(RiskPrediction.horizon_days == horizon_days)
+        .scalar_subquery()
+    )
+    built = select(func.max(WardShape.built_at)).where(WardShape.zoom == zoom).scalar_subquery()
+    predicted_at, built_at = (await db.execute(select(latest, built))).one()
+    if built_at is None:
+        return None
+    return make_etag("risk-map", zoom, horizon_days, predicted_at, built_at)
+
+
+async def feature_collection(db: AsyncSession, zoom: int, horizon_days: int, etag: str) -> bytes:
+    cached = _cache.get((zoom, horizon_days))
+    if cached and cached[0] == etag:
+        return cached[1]
+
+    latest = latest_predictions(horizon_days)
+    properties = func.json_build_object(
+        _sql("ward_id"), Ward.id,
+        _sql("ward_number"), Ward.ward_number,
+        _sql("ward_name"), Ward.ward_name,
+        _sql("zone"), Ward.zone,
+        _sql("population"), Ward.population,
+        _sql("risk_score"), latest.c.risk_score,
+        _sql("risk_band"), latest.c.risk_band,
+        _sql("predicted_at"), latest.c.predicted_at,
+    )
+    feature = func.json_build_object(
+        _sql("type"), _sql("Feature"),
+        _sql("id"), Ward.id,
+        _sql("geometry"), cast(WardShape.geojson, JSON),
+        _sql("properties"), properties,
+    )
+    features = func.coalesce(func.json_agg(aggregate_order_by(feature, Ward.id)), literal_column("'[]'::json"))
+    document = func.json_build_object(
+        _sql("type"), _sql("FeatureCollection"),
+        _sql("zoom"), _sql(zoom),
+        _sql("horizon_days"), _sql(horizon_days),
+        _sql("features"), features,
+    )
+    query = (
+        select(cast(document, Text))
+        .select_from(Ward)
+        .join(WardShape, and_(WardShape.ward_id == Ward.id, WardShape.zoom == zoom))
+        .outerjoin(latest, latest.c.ward_id == Ward.id)
+    )
+    body = (await db.execute(query)).scalar_one().encode()
+    _cache[(zoom, horizon_days)] = (etag, body)
+    return body
+
+
+def invalidate() -> None:
+    """Drop cached maps now rather than on the next version check (in-process writers)."""
+    _cache.clear()
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    from .database import AsyncSessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Precompute simplified ward outlines per zoom level")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--zooms", default=None, help=f"comma-separated, default {settings.MAP_ZOOM_LEVELS}")
+    args = parser.parse_args()
+
+    async def main():
+        async with engine.begin() as conn:
+            await conn.run_sync(WardShape.__table__.create, checkfirst=True)
+        zooms = [int(z) for z in args.zooms.split(",")] if args.zooms else None
+        async with AsyncSessionLocal() as db:
+            print(f"ward_shapes rows written: {await build(db, zooms)}")
+        await engine.dispose()
+
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Time-bucket Rollups
+#  Pre-aggregated health (daily) and water (hourly) tables
+# ─────────────────────────────────────────────────────────────
+#
+#  Each rollup row holds, per (ward_id, bucket), the sum / count /
+#  min / max of every metric, so coarser buckets and averages can be
+#  re-aggregated exactly: avg = Σsum / Σcount.
+#
+#  refresh() is incremental: only buckets holding rows whose
+#  updated_at is newer than the stored watermark are recomputed
+#  (INSERT … ON CONFLICT DO UPDATE). updated_at is set on insert and
+#  again whenever ingestion rewrites a row with corrected values, so
+#  corrections reach the rollups too. The watermark is re-read with
+#  ROLLUP_REFRESH_OVERLAP_S of overlap, so rows from transactions
+#  that committed late are still picked up — recomputing a bucket
+#  twice is harmless. Plain PostgreSQL is enough; on TimescaleDB
+#  these play the role of continuous aggregates.
+#
+#  Run:  python -m sachin.rollups create
+#        python -m sachin.rollups refresh
+# ─────────────────────────────────────────────────────────────
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from pydantic_settings import BaseSettings
+from sqlalchemy import Column, DateTime, Float, Integer, String, Table, func, literal_column, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import Base
+from .models import HealthCase, WaterQuality
+
+
+class Settings(BaseSettings):
+    ROLLUPS_ENABLED: bool = False
+    ROLLUP_REFRESH_OVERLAP_S: int = 300
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+STATS = ("sum", "count", "min", "max")
+BUCKETS = ("hour", "day", "week")
+
+
+def date_trunc(unit: str, column):
+    """date_trunc with the unit inlined — a bound parameter would make every
+    occurrence a different expression and break GROUP BY matching."""
+    if unit not in BUCKETS:
+        raise ValueError(f"Unsupported bucket: {unit}")
+    return func.date_trunc(literal_column(f"'{unit}'"), column)
+
+
+@dataclass
+class Source:
+    model: type
+    date_column: str
+    metrics: List[str]
+    rollup_name: str
+    rollup_bucket: str  # granularity of the rollup table
+    rollup: Optional[Table] = None
+
+    @property
+    def date_col(self):
+        return getattr(self.model, self.date_column)
+
+
+SOURCES: Dict[str, Source] = {
+    "health": Source(
+        HealthCase, "report_date", ["cases_reported", "hospitalised"],
+        rollup_name="health_cases_daily", rollup_bucket="day",
+    ),
+    "water": Source(
+        WaterQuality, "sample_date", ["ph", "turbidity_ntu", "coliform_cfu", "chlorine_mg_l"],
+        rollup_name="water_quality_hourly", rollup_bucket="hour",
+    ),
+}
+
+
+def _rollup_table(source: Source) -> Table:
+    columns = [
+        Column("ward_id", Integer, primary_key=True),
+        Column("bucket", DateTime(timezone=True), primary_key=True),
+    ]
+    for metric in source.metrics:
+        columns += [
+            Column(f"{metric}_sum", Float),
+            Column(f"{metric}_count", Integer, nullable=False, server_default="0"),
+            Column(f"{metric}_min", Float),
+            Column(f"{metric}_max", Float),
+        ]
+    return Table(source.rollup_name, Base.metadata, *columns)
+
+
+for _source in SOURCES.values():
+    _source.rollup = _rollup_table(_source)
+
+rollup_state = Table(
+    "rollup_state",
+    Base.metadata,
+    Column("name", String(80), primary_key=True),
+    Column("watermark", DateTime(timezone=True), nullable=False),
+)
+
+
+def _bucket_aggregates(source: Source):
+    """SELECT list computing every rollup column from raw rows."""
+    bucket = date_trunc(source.rollup_bucket, source.date_col)
+    columns = [source.model.ward_id.label("ward_id"), bucket.label("bucket")]
+    for metric in source.metrics:
+        col = getattr(source.model, metric)
+        columns += [
+            func.sum(col).label(f"{metric}_sum"),
+            func.count(col).label(f"{metric}_count"),
+            func.min(col).label(f"{metric}_min"),
+            func.max(col).label(f"{metric}_max"),
+        ]
+    return columns, bucket
+
+
+async def refresh(db: AsyncSession, name: str) -> int:
+    """Recompute the buckets touched since the last refresh. Returns buckets upserted."""
+    source = SOURCES[name]
+    table = source.rollup
+    # DB clock, same as updated_at's default
+    started = (await db.execute(select(func.now()))).scalar_one()
+    watermark = (await db.execute(
+        select(rollup_state.c.watermark).where(rollup_state.c.name == table.name)
+    )).scalar_one_or_none()
+
+    columns, bucket = _bucket_aggregates(source)
+    query = select(*columns).where(source.date_col.isnot(None)).group_by(source.model.ward_id, bucket)
+    if watermark is not None:
+        since = watermark - timedelta(seconds=settings.ROLLUP_REFRESH_OVERLAP_S)
+        touched = (
+            select(source.model.ward_id, date_trunc(source.rollup_bucket, source.date_col))
+            .where(source.model.updated_at > since, source.date_col.isnot(None))
+            .distinct()
+        )
+        query = query.where(tuple_(source.model.ward_id, bucket).in_(touched))
+
+    stmt = insert(table).from_select([c.name for c in columns], query)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ward_id", "bucket"],
+        set_={c.name: stmt.excluded[c.name] for c in table.columns if not c.primary_key},
+    )
+    result = await db.execute(stmt)
+
+    state = insert(rollup_state).values(name=table.name, watermark=started)
+    await db.execute(state.on_conflict_do_update(index_elements=["name"], set_={"watermark": started}))
+    await db.commit()
+    return result.rowcount
+
+
+async def refresh_all(db: AsyncSession) -> Dict[str, int]:
+    return {name: await refresh(db, name) for name in SOURCES}
+
+
+if __name__ == "__main__":
+    import argparse
+    import asyncio
+
+    from .database import AsyncSessionLocal, engine
+
+    parser = argparse.ArgumentParser(description="Create or incrementally refresh rollup tables")
+    parser.add_argument("command", choices=["create", "refresh"])
+    args = parser.parse_args()
+
+    async def main():
+        if args.command == "create":
+            async with engine.begin() as conn:
+                await conn.run_sync(
+                    Base.metadata.create_all,
+                    tables=[s.rollup for s in SOURCES.values()] + [rollup_state],
+                )
+            print("Rollup tables created")
+        else:
+            async with AsyncSessionLocal() as db:
+                print(await refresh_all(db))
+        await engine.dispose()
+
+    asyncio.run(main())
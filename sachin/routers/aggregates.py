@@ -0,0 +1,33 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Aggregates Router (dashboard trend charts)
+# ─────────────────────────────────────────────────────────────
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..aggregation import aggregate
+from ..database import get_db
+from ..rollups import refresh_all
+
+router = APIRouter()
+
+
+@router.get("/{source}")
+async def get_aggregates(
+    source: Literal["health", "water"],
+    bucket: Literal["hour", "day", "week"] = "day",
+    metrics: Optional[str] = Query(None, description="comma-separated, e.g. cases_reported or coliform_cfu,ph"),
+    stats: Optional[str] = Query(None, description="comma-separated subset of sum,count,min,max,avg"),
+    ward_id: Optional[int] = Query(None, description="omit for district-wide buckets"),
+    by_ward: bool = Query(False, description="one series per ward instead of one total"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_db),
+):
+    return await aggregate(db, source, bucket, metrics, stats, ward_id, by_ward, start, end)
+
+
+@router.post("/refresh")
+async def refresh_rollups(db: AsyncSession = Depends(get_db)):
+    """Incrementally refresh the rollup tables (also runnable as python -m sachin.rollups refresh)."""
+    return {"buckets_upserted": await refresh_all(db)}
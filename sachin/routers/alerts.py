@@ -1,13 +1,16 @@
 # ─────────────────────────────────────────────────────────────
 #  SACHIN — Alerts Router  (mirrors old /app/api/alerts/ack)
 # ─────────────────────────────────────────────────────────────
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime, timezone
+from typing import Optional
 from pydantic import BaseModel
 from ..database import get_db
 from ..models import Alert
+from .. import alert_stream
 
 router = APIRouter()
 
@@ -17,11 +20,36 @@ class AckPayload(BaseModel):
 
 
 @router.get("/")
-async def list_alerts(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Alert).order_by(Alert.created_at.desc()).limit(100))
+async def list_alerts(
+    ward_id: Optional[int] = Query(None),
+    open_only: bool = Query(False, description="only unacknowledged alerts"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    query = select(Alert)
+    if ward_id is not None:
+        query = query.where(Alert.ward_id == ward_id)
+    if open_only:
+        query = query.where(Alert.acknowledged.isnot(True))
+    result = await db.execute(query.order_by(Alert.created_at.desc(), Alert.id.desc()).limit(limit))
     return result.scalars().all()
 
 
+@router.get("/stream")
+async def stream_alerts(
+    request: Request,
+    ward_id: Optional[int] = Query(None),
+    cursor: Optional[str] = Query(None, description="resume after this event id"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """SSE stream of `created` / `acknowledged` events; reconnects resume from Last-Event-ID."""
+    return StreamingResponse(
+        alert_stream.stream(request, last_event_id or cursor, ward_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/{alert_id}/ack")
 async def acknowledge_alert(
     alert_id: str,
@@ -35,5 +63,6 @@ async def acknowledge_alert(
     alert.acknowledged = True
     alert.acknowledged_by = payload.acknowledged_by
     alert.acknowledged_at = datetime.now(timezone.utc)
+    await alert_stream.publish(db, alert_stream.ACKNOWLEDGED, alert.id)
     await db.commit()
     return {"status": "acknowledged"}
@@ -0,0 +1,22 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Dashboard Router  (replaces old /app/api/dashboard mock)
+# ─────────────────────────────────────────────────────────────
+import json
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..http_cache import make_etag, not_modified, not_modified_response
+from ..snapshot import district_snapshot
+
+router = APIRouter()
+
+
+@router.get("/")
+async def get_district_snapshot(request: Request, db: AsyncSession = Depends(get_db)):
+    """Every ward's latest risk per horizon, active cases, water status and open alerts."""
+    body = json.dumps(jsonable_encoder(await district_snapshot(db)), separators=(",", ":")).encode()
+    etag = make_etag("dashboard", body)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    return Response(body, media_type="application/json", headers={"ETag": etag, "Cache-Control": "no-cache"})
@@ -1,18 +1,26 @@
 # ─────────────────────────────────────────────────────────────
 #  SACHIN — Health Cases Router
 # ─────────────────────────────────────────────────────────────
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from ..database import get_db
 from ..models import HealthCase
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
 
 router = APIRouter()
 
 
 @router.get("/{ward_id}")
-async def get_health_cases(ward_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(HealthCase).where(HealthCase.ward_id == ward_id).order_by(HealthCase.report_date.desc())
-    )
-    return result.scalars().all()
+async def get_health_cases(
+    ward_id: int,
+    start: Optional[datetime] = Query(None, alias="from", description="report_date >= from"),
+    end: Optional[datetime] = Query(None, alias="to", description="report_date < to"),
+    fields: Optional[str] = Query(None, description="comma-separated columns, e.g. report_date,cases_reported"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Newest-first page of a ward's case reports: {"items": [...], "next_cursor": ...}."""
+    return await keyset_page(db, HealthCase, "report_date", ward_id, start, end, fields, limit, cursor)
@@ -0,0 +1,30 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — Ingestion Router  (replaces old /app/api/upload mock)
+# ─────────────────────────────────────────────────────────────
+import io
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..database import get_db
+from ..ingestion import RowError, ingest
+
+router = APIRouter()
+
+
+@router.post("/{kind}")
+async def upload_csv(
+    kind: Literal["health", "water", "weather"],
+    file: UploadFile = File(...),
+    method: Optional[Literal["copy", "executemany"]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """Validate and upsert a CSV; returns row counts, invalid-row reasons and rows/sec."""
+    # Starlette has already spooled the upload to disk; read it back chunk by chunk
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = await ingest(db, kind, stream, method)
+    except RowError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    finally:
+        stream.detach()
+    return {"filename": file.filename, **report}
@@ -1,15 +1,25 @@
 # ─────────────────────────────────────────────────────────────
 #  SACHIN — Predictions Router (reads from rupesh/tarun outputs)
 # ─────────────────────────────────────────────────────────────
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from ..database import get_db
 from ..models import RiskPrediction
+from .. import batch_predict
 
 router = APIRouter()
 
 
+@router.post("/run")
+async def run_batch_prediction(force: bool = False, db: AsyncSession = Depends(get_db)):
+    """Score every ward for both horizons (also python -m sachin.batch_predict); for schedulers."""
+    try:
+        return await batch_predict.run(db, force=force)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 @router.get("/{ward_id}")
 async def get_predictions(ward_id: int, db: AsyncSession = Depends(get_db)):
     result = await db.execute(
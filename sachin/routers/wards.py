@@ -1,22 +1,48 @@
 # ─────────────────────────────────────────────────────────────
 #  SACHIN — Wards Router
 # ─────────────────────────────────────────────────────────────
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from ..database import get_db
+from ..http_cache import not_modified, not_modified_response
 from ..models import Ward
+from .. import risk_map
 
 router = APIRouter()
 
+# Full-resolution polygons are not JSON-serialisable and too heavy for
+# list views; outlines are served by /risk-map instead.
+WARD_COLUMNS = [c for c in Ward.__table__.c if c.name != "geometry"]
+
 
 @router.get("/")
 async def list_wards(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Ward))
-    return result.scalars().all()
+    result = await db.execute(select(*WARD_COLUMNS).order_by(Ward.id))
+    return result.mappings().all()
+
+
+@router.get("/risk-map")
+async def get_risk_map(
+    request: Request,
+    zoom: int = Query(12, ge=0, le=22, description="map zoom; snapped to the nearest precomputed level below"),
+    horizon_days: int = Query(7, description="7 or 14"),
+    db: AsyncSession = Depends(get_db),
+):
+    """GeoJSON FeatureCollection of simplified ward outlines with their latest risk band."""
+    if horizon_days not in risk_map.HORIZONS:
+        raise HTTPException(status_code=400, detail="horizon_days must be 7 or 14")
+    zoom = risk_map.snap_zoom(zoom)
+    etag = await risk_map.current_etag(db, zoom, horizon_days)
+    if etag is None:
+        raise HTTPException(status_code=503, detail="Ward shapes not built; run python -m sachin.risk_map build")
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    body = await risk_map.feature_collection(db, zoom, horizon_days, etag)
+    return Response(body, media_type="application/geo+json", headers={"ETag": etag, "Cache-Control": "no-cache"})
 
 
 @router.get("/{ward_id}")
 async def get_ward(ward_id: int, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Ward).where(Ward.id == ward_id))
-    return result.scalar_one_or_none()
+    result = await db.execute(select(*WARD_COLUMNS).where(Ward.id == ward_id))
+    return result.mappings().one_or_none()
@@ -0,0 +1,148 @@
+# ─────────────────────────────────────────────────────────────
+#  SACHIN — District Snapshot
+#  Every ward's current risk, active cases and water status
+# ─────────────────────────────────────────────────────────────
+#
+#  One query: wards LEFT JOIN
+#    • latest prediction per (ward, horizon) — DISTINCT ON, served by
+#      ix_risk_predictions_latest (ward_id, horizon_days, predicted_at DESC)
+#    • cases reported in the last ACTIVE_CASE_WINDOW_DAYS
+#    • latest water sample per ward — DISTINCT ON over the
+#      (ward_id, sample_date, id) index
+#    • open (unacknowledged) alerts per ward
+#  The router hashes the serialised body into an ETag, so an
+#  unchanged district costs the client a 304 and no re-render.
+# ─────────────────────────────────────────────────────────────
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from pydantic_settings import BaseSettings
+from sqlalchemy import case, func, literal_column, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Alert, HealthCase, RiskPrediction, Ward, WaterQuality
+
+
+class Settings(BaseSettings):
+    ACTIVE_CASE_WINDOW_DAYS: int = 14
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+# Drinking-water limits (IS 10500) behind the per-ward water_status
+PH_RANGE = (6.5, 8.5)
+MAX_TURBIDITY_NTU = 5.0
+MIN_CHLORINE_MG_L = 0.2
+
+
+def latest_predictions(horizon_days: Optional[int] = None):
+    """Newest prediction per (ward, horizon), or per ward for one horizon."""
+    query = select(
+        RiskPrediction.ward_id, RiskPrediction.horizon_days, RiskPrediction.risk_score,
+        RiskPrediction.risk_band, RiskPrediction.predicted_at,
+    )
+    if horizon_days is not None:
+        query = query.where(RiskPrediction.horizon_days == horizon_days)
+    return (
+        query.distinct(RiskPrediction.ward_id, RiskPrediction.horizon_days)
+        .order_by(RiskPrediction.ward_id, RiskPrediction.horizon_days, RiskPrediction.predicted_at.desc())
+        .subquery("latest")
+    )
+
+
+def _water_status(water):
+    unsafe = or_(
+        water.c.coliform_cfu > 0,
+        water.c.turbidity_ntu > MAX_TURBIDITY_NTU,
+        water.c.ph < PH_RANGE[0],
+        water.c.ph > PH_RANGE[1],
+    )
+    return case(
+        (water.c.ward_id.is_(None), "unknown"),
+        (unsafe, "unsafe"),
+        (water.c.chlorine_mg_l < MIN_CHLORINE_MG_L, "watch"),
+        else_="safe",
+    )
+
+
+async def district_snapshot(db: AsyncSession) -> Dict[str, Any]:
+    latest = latest_predictions()
+    risk = (
+        select(
+            latest.c.ward_id,
+            func.json_object_agg(
+                latest.c.horizon_days,
+                func.json_build_object(
+                    literal_column("'risk_score'"), latest.c.risk_score,
+                    literal_column("'risk_band'"), latest.c.risk_band,
+                    literal_column("'predicted_at'"), latest.c.predicted_at,
+                ),
+            ).label("risk"),
+        )
+        .group_by(latest.c.ward_id)
+        .subquery("risk")
+    )
+    since = datetime.now(timezone.utc) - timedelta(days=settings.ACTIVE_CASE_WINDOW_DAYS)
+    cases = (
+        select(
+            HealthCase.ward_id,
+            func.sum(HealthCase.cases_reported).label("active_cases"),
+            func.sum(HealthCase.hospitalised).label("hospitalised"),
+        )
+        .where(HealthCase.report_date >= since)
+        .group_by(HealthCase.ward_id)
+        .subquery("cases")
+    )
+    water = (
+        select(
+            WaterQuality.ward_id, WaterQuality.sample_date, WaterQuality.ph,
+            WaterQuality.turbidity_ntu, WaterQuality.coliform_cfu, WaterQuality.chlorine_mg_l,
+        )
+        .where(WaterQuality.sample_date.isnot(None))
+        .distinct(WaterQuality.ward_id)
+        .order_by(WaterQuality.ward_id, WaterQuality.sample_date.desc())
+        .subquery("water")
+    )
+    alerts = (
+        select(Alert.ward_id, func.count().label("open_alerts"))
+        .where(Alert.acknowledged.isnot(True))
+        .group_by(Alert.ward_id)
+        .subquery("alerts")
+    )
+
+    query = (
+        select(
+            Ward.id.label("ward_id"), Ward.ward_number, Ward.ward_name, Ward.zone, Ward.population,
+            risk.c.risk,
+            func.coalesce(cases.c.active_cases, 0).label("active_cases"),
+            func.coalesce(cases.c.hospitalised, 0).label("hospitalised"),
+            _water_status(water).label("water_status"),
+            water.c.sample_date.label("water_sampled_at"), water.c.ph, water.c.turbidity_ntu,
+            water.c.coliform_cfu, water.c.chlorine_mg_l,
+            func.coalesce(alerts.c.open_alerts, 0).label("open_alerts"),
+        )
+        .outerjoin(risk, risk.c.ward_id == Ward.id)
+        .outerjoin(cases, cases.c.ward_id == Ward.id)
+        .outerjoin(water, water.c.ward_id == Ward.id)
+        .outerjoin(alerts, alerts.c.ward_id == Ward.id)
+        .order_by(Ward.id)
+    )
+    wards = [dict(row) for row in (await db.execute(query)).mappings()]
+    for ward in wards:
+        ward["risk"] = ward["risk"] or {}
+
+    return {
+        "metrics": {
+            "wards_monitored": len(wards),
+            "active_cases": sum(w["active_cases"] for w in wards),
+            "active_case_window_days": settings.ACTIVE_CASE_WINDOW_DAYS,
+            "alerts_open": sum(w["open_alerts"] for w in wards),
+            "wards_unsafe_water": sum(w["water_status"] == "unsafe" for w in wards),
+        },
+        "wards": wards,
+    }
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from sachin.models import Alert, HealthCase, WaterQuality
+
+
+class SyncSession:
+    """Just enough of AsyncSession to run sachin's Core queries on in-memory SQLite."""
+
+    def __init__(self, session):
+        self.session = session
+
+    async def execute(self, statement, params=None):
+        return self.session.execute(statement, params)
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    HealthCase.metadata.create_all(engine, tables=[HealthCase.__table__, WaterQuality.__table__, Alert.__table__])
+    with engine.begin() as conn:
+        yield conn
+    engine.dispose()
+
+
+@pytest.fixture
+def db(conn):
+    with Session(bind=conn) as session:
+        yield SyncSession(session)
@@ -0,0 +1,65 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from sachin import alert_rules
+from sachin.models import HealthCase
+
+START = datetime(2025, 1, 1)  # SQLite hands timestamps back naive
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = alert_rules.RuleEngine()
+    monkeypatch.setattr(alert_rules, "engine", engine)
+    return engine
+
+
+def _report(ward_id, day, cases):
+    return {"id": uuid.uuid4(), "ward_id": ward_id, "report_date": START + timedelta(days=day), "cases_reported": cases}
+
+
+def _store(conn, days, ward_id=1):
+    conn.execute(insert(HealthCase), [_report(ward_id, day, 5 + day % 2) for day in range(days)])
+
+
+def _types(alerts):
+    return sorted(a["alert_type"] for a in alerts)
+
+
+def test_cold_engine_cannot_see_a_spike(engine):
+    assert engine.evaluate("health", _report(1, 40, 60)) == []
+
+
+def test_warm_seeds_rolling_state_from_the_table(conn, db, engine):
+    _store(conn, 30)
+    assert asyncio.run(alert_rules.warm(db, "health", [1])) == 30
+    assert ("health", 1) in engine.seeded
+
+    assert _types(engine.evaluate("health", _report(1, 30, 60))) == ["anomaly", "trend"]
+
+
+def test_warm_reads_only_the_last_seed_rows(conn, db, engine, monkeypatch):
+    monkeypatch.setattr(alert_rules.settings, "ALERT_RULES_SEED_ROWS", 10)
+    _store(conn, 30)
+    _store(conn, 3, ward_id=2)
+    assert asyncio.run(alert_rules.warm(db, "health", [1, 2])) == 13
+    assert engine.ewmas[("health", 1, "cases_reported")].n == 10
+    assert engine.last_seen[("health", 1)] == START + timedelta(days=29)
+
+
+def test_warm_runs_once_per_ward(conn, db, engine):
+    _store(conn, 30)
+    asyncio.run(alert_rules.warm(db, "health", [1]))
+    assert asyncio.run(alert_rules.warm(db, "health", [1])) == 0
+
+
+def test_seeding_raises_nothing_and_skips_late_rows(conn, db, engine):
+    _store(conn, 30)
+    asyncio.run(alert_rules.warm(db, "health", [1]))
+    # older than everything seeded: thresholds only, rolling state untouched
+    assert engine.evaluate("health", _report(1, 2, 60)) == []
+    assert engine.ewmas[("health", 1, "cases_reported")].n == 30
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from sachin import alert_stream
+from sachin.models import Alert
+
+
+def _alert(**overrides):
+    values = dict(id=uuid.uuid4(), ward_id=1, alert_type="threshold", severity="warning", message="turbidity",
+                  acknowledged=False, created_at=datetime(2025, 3, 1, tzinfo=timezone.utc))
+    values.update(overrides)
+    return Alert(**values)
+
+
+class FakeSessions:
+    """Stands in for AsyncSessionLocal; `failures` database errors happen first."""
+
+    def __init__(self, alerts, failures=0):
+        self.alerts = {a.id: a for a in alerts}
+        self.failures = failures
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def get(self, model, alert_id):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database went away")
+        return self.alerts.get(alert_id)
+
+
+class OpenConnection:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def _note(alert, kind=alert_stream.CREATED):
+    return json.dumps({"type": kind, "id": str(alert.id)})
+
+
+@pytest.fixture
+def broker():
+    broker = alert_stream.AlertBroker()
+    broker._conn = OpenConnection()  # LISTEN is already up; no database needed
+    return broker
+
+
+def test_pump_survives_bad_notifications(broker, monkeypatch):
+    first, second = _alert(), _alert()
+    monkeypatch.setattr(alert_stream, "AsyncSessionLocal", FakeSessions([first, second], failures=1))
+
+    async def scenario():
+        sub = await broker.subscribe()
+        broker._notes.put_nowait("not json")
+        broker._notes.put_nowait(json.dumps({"type": "created"}))
+        broker._notes.put_nowait(_note(first))  # database error: subscribers are told to resync
+        dropped = await asyncio.wait_for(sub.queue.get(), 1)
+
+        sub = await broker.subscribe()
+        broker._notes.put_nowait(_note(second))
+        event = await asyncio.wait_for(sub.queue.get(), 1)
+        alive = not broker._pump.done()
+        await broker.close()
+        return dropped, event, alive
+
+    dropped, event, alive = asyncio.run(scenario())
+    assert dropped is None
+    assert event["alert"]["id"] == second.id
+    assert alive
+
+
+def test_subscribe_restarts_a_dead_pump(broker, monkeypatch):
+    alert = _alert()
+    monkeypatch.setattr(alert_stream, "AsyncSessionLocal", FakeSessions([alert]))
+
+    async def scenario():
+        await broker.subscribe()
+        broker._pump.cancel()
+        await asyncio.sleep(0)
+        sub = await broker.subscribe()  # connection still open: pump must come back anyway
+        broker._notes.put_nowait(_note(alert))
+        event = await asyncio.wait_for(sub.queue.get(), 1)
+        await broker.close()
+        return event
+
+    assert asyncio.run(scenario())["alert"]["id"] == alert.id
+
+
+def test_replay_catches_an_alert_that_committed_late(conn, db):
+    stamp = lambda minute: datetime(2025, 3, 1, 9, minute)  # SQLite keeps timestamps naive
+    seen = dict(id=uuid.uuid4(), ward_id=1, created_at=stamp(10), acknowledged=False)
+    conn.execute(insert(Alert), [seen])
+    cursor = (seen["created_at"], seen["id"])  # the client saw this one and disconnected
+
+    # A longer transaction that started earlier commits only now
+    late = dict(id=uuid.uuid4(), ward_id=2, created_at=stamp(8), acknowledged=False)
+    acked = dict(id=uuid.uuid4(), ward_id=1, created_at=stamp(1), acknowledged=True, acknowledged_at=stamp(12))
+    ancient = dict(id=uuid.uuid4(), ward_id=1, created_at=datetime(2025, 2, 1), acknowledged=False)
+    for row in (late, acked, ancient):
+        conn.execute(insert(Alert).values(**row))
+
+    events, complete = asyncio.run(alert_stream.replay(db, cursor, None))
+    replayed = [(e["type"], e["alert"]["id"]) for e in events]
+
+    assert complete
+    assert ("created", late["id"]) in replayed
+    assert ("acknowledged", acked["id"]) in replayed
+    assert ("created", ancient["id"]) not in replayed
+    assert [e["key"] for e in events] == sorted(e["key"] for e in events)
+
+    events, _ = asyncio.run(alert_stream.replay(db, cursor, 2))
+    assert [e["alert"]["id"] for e in events] == [late["id"]]
@@ -0,0 +1,44 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import insert
+
+from rupesh.feature_engineering import compute_rolling_case_rate
+from sachin.batch_predict import case_rate_query
+from sachin.models import HealthCase
+
+START = datetime(2025, 3, 1)
+
+
+def _reports():
+    rows = []
+    # ward 1: gaps of several days and two reports on one day
+    for offset, cases in [(0, 4), (1, 6), (5, 9), (6, 2), (6.5, 11), (9, 0), (10, 7), (14, 3), (15, 8)]:
+        rows.append((1, START + timedelta(days=offset), cases))
+    # ward 2: fewer reports than the window, one with no count
+    for offset, cases in [(2, 5), (3, None), (4, 12)]:
+        rows.append((2, START + timedelta(days=offset), cases))
+    # ward 3: one report a day for longer than the window
+    for day in range(12):
+        rows.append((3, START + timedelta(days=day), day * 3 % 7))
+    return [
+        {"id": uuid.uuid4(), "ward_id": w, "report_date": at, "cases_reported": c}
+        for w, at, c in rows
+    ]
+
+
+def test_cases_7d_avg_matches_feature_engineering(conn, db):
+    reports = _reports()
+    conn.execute(insert(HealthCase), reports)
+
+    served = dict(asyncio.run(db.execute(case_rate_query())).all())
+
+    df = pd.DataFrame(reports).astype({"cases_reported": "float64"})
+    trained = compute_rolling_case_rate(df).groupby("ward_id")["cases_7d_avg"].last()
+
+    assert sorted(served) == sorted(trained.index)
+    for ward_id, expected in trained.items():
+        assert served[ward_id] == pytest.approx(expected, abs=1e-9), ward_id
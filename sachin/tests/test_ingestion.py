@@ -0,0 +1,115 @@
+import asyncio
+import io
+import threading
+
+import pytest
+
+from sachin import alert_rules, ingestion
+
+HEALTH_CSV = """ward_id,date,cases,hospitalizations,disease
+1,2025-02-17,6,2,cholera
+1,2025-02-17,7,2,cholera
+,2025-02-18,8,3,typhoid
+9,2025-02-18,8,3,typhoid
+2,2025-02-18,3,5,typhoid
+2,notadate,3,1,typhoid
+2,2025-02-19,4,1,typhoid
+"""
+
+
+class FakeSession:
+    """Answers the ward-id lookup; loading goes through the patched loader."""
+
+    class _Result:
+        def scalars(self):
+            return [1, 2]
+
+    def get_bind(self):
+        class Bind:
+            class dialect:
+                driver = "aiosqlite"
+        return Bind()
+
+    async def execute(self, statement, params=None):
+        return self._Result()
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def loaded(monkeypatch):
+    chunks = []
+
+    async def load(db, kind, records):
+        chunks.append(records)
+        return [r["id"] for r in records]
+
+    monkeypatch.setitem(ingestion.LOADERS, "executemany", load)
+    monkeypatch.setattr(alert_rules.settings, "ALERT_RULES_ENABLED", False)
+    return chunks
+
+
+def _rows(text):
+    reader = ingestion.csv.reader(io.StringIO(text))
+    names = ingestion._normalise_header(ingestion.KINDS["health"], next(reader))
+    return enumerate((dict(zip(names, values)) for values in reader), start=1)
+
+
+def test_parse_chunk_reads_at_most_size_rows():
+    rows = _rows(HEALTH_CSV)
+    total, accepted, batch, rejected = ingestion.parse_chunk("health", rows, 4, {1, 2})
+    assert (total, accepted, len(batch)) == (4, 2, 1)  # rows 1 and 2 share a natural key
+    assert [r["cases_reported"] for r in batch.values()] == [7]
+    assert rejected == [(3, "Missing ward_id"), (4, "Unknown ward_id 9")]
+
+    total, accepted, batch, rejected = ingestion.parse_chunk("health", rows, 4, {1, 2})
+    assert (total, accepted) == (3, 1)
+    assert [n for n, _ in rejected] == [5, 6]
+    assert ingestion.parse_chunk("health", rows, 4, {1, 2})[0] == 0
+
+
+def test_ingest_reports_and_loads_each_chunk(loaded):
+    report = asyncio.run(ingestion.ingest(FakeSession(), "health", io.StringIO(HEALTH_CSV), chunk_rows=3))
+    assert report["rows_total"] == 7
+    assert report["rows_accepted"] == 3
+    assert report["rows_invalid"] == 4
+    assert report["rows_written"] == 2
+    assert [r["row"] for r in report["invalid_reasons"]] == [3, 4, 5, 6]
+    assert [len(chunk) for chunk in loaded] == [1, 1]
+
+
+def test_ingest_parses_off_the_event_loop(loaded, monkeypatch):
+    threads = set()
+    parse_row = ingestion.parse_row
+
+    def recording(*args):
+        threads.add(threading.get_ident())
+        return parse_row(*args)
+
+    monkeypatch.setattr(ingestion, "parse_row", recording)
+    asyncio.run(ingestion.ingest(FakeSession(), "health", io.StringIO(HEALTH_CSV)))
+    assert threads and threading.get_ident() not in threads
+
+
+def test_invalid_reasons_are_capped(loaded, monkeypatch):
+    monkeypatch.setattr(ingestion.settings, "INGEST_MAX_REPORTED_INVALID", 2)
+    report = asyncio.run(ingestion.ingest(FakeSession(), "health", io.StringIO(HEALTH_CSV), chunk_rows=2))
+    assert report["rows_invalid"] == 4
+    assert [r["row"] for r in report["invalid_reasons"]] == [3, 4]
+
+
+def test_missing_required_column():
+    with pytest.raises(ingestion.RowError, match="Missing columns: cases_reported"):
+        asyncio.run(ingestion.ingest(FakeSession(), "health", io.StringIO("ward_id,date\n1,2025-02-17\n")))
+
+
+@pytest.mark.parametrize("kind", ["health", "water"])
+def test_upsert_moves_updated_at_for_the_rollups(kind):
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.dialects.postgresql import insert
+
+    table = ingestion.KINDS[kind].model.__table__
+    sql = str(ingestion._upsert(ingestion.KINDS[kind], insert(table)).compile(dialect=postgresql.dialect()))
+    assert "updated_at = now()" in sql
+    assert "IS DISTINCT FROM" in sql  # unchanged rows keep their updated_at
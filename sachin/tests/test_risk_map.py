@@ -0,0 +1,48 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from sachin import risk_map
+from sachin.database import get_db
+from sachin.routers import wards
+
+
+class NoShapes:
+    """A database with no ward_shapes built yet."""
+
+    def __init__(self):
+        self.queries = 0
+
+    async def execute(self, statement):
+        self.queries += 1
+
+        class Result:
+            def one(self):
+                return None, None
+        return Result()
+
+
+@pytest.fixture
+def client_and_db():
+    db = NoShapes()
+    app = FastAPI()
+    app.include_router(wards.router, prefix="/api/wards")
+    app.dependency_overrides[get_db] = lambda: db
+    return TestClient(app), db
+
+
+@pytest.mark.parametrize("horizon", [0, 3, 30, -7])
+def test_unknown_horizon_is_rejected_before_the_cache(client_and_db, horizon):
+    client, db = client_and_db
+    response = client.get("/api/wards/risk-map", params={"horizon_days": horizon})
+    assert response.status_code == 400
+    assert db.queries == 0
+    assert all(h in risk_map.HORIZONS for _, h in risk_map._cache)
+
+
+@pytest.mark.parametrize("horizon", risk_map.HORIZONS)
+def test_supported_horizons_reach_the_map(client_and_db, horizon):
+    client, db = client_and_db
+    response = client.get("/api/wards/risk-map", params={"horizon_days": horizon})
+    assert response.status_code == 503  # passed validation; shapes not built
+    assert db.queries == 1
@@ -0,0 +1,93 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — Predictor Benchmark
+#  Unpickled sklearn/XGBoost models vs compiled .npz exports
+# ─────────────────────────────────────────────────────────────
+#
+#  For every model with both a .pkl and a .npz in trained_models/:
+#    • parity       max |Δ P(outbreak)| over random feature rows
+#    • cold start   fresh interpreter: import + load + first predict
+#    • single row   p50 / p99 predict_proba latency
+#    • batch        predict_proba over --batch-rows rows
+#
+#  Run:  python -m tarun.bench_predictor [--model-dir DIR] [--batch-rows 1000]
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .model_registry import MODEL_DIR, _load
+
+COLD_START = """
+import time
+started = time.perf_counter()
+{load}
+model.predict_proba([[5.0, 30.0, 100.0, 7.0]])
+print(time.perf_counter() - started)
+"""
+
+LOADERS = {
+    ".pkl": "import joblib; model = joblib.load({path!r})",
+    ".npz": "from tarun.tree_predictor import TreeEnsemble; model = TreeEnsemble.load({path!r})",
+}
+
+
+def random_features(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.gamma(2.0, 3.0, n),       # cases_7d_avg
+        rng.uniform(0.0, 80.0, n),    # avg_water_risk
+        rng.gamma(2.0, 100.0, n),     # max_coliform
+        rng.normal(7.0, 0.6, n),      # avg_ph
+    ])
+
+
+def cold_start(path: Path, repeats: int) -> float:
+    code = COLD_START.format(load=LOADERS[path.suffix].format(path=str(path)))
+    root = Path(__file__).parent.parent
+    return min(
+        float(subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeats)
+    )
+
+
+def latency(model, X: np.ndarray, repeats: int) -> np.ndarray:
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        started = time.perf_counter()
+        model.predict_proba(X)
+        timings[i] = time.perf_counter() - started
+    return timings
+
+
+def main(model_dir: Path, batch_rows: int, repeats: int, cold_repeats: int) -> None:
+    X = random_features(batch_rows)
+    print(f"{'model':<10} {'format':<6} {'cold ms':>9} {'1-row p50 µs':>13} {'1-row p99 µs':>13} "
+          f"{f'{batch_rows}-row ms':>11} {'max |Δp|':>10}")
+    for compiled in sorted(model_dir.glob("*_h*.npz")):
+        pickled = compiled.with_suffix(".pkl")
+        if not pickled.exists():
+            continue
+        models = {".pkl": _load(pickled), ".npz": _load(compiled)}
+        reference = models[".pkl"].predict_proba(X)[:, 1]
+        for suffix, model in models.items():
+            drift = np.abs(model.predict_proba(X)[:, 1] - reference).max()
+            single = latency(model, X[:1], repeats) * 1e6
+            batch = latency(model, X, max(3, repeats // 50)) * 1e3
+            cold = cold_start(model_dir / f"{compiled.stem}{suffix}", cold_repeats) * 1e3
+            print(f"{compiled.stem:<10} {suffix[1:]:<6} {cold:>9.1f} {np.percentile(single, 50):>13.1f} "
+                  f"{np.percentile(single, 99):>13.1f} {batch.min():>11.2f} {drift:>10.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pickled vs compiled predictor benchmark")
+    parser.add_argument("--model-dir", type=Path, default=MODEL_DIR)
+    parser.add_argument("--batch-rows", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=500)
+    parser.add_argument("--cold-repeats", type=int, default=3)
+    args = parser.parse_args()
+    main(args.model_dir, args.batch_rows, args.repeats, args.cold_repeats)
@@ -0,0 +1,68 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — Startup Budget Check
+#  Fails (exit 1) when importing the app gets slow or eager again
+# ─────────────────────────────────────────────────────────────
+#
+#  Imports tarun.main in fresh interpreters, once with every router
+#  and once as a predict-only worker (ENABLED_ROUTERS=predict), and
+#  checks that:
+#    • the best-of-N import time stays under --budget-ms
+#    • none of HEAVY_MODULES were imported — they belong to the
+#      first request (or STARTUP_WARMUP), not to import time
+#
+#  Run:  python -m tarun.check_startup [--budget-ms 1500] [--repeats 3]
+#  (tests/test_startup.py runs the same probe under pytest)
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BUDGET_MS = 1500.0
+HEAVY_MODULES = ["shap", "langchain", "langchain_openai", "openai", "sklearn", "xgboost", "joblib", "pandas"]
+
+SCENARIOS = {
+    "all routers": "predict,explain,recommend,chat",
+    "predict only": "predict",
+}
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import tarun.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def probe(routers: str) -> dict:
+    env = {**os.environ, "ENABLED_ROUTERS": routers, "STARTUP_WARMUP": "false"}
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=Path(__file__).parent.parent, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(budget_ms: float, repeats: int) -> int:
+    failed = False
+    for name, routers in SCENARIOS.items():
+        runs = [probe(routers) for _ in range(repeats)]
+        best = min(r["ms"] for r in runs)
+        loaded = sorted({m for r in runs for m in r["loaded"]})
+        ok = best <= budget_ms and not loaded
+        failed |= not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name:<13} import {best:7.1f} ms (budget {budget_ms:.0f})"
+              + (f" | eagerly imported: {', '.join(loaded)}" if loaded else ""))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="tarun import-time budget check")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(main(args.budget_ms, args.repeats))
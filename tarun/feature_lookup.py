@@ -0,0 +1,52 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — Feature Store Lookup
+#  Serves the newest per-ward features written by rupesh's store
+# ─────────────────────────────────────────────────────────────
+#
+#  Reads rupesh/feature_store/latest.parquet (one row per ward) and
+#  re-reads it only when its mtime changes, like the model registry.
+# ─────────────────────────────────────────────────────────────
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+from .model_registry import FEATURE_NAMES
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+LATEST_FEATURES_PATH = Path(__file__).parent.parent / "rupesh" / "feature_store" / "latest.parquet"
+
+
+class FeatureLookup:
+    def __init__(self, path: Path = LATEST_FEATURES_PATH):
+        self.path = path
+        self._df: Optional["pd.DataFrame"] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def table(self) -> "pd.DataFrame":
+        """Latest features for every ward, indexed by str(ward_id)."""
+        if not self.path.exists():
+            raise FileNotFoundError(
+                f"Feature store not found: {self.path}. Run python -m rupesh.feature_store rebuild first."
+            )
+        mtime = self.path.stat().st_mtime
+        if self._df is None or mtime != self._mtime:
+            with self._lock:
+                if self._df is None or mtime != self._mtime:
+                    import pandas as pd  # only workers serving stored features pay for pandas
+
+                    df = pd.read_parquet(self.path, columns=["ward_id", "report_date"] + FEATURE_NAMES)
+                    df = df.dropna(subset=FEATURE_NAMES)  # e.g. no water samples in the lookback window
+                    self._df = df.set_index(df["ward_id"].astype(str))
+                    self._mtime = mtime
+        return self._df
+
+    def get(self, ward_id) -> Dict[str, float]:
+        row = self.table().loc[str(ward_id)]  # KeyError if the ward has no features
+        return {name: float(row[name]) for name in FEATURE_NAMES}
+
+
+feature_lookup = FeatureLookup()
@@ -0,0 +1,295 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — Inference Executor
+#  Runs predict_proba / SHAP off the asyncio event loop
+# ─────────────────────────────────────────────────────────────
+#
+#  INFERENCE_EXECUTOR=thread   → ThreadPoolExecutor sharing the
+#                                process-wide model registry
+#  INFERENCE_EXECUTOR=process  → ProcessPoolExecutor; every worker
+#                                preloads models in its initializer
+#
+#  In process mode the parent never loads a model, so
+#  model_versions() asks a worker which versions it serves.
+#
+#  At most INFERENCE_WORKERS + INFERENCE_QUEUE_DEPTH jobs are in
+#  flight; beyond that submit() raises InferenceSaturated (→ 429).
+#
+#  MicroBatcher stacks concurrent single-row /predict calls for
+#  the same model into one predict_proba on the executor.
+#
+#  shap is imported on the first SHAP job, or at start() when
+#  warm_shap=True, so predict-only workers never load it.
+# ─────────────────────────────────────────────────────────────
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+from pydantic_settings import BaseSettings
+
+from .model_registry import FEATURE_NAMES, HORIZONS, LoadedModel, registry
+
+
+class Settings(BaseSettings):
+    INFERENCE_EXECUTOR: Literal["thread", "process"] = "thread"
+    INFERENCE_WORKERS: int = 4
+    INFERENCE_QUEUE_DEPTH: int = 64
+    PREDICT_BATCH_MAX_ROWS: int = 64
+    PREDICT_BATCH_MAX_WAIT_MS: float = 5.0
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+
+class InferenceSaturated(Exception):
+    """Raised when the executor already has its maximum number of jobs in flight."""
+
+
+# ── Tasks (module-level so they pickle for the process pool) ──
+
+def _warm_worker(warm_shap: bool = False) -> Dict[str, str]:
+    registry.load_all()
+    if warm_shap:
+        for horizon in HORIZONS:
+            try:
+                _get_explainer(registry.get("xgb", horizon, compiled=False))
+            except FileNotFoundError:
+                continue
+    return registry.loaded_versions()
+
+
+def versions_task() -> Dict[str, str]:
+    """Model file → version as loaded in the process running the task."""
+    return registry.loaded_versions()
+
+
+def predict_task(family: str, horizon: int, X: np.ndarray) -> Tuple[np.ndarray, str]:
+    """Outbreak probability for every row of X, plus the model version used."""
+    loaded = registry.get(family, horizon)
+    return loaded.model.predict_proba(X)[:, 1], loaded.version
+
+
+# One TreeExplainer per loaded model version; rebuilt only on hot-reload.
+_explainers: Dict[str, Any] = {}
+_explainer_lock = threading.Lock()
+
+
+def _get_explainer(loaded: LoadedModel):
+    explainer = _explainers.get(loaded.version)
+    if explainer is None:
+        with _explainer_lock:
+            explainer = _explainers.get(loaded.version)
+            if explainer is None:
+                import shap
+
+                stale = [v for v in _explainers if v.startswith(f"{loaded.family}_h{loaded.horizon}_")]
+                for version in stale:
+                    del _explainers[version]
+                explainer = shap.TreeExplainer(loaded.model)
+                _explainers[loaded.version] = explainer
+    return explainer
+
+
+def shap_task(horizon: int, X: np.ndarray) -> Tuple[List[Dict[str, float]], str]:
+    """SHAP values for every row of X in a single shap_values call."""
+    loaded = registry.get("xgb", horizon, compiled=False)
+    shap_values = _get_explainer(loaded).shap_values(X)
+    contributions = [dict(zip(FEATURE_NAMES, row)) for row in np.asarray(shap_values).tolist()]
+    return contributions, loaded.version
+
+
+def _timed(fn: Callable, *args) -> Tuple[Any, float, float]:
+    started = time.monotonic()
+    result = fn(*args)
+    return result, started, time.monotonic()
+
+
+# ── Executor ──────────────────────────────────────────────────
+
+class InferenceExecutor:
+    def __init__(self, kind: str, workers: int, queue_depth: int):
+        self.kind = kind
+        self.workers = workers
+        self.max_in_flight = workers + queue_depth
+        self._pool: Optional[Executor] = None
+        self._worker_versions: Dict[str, str] = {}
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._compute_total = 0.0
+        self._compute_max = 0.0
+
+    def start(self, warm_shap: bool = False) -> None:
+        if self._pool is not None:
+            return
+        if self.kind == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_warm_worker, initargs=(warm_shap,)
+            )
+            # Spawn every worker now so the first requests don't pay for model loading
+            for f in [self._pool.submit(_warm_worker, warm_shap) for _ in range(self.workers)]:
+                self._worker_versions.update(f.result())
+        else:
+            _warm_worker(warm_shap)
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def submit(self, fn: Callable, *args) -> Any:
+        if self._in_flight >= self.max_in_flight:
+            self._rejected += 1
+            raise InferenceSaturated(f"{self._in_flight} inference jobs in flight")
+        self.start()
+
+        self._in_flight += 1
+        enqueued = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started, finished = await loop.run_in_executor(self._pool, _timed, fn, *args)
+        finally:
+            self._in_flight -= 1
+
+        queue_wait = max(started - enqueued, 0.0)
+        compute = finished - started
+        self._completed += 1
+        self._queue_wait_total += queue_wait
+        self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+        self._compute_total += compute
+        self._compute_max = max(self._compute_max, compute)
+        return result
+
+    async def model_versions(self) -> Dict[str, str]:
+        """Versions being served: this process's registry, or a worker's in process mode."""
+        if self.kind != "process" or self._pool is None:
+            return registry.loaded_versions()
+        try:
+            self._worker_versions = await self.submit(versions_task)
+        except InferenceSaturated:
+            pass  # busy: report what a worker last told us
+        return self._worker_versions
+
+    def stats(self) -> Dict[str, Any]:
+        n = self._completed or 1
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "queue_wait_ms_avg": round(self._queue_wait_total / n * 1000, 3),
+            "queue_wait_ms_max": round(self._queue_wait_max * 1000, 3),
+            "compute_ms_avg": round(self._compute_total / n * 1000, 3),
+            "compute_ms_max": round(self._compute_max * 1000, 3),
+        }
+
+
+executor = InferenceExecutor(
+    kind=settings.INFERENCE_EXECUTOR,
+    workers=settings.INFERENCE_WORKERS,
+    queue_depth=settings.INFERENCE_QUEUE_DEPTH,
+)
+
+
+# ── Micro-batching ────────────────────────────────────────────
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row predictions per (family, horizon) for up
+    to max_wait_ms or max_rows, then scores them with one predict_proba.
+
+    The wait follows current load: a request that arrives while nothing
+    else is pending or running is flushed on the next loop tick, so a
+    lone caller pays no window. As soon as a second request joins it, or
+    while an earlier batch is still on the executor, the full window is
+    used to collect the burst.
+    """
+
+    def __init__(self, executor: InferenceExecutor, max_rows: int, max_wait_ms: float):
+        self.executor = executor
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self._pending: Dict[Tuple[str, int], List[Tuple[np.ndarray, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[str, int], asyncio.Handle] = {}
+        self._tasks: set = set()
+        self._eager: set = set()  # keys flushing on the next tick
+        self._batches = 0
+        self._rows = 0
+
+    async def predict(self, family: str, horizon: int, row: np.ndarray) -> Tuple[float, str]:
+        loop = asyncio.get_running_loop()
+        key = (family, horizon)
+        future = loop.create_future()
+        batch = self._pending.setdefault(key, [])
+        batch.append((row, future))
+
+        if len(batch) >= self.max_rows:
+            self._flush(key)
+        elif len(batch) == 1:
+            if self._tasks:
+                self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+            else:
+                self._eager.add(key)
+                self._timers[key] = loop.call_soon(self._flush, key)
+        elif key in self._eager:
+            # Company arrived in the same tick: hold the window open for the rest of the burst
+            self._eager.discard(key)
+            self._timers.pop(key).cancel()
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: Tuple[str, int]) -> None:
+        self._eager.discard(key)
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Tuple[str, int], batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        self._batches += 1
+        self._rows += len(batch)
+
+        X = np.vstack([row for row, _ in batch])
+        try:
+            proba, version = await self.executor.submit(predict_task, key[0], key[1], X)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), p in zip(batch, proba.tolist()):
+            if not future.done():
+                future.set_result((p, version))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self._batches,
+            "rows": self._rows,
+            "avg_rows_per_batch": round(self._rows / (self._batches or 1), 2),
+            "max_rows": self.max_rows,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+batcher = MicroBatcher(
+    executor,
+    max_rows=settings.PREDICT_BATCH_MAX_ROWS,
+    max_wait_ms=settings.PREDICT_BATCH_MAX_WAIT_MS,
+)
@@ -0,0 +1,269 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — Shared LLM Gateway
+#  One pooled OpenAI client for /chat, /explain and /recommend
+# ─────────────────────────────────────────────────────────────
+#
+#  • pooled httpx.AsyncClient with connect/read timeouts
+#  • global + per-route concurrency caps (semaphores)
+#  • retry with full-jitter exponential backoff on 429 / 5xx /
+#    timeouts / connection errors (the SDK's own retries are off)
+#  • per-route latency and token-usage counters
+#
+#  OPENAI_BASE_URL points the gateway at any OpenAI-compatible
+#  server, e.g. a local fake for tests.
+#
+#  openai / httpx are imported when the client is first used, so
+#  workers that never call GPT never load them.
+# ─────────────────────────────────────────────────────────────
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+class Settings(BaseSettings):
+    OPENAI_API_KEY: str = ""
+    OPENAI_BASE_URL: str = ""
+    LLM_MODEL: str = "gpt-4o-mini"
+    LLM_TIMEOUT_S: float = 30.0
+    LLM_CONNECT_TIMEOUT_S: float = 5.0
+    LLM_MAX_CONNECTIONS: int = 32
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_ROUTE_CONCURRENCY: int = 8
+    LLM_MAX_RETRIES: int = 3
+    LLM_BACKOFF_BASE_S: float = 0.5
+    LLM_BACKOFF_MAX_S: float = 8.0
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+@lru_cache(maxsize=1)
+def retryable_errors() -> Tuple[type, ...]:
+    import openai
+
+    return (
+        openai.RateLimitError,
+        openai.InternalServerError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+    )
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "latency_ms_avg": round(self.latency_total / (self.calls or 1) * 1000, 1),
+            "latency_ms_max": round(self.latency_max * 1000, 1),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+def _add_usage(metrics: RouteMetrics, usage: Any) -> None:
+    """Count an OpenAI `usage` object or a LangChain `usage_metadata` dict."""
+    if isinstance(usage, dict):
+        metrics.prompt_tokens += usage.get("input_tokens") or 0
+        metrics.completion_tokens += usage.get("output_tokens") or 0
+    else:
+        metrics.prompt_tokens += usage.prompt_tokens or 0
+        metrics.completion_tokens += usage.completion_tokens or 0
+
+
+class LLMGateway:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.model = settings.LLM_MODEL
+        self.http_client = None
+        self._client: Optional["AsyncOpenAI"] = None
+        self._global = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+        self._routes: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(settings.LLM_ROUTE_CONCURRENCY)
+        )
+        self._metrics: Dict[str, RouteMetrics] = defaultdict(RouteMetrics)
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            settings = self.settings
+            self.http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(settings.LLM_TIMEOUT_S, connect=settings.LLM_CONNECT_TIMEOUT_S),
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+                ),
+            )
+            self._client = AsyncOpenAI(
+                api_key=settings.OPENAI_API_KEY,
+                base_url=settings.OPENAI_BASE_URL or None,
+                http_client=self.http_client,
+                max_retries=0,
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def slot(self, route: str):
+        async with self._routes[route], self._global:
+            yield
+
+    def _backoff(self, attempt: int) -> float:
+        cap = min(self.settings.LLM_BACKOFF_MAX_S, self.settings.LLM_BACKOFF_BASE_S * 2 ** attempt)
+        return random.uniform(0, cap)
+
+    async def _with_retries(self, route: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        metrics = self._metrics[route]
+        retryable = retryable_errors()
+        for attempt in range(self.settings.LLM_MAX_RETRIES + 1):
+            try:
+                return await factory()
+            except retryable:
+                if attempt == self.settings.LLM_MAX_RETRIES:
+                    raise
+                metrics.retries += 1
+                await asyncio.sleep(self._backoff(attempt))
+
+    async def call(self, route: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Run an upstream call under the route's limits, with retries and metrics."""
+        metrics = self._metrics[route]
+        started = time.monotonic()
+        try:
+            async with self.slot(route):
+                result = await self._with_retries(route, factory)
+        except Exception:
+            metrics.errors += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            metrics.calls += 1
+            metrics.latency_total += elapsed
+            metrics.latency_max = max(metrics.latency_max, elapsed)
+
+        usage = getattr(result, "usage", None) or getattr(result, "usage_metadata", None)
+        if usage:
+            _add_usage(metrics, usage)
+        return result
+
+    async def chat_completion(self, route: str, prompt: str, max_tokens: int) -> str:
+        response = await self.call(route, lambda: self.client.chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+        ))
+        return response.choices[0].message.content.strip()
+
+    async def stream(self, route: str, factory: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[str]:
+        """
+        Relay an upstream text stream under the route's limits. Opening the
+        stream is retried; once the first chunk has arrived errors propagate.
+        Latency is recorded as time-to-first-chunk. Non-text items from the
+        factory are token usage: they are counted, not relayed.
+        """
+        metrics = self._metrics[route]
+        started = time.monotonic()
+        async with self.slot(route):
+            async def open_stream():
+                chunks = factory()
+                try:
+                    return chunks, await chunks.__anext__()
+                except StopAsyncIteration:
+                    return chunks, None
+                except BaseException:
+                    await chunks.aclose()
+                    raise
+
+            try:
+                chunks, first = await self._with_retries(route, open_stream)
+            except Exception:
+                metrics.errors += 1
+                raise
+            finally:
+                elapsed = time.monotonic() - started
+                metrics.calls += 1
+                metrics.latency_total += elapsed
+                metrics.latency_max = max(metrics.latency_max, elapsed)
+
+            async def items():
+                if first is not None:
+                    yield first
+                    async for item in chunks:
+                        yield item
+
+            try:
+                async for item in items():
+                    if isinstance(item, str):
+                        yield item
+                    else:
+                        _add_usage(metrics, item)
+            finally:
+                await chunks.aclose()
+
+    def stream_chat_completion(self, route: str, prompt: str, max_tokens: int) -> AsyncIterator[str]:
+        async def text_chunks():
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+                    if chunk.usage is not None:
+                        # Final chunk: empty choices, usage for the whole completion
+                        yield chunk.usage
+            finally:
+                # Closing the HTTP response is what cancels generation upstream
+                await stream.response.aclose()
+
+        return self.stream(route, text_chunks)
+
+    def chat_model(self):
+        """LangChain chat model sharing the pooled client (retries stay in the gateway)."""
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(
+            model=self.model,
+            api_key=self.settings.OPENAI_API_KEY,
+            async_client=self.client.chat.completions,
+            max_retries=0,
+            stream_usage=True,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {route: m.as_dict() for route, m in self._metrics.items()}
+
+    async def aclose(self) -> None:
+        if self.http_client is not None:
+            await self.http_client.aclose()
+
+
+gateway = LLMGateway(settings)
@@ -8,11 +8,79 @@
 #    • /explain/{ward_id}  → SHAP summary text via GPT
 #    • /recommend/{ward_id}→ Action recommendations from GPT
 #    • /chat               → Health officer Q&A chatbot (LangChain)
+#
+#  Startup stays light: SHAP, LangChain, openai and pandas are only
+#  imported when a route first needs them. ENABLED_ROUTERS limits
+#  which routers a worker mounts (e.g. "predict" for scoring-only
+#  workers); STARTUP_WARMUP=true pays those imports in the lifespan
+#  hook instead of on the first request.
+#
+#  Check:  python -m tarun.check_startup
 # ─────────────────────────────────────────────────────────────
 
-from fastapi import FastAPI
+import importlib
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import predict, explain, recommend, chat
+from fastapi.responses import JSONResponse
+from pydantic_settings import BaseSettings
+from .feature_lookup import feature_lookup
+from .inference import batcher, executor, InferenceSaturated
+from .response_cache import response_cache
+from .llm import gateway
+
+
+class Settings(BaseSettings):
+    ENABLED_ROUTERS: str = "predict,explain,recommend,chat"
+    STARTUP_WARMUP: bool = False
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+# module → (prefix, tag)
+ROUTERS = {
+    "predict":   ("/predict",   "Risk Prediction"),
+    "explain":   ("/explain",   "SHAP Explanations"),
+    "recommend": ("/recommend", "Action Recommendations"),
+    "chat":      ("/chat",      "AI Chatbot"),
+}
+LLM_ROUTERS = {"explain", "recommend", "chat"}
+
+enabled = [name.strip() for name in settings.ENABLED_ROUTERS.split(",") if name.strip()]
+unknown = set(enabled) - set(ROUTERS)
+if unknown:
+    raise ValueError(f"Unknown ENABLED_ROUTERS entries: {sorted(unknown)}")
+routers = {name: importlib.import_module(f".routers.{name}", __package__) for name in enabled}
+
+
+def warm_up() -> None:
+    """Import and build the heavy dependencies of the mounted routers up front."""
+    if "predict" in routers:
+        try:
+            feature_lookup.table()
+        except FileNotFoundError:
+            pass
+    if LLM_ROUTERS & routers.keys():
+        gateway.client  # creating the pooled client imports openai / httpx
+    if "chat" in routers:
+        routers["chat"].get_chain()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load every trained model once (per worker) so requests never hit the disk
+    executor.start(warm_shap=settings.STARTUP_WARMUP and "explain" in routers)
+    if settings.STARTUP_WARMUP:
+        warm_up()
+    yield
+    executor.shutdown()
+    await gateway.aclose()
+
 
 app = FastAPI(
     title="Neervazh Kavalan — GenAI & Prediction Engine",
@@ -21,6 +89,7 @@ app = FastAPI(
         "explanations, action recommendations, and an AI health officer chatbot."
     ),
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -31,12 +100,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(predict.router,   prefix="/predict",   tags=["Risk Prediction"])
-app.include_router(explain.router,   prefix="/explain",   tags=["SHAP Explanations"])
-app.include_router(recommend.router, prefix="/recommend", tags=["Action Recommendations"])
-app.include_router(chat.router,      prefix="/chat",      tags=["AI Chatbot"])
+for name, module in routers.items():
+    prefix, tag = ROUTERS[name]
+    app.include_router(module.router, prefix=prefix, tags=[tag])
+
+
+@app.exception_handler(InferenceSaturated)
+async def inference_saturated(request: Request, exc: InferenceSaturated):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Inference queue is full, retry shortly."},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "ok", "module": "genai-prediction-engine"}
+    return {
+        "status": "ok",
+        "module": "genai-prediction-engine",
+        "models": await executor.model_versions(),
+        "routers": list(routers),
+    }
+
+
+@app.get("/metrics/inference")
+async def inference_metrics():
+    """Queue wait vs compute time — use to size INFERENCE_WORKERS and uvicorn workers."""
+    return {**executor.stats(), "micro_batching": batcher.stats()}
+
+
+@app.get("/metrics/llm-cache")
+async def llm_cache_metrics():
+    return response_cache.stats()
+
+
+@app.get("/metrics/llm")
+async def llm_metrics():
+    """Per-route upstream latency, retries and token usage."""
+    return gateway.stats()
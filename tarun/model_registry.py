@@ -0,0 +1,155 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — In-process Model Registry
+#  Loads rupesh/trained_models/ once and hot-reloads on change
+# ─────────────────────────────────────────────────────────────
+#
+#  Models are keyed by (family, horizon), e.g. ("xgb", 7).
+#  Each lookup stats the model file; when its mtime moves the file
+#  is re-hashed and only reloaded if the SHA-256 changed.
+#
+#  MODEL_FORMAT=compiled (default) serves the numpy-only .npz
+#  export written by rupesh/export_model.py when it exists and
+#  falls back to the .pkl; MODEL_FORMAT=pickle always unpickles.
+#  SHAP always uses the .pkl — it needs the real XGBoost model.
+#  The version string comes from the .pkl's checksum in both cases
+#  (an .npz records the checksum of the .pkl it was compiled from),
+#  so /predict and /explain report the same model_version.
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+
+from .tree_predictor import TreeEnsemble
+
+
+class Settings(BaseSettings):
+    MODEL_FORMAT: Literal["compiled", "pickle"] = "compiled"
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+MODEL_DIR = Path(__file__).parent.parent / "rupesh" / "trained_models"
+
+MODEL_FAMILIES = ("xgb", "rf")
+HORIZONS = (7, 14)
+
+# Model input contract (see rupesh/README.md)
+FEATURE_NAMES = ["cases_7d_avg", "avg_water_risk", "max_coliform", "avg_ph"]
+
+
+def score_to_band(score: float) -> str:
+    if score < 25:
+        return "Low"
+    elif score < 50:
+        return "Medium"
+    elif score < 75:
+        return "High"
+    return "Critical"
+
+
+@dataclass
+class LoadedModel:
+    family: str
+    horizon: int
+    path: Path
+    model: Any
+    mtime: float
+    checksum: str
+    source_checksum: str = ""  # .pkl checksum recorded in an .npz export
+
+    @property
+    def version(self) -> str:
+        return f"{self.family}_h{self.horizon}_{(self.source_checksum or self.checksum)[:12]}"
+
+
+def _load(path: Path) -> Any:
+    if path.suffix == ".npz":
+        return TreeEnsemble.load(path)
+    # Only pickle-format deployments pay for importing joblib / sklearn / xgboost
+    import joblib
+
+    return joblib.load(path)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    def __init__(self, model_dir: Path = MODEL_DIR):
+        self.model_dir = model_dir
+        self._models: Dict[Path, LoadedModel] = {}
+        self._lock = threading.Lock()
+
+    def path_for(self, family: str, horizon: int, compiled: Optional[bool] = None) -> Path:
+        if compiled is None:
+            compiled = settings.MODEL_FORMAT == "compiled"
+        if compiled:
+            path = self.model_dir / f"{family}_h{horizon}.npz"
+            if path.exists():
+                return path
+        return self.model_dir / f"{family}_h{horizon}.pkl"
+
+    def load_all(self) -> Dict[Tuple[str, int], str]:
+        """Load every family/horizon that has been trained. Returns key → version."""
+        loaded = {}
+        for family in MODEL_FAMILIES:
+            for horizon in HORIZONS:
+                try:
+                    loaded[(family, horizon)] = self.get(family, horizon).version
+                except FileNotFoundError:
+                    continue
+        return loaded
+
+    def get(self, family: str, horizon: int, compiled: Optional[bool] = None) -> LoadedModel:
+        """Return the current model, reloading it if the file changed on disk."""
+        path = self.path_for(family, horizon, compiled)
+        if not path.exists():
+            raise FileNotFoundError(f"Model not found: {path}. Run rupesh/train_model.py first.")
+
+        key = path
+        mtime = path.stat().st_mtime
+        entry = self._models.get(key)
+        if entry is not None and entry.mtime == mtime:
+            return entry
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None and entry.mtime == mtime:
+                return entry
+            checksum = _sha256(path)
+            if entry is not None and entry.checksum == checksum:
+                # Touched but not rewritten — keep the loaded object.
+                entry.mtime = mtime
+                return entry
+            model = _load(path)
+            entry = LoadedModel(
+                family=family,
+                horizon=horizon,
+                path=path,
+                model=model,
+                mtime=mtime,
+                checksum=checksum,
+                source_checksum=getattr(model, "source_sha256", ""),
+            )
+            self._models[key] = entry
+            return entry
+
+    def loaded_versions(self) -> Dict[str, str]:
+        return {path.name: m.version for path, m in self._models.items()}
+
+
+registry = ModelRegistry()
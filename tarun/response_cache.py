@@ -0,0 +1,173 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — GPT Response Cache
+#  Skips repeat /explain and /recommend completions whose
+#  normalised inputs have not changed
+# ─────────────────────────────────────────────────────────────
+#
+#  Backends:
+#    • in-process LRU with per-entry TTL (default)
+#    • Redis when REDIS_URL is set — entries expire via SETEX;
+#      configure the server with maxmemory-policy allkeys-lru
+#      for LRU eviction. While Redis is unreachable the cache
+#      falls back to the in-process LRU and tries Redis again
+#      after RESPONSE_CACHE_REDIS_RETRY_S.
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from pydantic_settings import BaseSettings
+
+from .singleflight import SingleFlight
+
+
+class Settings(BaseSettings):
+    REDIS_URL: str = ""
+    RESPONSE_CACHE_TTL_S: int = 6 * 3600
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+    RESPONSE_CACHE_REDIS_RETRY_S: float = 30.0
+
+    class Config:
+        env_file = ".env"
+        extra = "ignore"
+
+
+settings = Settings()
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+
+class RedisBackend:
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url, decode_responses=True, socket_connect_timeout=1, socket_timeout=1)
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._redis.get(key)
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        await self._redis.set(key, value, ex=ttl)
+
+
+class ResponseCache:
+    def __init__(self, backend, ttl: int, fallback: Optional[MemoryBackend] = None,
+                 retry_after: float = settings.RESPONSE_CACHE_REDIS_RETRY_S):
+        self.backend = backend
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.inflight = SingleFlight()
+        self._down_until = 0.0
+
+    @property
+    def active(self):
+        """The backend in use: the fallback while the primary is marked down."""
+        if self.fallback is not None and time.monotonic() < self._down_until:
+            return self.fallback
+        return self.backend
+
+    def _failed(self):
+        # A cache outage must never fail the request
+        self.errors += 1
+        self._down_until = time.monotonic() + self.retry_after
+
+    async def _call(self, method: str, *args):
+        backend = self.active
+        try:
+            return await getattr(backend, method)(*args)
+        except Exception:
+            if backend is not self.backend:
+                raise
+            self._failed()
+            if self.fallback is None:
+                raise
+            return await getattr(self.fallback, method)(*args)
+
+    @staticmethod
+    def make_key(namespace: str, **parts: Any) -> str:
+        payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+        return f"kavalan:{namespace}:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self._call("get", key)
+        except Exception:
+            raw = None  # no fallback: treat as a miss
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        try:
+            await self._call("set", key, json.dumps(value), self.ttl)
+        except Exception:
+            pass
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Cached value for key, else factory()'s result. Identical concurrent
+        misses are coalesced into a single factory() call.
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        async def create():
+            value = await factory()
+            await self.set(key, value)
+            return value
+
+        return await self.inflight.do(key, create)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.active).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "single_flight": self.inflight.stats(),
+        }
+
+
+def round_contributions(contributions: Dict[str, float], ndigits: int = 2) -> Dict[str, float]:
+    """SHAP values that differ only past ndigits produce the same explanation."""
+    return {k: round(v, ndigits) for k, v in contributions.items()}
+
+
+response_cache = ResponseCache(
+    RedisBackend(settings.REDIS_URL) if settings.REDIS_URL else MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES),
+    ttl=settings.RESPONSE_CACHE_TTL_S,
+    fallback=MemoryBackend(settings.RESPONSE_CACHE_MAX_ENTRIES) if settings.REDIS_URL else None,
+)
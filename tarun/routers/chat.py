@@ -2,21 +2,12 @@
 #  TARUN — AI Health Officer Chatbot Router (LangChain RAG)
 # ─────────────────────────────────────────────────────────────
 
-from fastapi import APIRouter
+from functools import lru_cache
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema.output_parser import StrOutputParser
-from pydantic_settings import BaseSettings
+from ..llm import gateway
+from ..streaming import sse_response, stream_text
 
-
-class Settings(BaseSettings):
-    OPENAI_API_KEY: str = ""
-    class Config:
-        env_file = ".env"
-
-
-settings = Settings()
 router = APIRouter()
 
 SYSTEM_PROMPT = """
@@ -28,12 +19,18 @@ Always ground your answers in public health best practices for water-borne disea
 (cholera, typhoid, dysentery, hepatitis A). Be concise and practical.
 """
 
-llm = ChatOpenAI(model="gpt-4o-mini", api_key=settings.OPENAI_API_KEY)
-prompt_template = ChatPromptTemplate.from_messages([
-    ("system", SYSTEM_PROMPT),
-    ("human", "{question}"),
-])
-chain = prompt_template | llm | StrOutputParser()
+
+@lru_cache(maxsize=1)
+def get_chain():
+    """Built on the first /chat call (or startup warm-up) — LangChain is heavy to import."""
+    from langchain_core.prompts import ChatPromptTemplate
+
+    prompt_template = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_PROMPT),
+        ("human", "{question}"),
+    ])
+    # No output parser: the gateway reads token usage off the model's message
+    return prompt_template | gateway.chat_model()
 
 
 class ChatRequest(BaseModel):
@@ -42,5 +39,24 @@ class ChatRequest(BaseModel):
 
 @router.post("/")
 async def chat(req: ChatRequest):
-    answer = await chain.ainvoke({"question": req.question})
-    return {"question": req.question, "answer": answer}
+    message = await gateway.call("chat", lambda: get_chain().ainvoke({"question": req.question}))
+    return {"question": req.question, "answer": message.content}
+
+
+async def answer_chunks(question: str):
+    """Answer text as it is generated, then the usage the model reports at the end."""
+    async for chunk in get_chain().astream({"question": question}):
+        if chunk.content:
+            yield chunk.content
+        if chunk.usage_metadata:
+            yield chunk.usage_metadata
+
+
+@router.post("/stream")
+async def chat_stream(req: ChatRequest, request: Request):
+    """SSE variant: answer tokens are relayed as the chain produces them."""
+    return sse_response(stream_text(
+        request,
+        gateway.stream("chat", lambda: answer_chunks(req.question)),
+        done={"question": req.question},
+    ))
@@ -3,29 +3,17 @@
 #  Uses GPT to turn SHAP values into plain-language summaries
 # ─────────────────────────────────────────────────────────────
 
-import shap
-import joblib
 import numpy as np
-from pathlib import Path
-from fastapi import APIRouter, HTTPException
+from typing import List
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from openai import AsyncOpenAI
-from pydantic_settings import BaseSettings
+from ..inference import executor, shap_task
+from ..response_cache import response_cache, round_contributions
+from ..llm import gateway
+from ..streaming import sse_event, sse_response, stream_text
 
 
-class Settings(BaseSettings):
-    OPENAI_API_KEY: str = ""
-    class Config:
-        env_file = ".env"
-
-
-settings = Settings()
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-
 router = APIRouter()
-MODEL_DIR = Path(__file__).parent.parent.parent / "rupesh" / "trained_models"
-
-FEATURE_NAMES = ["cases_7d_avg", "avg_water_risk", "max_coliform", "avg_ph"]
 
 
 class ExplainRequest(BaseModel):
@@ -36,22 +24,102 @@ class ExplainRequest(BaseModel):
     horizon: int = 7
 
 
-@router.post("/{ward_id}")
-async def explain_prediction(ward_id: int, req: ExplainRequest):
-    model_path = MODEL_DIR / f"xgb_h{req.horizon}.pkl"
-    if not model_path.exists():
+class WardShapInput(BaseModel):
+    ward_id: int
+    cases_7d_avg: float
+    avg_water_risk: float
+    max_coliform: float
+    avg_ph: float
+
+
+class BatchExplainRequest(BaseModel):
+    wards: List[WardShapInput]
+    horizon: int = 7
+
+
+async def _shap(horizon: int, X: np.ndarray):
+    try:
+        return await executor.submit(shap_task, horizon, X)
+    except FileNotFoundError:
         raise HTTPException(status_code=503, detail="Model not trained yet.")
 
-    model = joblib.load(model_path)
+
+@router.post("/batch")
+async def explain_batch(req: BatchExplainRequest):
+    """SHAP contributions for many wards at once (no GPT narrative)."""
+    if not req.wards:
+        return {"horizon": req.horizon, "results": {}}
+
+    X = np.array([[w.cases_7d_avg, w.avg_water_risk, w.max_coliform, w.avg_ph] for w in req.wards])
+    contributions, version = await _shap(req.horizon, X)
+    return {
+        "horizon": req.horizon,
+        "model_version": version,
+        "results": {w.ward_id: c for w, c in zip(req.wards, contributions)},
+    }
+
+
+async def _ward_contributions(ward_id: int, req: ExplainRequest):
     X = np.array([[req.cases_7d_avg, req.avg_water_risk, req.max_coliform, req.avg_ph]])
+    contributions, version = await _shap(req.horizon, X)
+    contributions = contributions[0]
+    cache_key = response_cache.make_key(
+        "explain",
+        ward_id=ward_id,
+        horizon=req.horizon,
+        shap=round_contributions(contributions),
+    )
+    return contributions, version, cache_key
+
+
+@router.post("/{ward_id}")
+async def explain_prediction(ward_id: int, req: ExplainRequest):
+    contributions, version, cache_key = await _ward_contributions(ward_id, req)
 
-    explainer = shap.TreeExplainer(model)
-    shap_values = explainer.shap_values(X)[0]
-    contributions = dict(zip(FEATURE_NAMES, shap_values.tolist()))
+    explanation = await response_cache.get_or_create(
+        cache_key,
+        lambda: gateway.chat_completion(
+            "explain", _explain_prompt(ward_id, req.horizon, contributions), max_tokens=200
+        ),
+    )
+
+    return {
+        "ward_id": ward_id,
+        "shap_contributions": contributions,
+        "explanation": explanation,
+        "model_version": version,
+    }
+
+
+@router.post("/{ward_id}/stream")
+async def explain_prediction_stream(ward_id: int, req: ExplainRequest, request: Request):
+    """SSE variant: a "shap" event first, then explanation tokens as GPT produces them."""
+    contributions, version, cache_key = await _ward_contributions(ward_id, req)
+    cached = await response_cache.get(cache_key)
 
-    prompt = f"""
+    async def events():
+        yield sse_event("shap", {"ward_id": ward_id, "shap_contributions": contributions, "model_version": version})
+        if cached is not None:
+            yield sse_event("token", {"text": cached})
+            yield sse_event("done", {"ward_id": ward_id, "text": cached})
+            return
+        async for event in stream_text(
+            request,
+            gateway.stream_chat_completion(
+                "explain", _explain_prompt(ward_id, req.horizon, contributions), max_tokens=200
+            ),
+            done={"ward_id": ward_id},
+            on_complete=lambda text: response_cache.set(cache_key, text),
+        ):
+            yield event
+
+    return sse_response(events())
+
+
+def _explain_prompt(ward_id: int, horizon: int, contributions: dict) -> str:
+    return f"""
 You are a public health analyst AI assistant for Neervazh Kavalan, a disease early warning system for Coimbatore. 
-For ward {ward_id}, a {req.horizon}-day outbreak risk prediction was made with these SHAP feature contributions:
+For ward {ward_id}, a {horizon}-day outbreak risk prediction was made with these SHAP feature contributions:
 {contributions}
 
 Write a 2-3 sentence plain-language explanation for a health officer describing:
@@ -59,10 +127,3 @@ Write a 2-3 sentence plain-language explanation for a health officer describing:
 - What they should pay attention to
 Keep it concise and actionable.
 """
-    response = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=200,
-    )
-    explanation = response.choices[0].message.content.strip()
-    return {"ward_id": ward_id, "shap_contributions": contributions, "explanation": explanation}
@@ -1,19 +1,18 @@
 # ─────────────────────────────────────────────────────────────
 #  TARUN — Risk Prediction Router
-#  Loads trained model from rupesh/trained_models/ and scores
+#  Scores wards on the inference executor (see tarun/inference.py)
 # ─────────────────────────────────────────────────────────────
 
-import joblib
 import numpy as np
-from pathlib import Path
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-from typing import Literal
+from typing import Dict, List, Literal, Tuple
+from ..feature_lookup import feature_lookup
+from ..inference import batcher, executor, predict_task
+from ..model_registry import FEATURE_NAMES, score_to_band
 
 router = APIRouter()
 
-MODEL_DIR = Path(__file__).parent.parent.parent / "rupesh" / "trained_models"
-
 
 class WardFeatures(BaseModel):
     cases_7d_avg: float
@@ -30,51 +29,130 @@ class PredictionResponse(BaseModel):
     model_version: str
 
 
-def _load_model(horizon: int):
-    path = MODEL_DIR / f"xgb_h{horizon}.pkl"
-    if not path.exists():
-        raise FileNotFoundError(f"Model not found: {path}. Run rupesh/train_model.py first.")
-    return joblib.load(path)
+class BatchWard(BaseModel):
+    ward_id: int
+    features: WardFeatures
 
 
-def _score_to_band(score: float) -> str:
-    if score < 25:
-        return "Low"
-    elif score < 50:
-        return "Medium"
-    elif score < 75:
-        return "High"
-    return "Critical"
+class BatchPredictionRequest(BaseModel):
+    wards: List[BatchWard]
+    horizons: List[int] = [7, 14]
+    model: Literal["xgb", "rf"] = "xgb"
 
 
-@router.post("/{ward_id}", response_model=PredictionResponse)
-async def predict_risk(
-    ward_id: int,
-    features: WardFeatures,
-    horizon: int = 7,
-):
-    if horizon not in (7, 14):
-        raise HTTPException(status_code=400, detail="horizon must be 7 or 14")
+class BatchPredictionResponse(BaseModel):
+    # ward_id → horizon_days → prediction
+    results: Dict[int, Dict[int, PredictionResponse]]
+
+
+def _to_matrix(rows: List[WardFeatures]) -> np.ndarray:
+    return np.array([
+        [f.cases_7d_avg, f.avg_water_risk, f.max_coliform, f.avg_ph]
+        for f in rows
+    ])
 
+
+async def _risk_scores(family: str, horizon: int, X: np.ndarray) -> Tuple[np.ndarray, str]:
     try:
-        model = _load_model(horizon)
+        proba, version = await executor.submit(predict_task, family, horizon, X)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return np.round(np.asarray(proba, dtype=float) * 100, 2), version
+
+
+def _check_horizons(horizons: List[int]) -> None:
+    if any(h not in (7, 14) for h in horizons):
+        raise HTTPException(status_code=400, detail="horizons must be 7 or 14")
+
+
+async def _score_wards(
+    ward_ids: List[int], X: np.ndarray, horizons: List[int], model: str
+) -> BatchPredictionResponse:
+    results: Dict[int, Dict[int, PredictionResponse]] = {wid: {} for wid in ward_ids}
+    if not ward_ids:
+        return BatchPredictionResponse(results=results)
+    for horizon in dict.fromkeys(horizons):
+        scores, version = await _risk_scores(model, horizon, X)
+        for wid, score in zip(ward_ids, scores.tolist()):
+            results[wid][horizon] = PredictionResponse(
+                ward_id=wid,
+                horizon_days=horizon,
+                risk_score=score,
+                risk_band=score_to_band(score),
+                model_version=version,
+            )
+    return BatchPredictionResponse(results=results)
+
+
+async def _score_one(ward_id: int, row: np.ndarray, horizon: int, model: str) -> PredictionResponse:
+    # Concurrent single-ward calls are stacked into one predict_proba by the batcher
+    try:
+        proba, version = await batcher.predict(model, horizon, row)
     except FileNotFoundError as e:
         raise HTTPException(status_code=503, detail=str(e))
-
-    X = np.array([[
-        features.cases_7d_avg,
-        features.avg_water_risk,
-        features.max_coliform,
-        features.avg_ph,
-    ]])
-
-    proba = model.predict_proba(X)[0][1]  # probability of outbreak
     risk_score = round(proba * 100, 2)
 
     return PredictionResponse(
         ward_id=ward_id,
         horizon_days=horizon,
         risk_score=risk_score,
-        risk_band=_score_to_band(risk_score),
-        model_version=f"xgb_h{horizon}_v1",
+        risk_band=score_to_band(risk_score),
+        model_version=version,
     )
+
+
+def _stored_features():
+    try:
+        return feature_lookup.table()
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.post("/batch", response_model=BatchPredictionResponse)
+async def predict_batch(req: BatchPredictionRequest):
+    """Score many wards for every requested horizon — one predict_proba per model."""
+    _check_horizons(req.horizons)
+    ward_ids = [w.ward_id for w in req.wards]
+    X = _to_matrix([w.features for w in req.wards])
+    return await _score_wards(ward_ids, X, req.horizons, req.model)
+
+
+@router.get("/batch", response_model=BatchPredictionResponse)
+async def predict_all_stored(
+    horizons: List[int] = Query([7, 14]),
+    model: Literal["xgb", "rf"] = "xgb",
+):
+    """Score every ward in the feature store (rupesh/feature_store/latest.parquet)."""
+    _check_horizons(horizons)
+    table = _stored_features()
+    ward_ids = [int(w) for w in table.index]
+    return await _score_wards(ward_ids, table[FEATURE_NAMES].to_numpy(dtype=float), horizons, model)
+
+
+@router.get("/{ward_id}", response_model=PredictionResponse)
+async def predict_risk_stored(
+    ward_id: int,
+    horizon: int = 7,
+    model: Literal["xgb", "rf"] = "xgb",
+):
+    """Like POST /predict/{ward_id}, but features come from the feature store."""
+    _check_horizons([horizon])
+    try:
+        features = feature_lookup.get(ward_id)
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"No stored features for ward {ward_id}")
+    return await _score_one(ward_id, np.array([features[name] for name in FEATURE_NAMES]), horizon, model)
+
+
+@router.post("/{ward_id}", response_model=PredictionResponse)
+async def predict_risk(
+    ward_id: int,
+    features: WardFeatures,
+    horizon: int = 7,
+    model: Literal["xgb", "rf"] = "xgb",
+):
+    if horizon not in (7, 14):
+        raise HTTPException(status_code=400, detail="horizon must be 7 or 14")
+    return await _score_one(ward_id, _to_matrix([features])[0], horizon, model)
@@ -3,20 +3,12 @@
 #  Uses GPT to suggest preventive actions based on risk score
 # ─────────────────────────────────────────────────────────────
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from pydantic import BaseModel
-from openai import AsyncOpenAI
-from pydantic_settings import BaseSettings
+from ..llm import gateway
+from ..response_cache import response_cache
+from ..streaming import sse_event, sse_response, stream_text
 
-
-class Settings(BaseSettings):
-    OPENAI_API_KEY: str = ""
-    class Config:
-        env_file = ".env"
-
-
-settings = Settings()
-client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 router = APIRouter()
 
 
@@ -28,9 +20,50 @@ class RecommendRequest(BaseModel):
     horizon_days: int = 7
 
 
+def _cache_key(ward_id: int, req: RecommendRequest) -> str:
+    return response_cache.make_key(
+        "recommend",
+        ward_id=ward_id,
+        risk_band=req.risk_band,
+        top_risk_factor=req.top_risk_factor.strip().lower(),
+        horizon_days=req.horizon_days,
+    )
+
+
 @router.post("/{ward_id}")
 async def get_recommendations(ward_id: int, req: RecommendRequest):
-    prompt = f"""
+    cache_key = _cache_key(ward_id, req)
+    recommendations = await response_cache.get_or_create(
+        cache_key,
+        lambda: gateway.chat_completion("recommend", _recommend_prompt(ward_id, req), max_tokens=300),
+    )
+    return {"ward_id": ward_id, "recommendations": recommendations}
+
+
+@router.post("/{ward_id}/stream")
+async def get_recommendations_stream(ward_id: int, req: RecommendRequest, request: Request):
+    """SSE variant of /recommend/{ward_id}."""
+    cache_key = _cache_key(ward_id, req)
+    cached = await response_cache.get(cache_key)
+
+    async def events():
+        if cached is not None:
+            yield sse_event("token", {"text": cached})
+            yield sse_event("done", {"ward_id": ward_id, "text": cached})
+            return
+        async for event in stream_text(
+            request,
+            gateway.stream_chat_completion("recommend", _recommend_prompt(ward_id, req), max_tokens=300),
+            done={"ward_id": ward_id},
+            on_complete=lambda text: response_cache.set(cache_key, text),
+        ):
+            yield event
+
+    return sse_response(events())
+
+
+def _recommend_prompt(ward_id: int, req: RecommendRequest) -> str:
+    return f"""
 You are a preventive public health expert for Coimbatore district.
 
 Ward: {req.ward_name} (ID: {ward_id})
@@ -42,10 +75,3 @@ Provide exactly 3 specific, actionable recommendations that the local health off
 
 Format as a numbered list.
 """
-    response = await client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[{"role": "user", "content": prompt}],
-        max_tokens=300,
-    )
-    recommendations = response.choices[0].message.content.strip()
-    return {"ward_id": ward_id, "recommendations": recommendations}
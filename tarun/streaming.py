@@ -0,0 +1,58 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — Server-Sent Event helpers
+#  Shared by the /stream variants of /chat, /explain, /recommend
+# ─────────────────────────────────────────────────────────────
+#
+#  Wire format (text/event-stream), one JSON payload per event:
+#    event: token   data: {"text": "..."}
+#    event: done    data: {...}            ← final, full text
+#    event: error   data: {"detail": "..."}
+#  Routers may emit extra leading events (e.g. "shap").
+# ─────────────────────────────────────────────────────────────
+
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def stream_text(
+    request: Request,
+    chunks: AsyncIterator[str],
+    done: Optional[Dict[str, Any]] = None,
+    on_complete: Optional[Callable[[str], Awaitable[None]]] = None,
+) -> AsyncIterator[str]:
+    """
+    Relay text chunks as SSE token events. If the client disconnects the
+    upstream iterator is closed, which cancels the generation.
+    """
+    parts = []
+    try:
+        async for text in chunks:
+            if await request.is_disconnected():
+                return
+            parts.append(text)
+            yield sse_event("token", {"text": text})
+    except Exception as e:
+        yield sse_event("error", {"detail": str(e)})
+        return
+    finally:
+        await chunks.aclose()
+
+    full_text = "".join(parts).strip()
+    if on_complete is not None:
+        await on_complete(full_text)
+    yield sse_event("done", {**(done or {}), "text": full_text})
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+from collections import deque
+
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+class FakeOpenAI:
+    """
+    Minimal OpenAI-compatible /chat/completions server for the gateway tests.
+    `failures` holds status codes to answer with before succeeding; `break_stream`
+    cuts the connection after the first streamed chunk.
+    """
+
+    def __init__(self):
+        self.delay = 0.0
+        self.reset()
+        self.app = Starlette(routes=[Route("/v1/chat/completions", self.completions, methods=["POST"])])
+
+    def reset(self):
+        self.failures = deque()
+        self.break_stream = False
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.peers = set()
+        self._lock = threading.Lock()
+
+    async def completions(self, request):
+        body = await request.json()
+        with self._lock:
+            self.requests += 1
+            self.peers.add(request.client)
+            status = self.failures.popleft() if self.failures else 200
+        if status != 200:
+            return JSONResponse({"error": {"message": "injected", "type": "test"}}, status_code=status)
+
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        if body.get("stream"):
+            usage = (body.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(self._chunks(usage), media_type="text/event-stream")
+        return JSONResponse({
+            "id": "cmpl-test", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": " ok "}}],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+        })
+
+    async def _chunks(self, usage):
+        for i, text in enumerate(["Boil ", "water ", "first."]):
+            if i == 1 and self.break_stream:
+                raise RuntimeError("upstream dropped the stream")
+            chunk = {"id": "cmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "test",
+                     "choices": [{"index": 0, "delta": {"content": text}, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        if usage:
+            chunk = {"id": "cmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "test",
+                     "choices": [], "usage": {"prompt_tokens": 3, "completion_tokens": 3, "total_tokens": 6}}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+@pytest.fixture(scope="session")
+def fake_openai_server():
+    fake = FakeOpenAI()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    server = uvicorn.Server(uvicorn.Config(fake.app, log_level="error", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    fake.url = "http://127.0.0.1:%d/v1" % sock.getsockname()[1]
+    yield fake
+    server.should_exit = True
+    thread.join(5)
+
+
+@pytest.fixture
+def fake_openai(fake_openai_server):
+    fake_openai_server.reset()
+    fake_openai_server.delay = 0.0
+    return fake_openai_server
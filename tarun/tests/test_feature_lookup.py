@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+from tarun.feature_lookup import FeatureLookup
+
+
+def _write(path, rows):
+    pd.DataFrame(rows).to_parquet(path, index=False)
+
+
+def _row(ward_id, **overrides):
+    row = {
+        "ward_id": ward_id,
+        "report_date": pd.Timestamp("2024-06-01"),
+        "cases_7d_avg": 4.0,
+        "avg_water_risk": 30.0,
+        "max_coliform": 12.0,
+        "avg_ph": 7.1,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_ward_without_water_features_is_dropped(tmp_path):
+    path = tmp_path / "latest.parquet"
+    _write(path, [
+        _row(1),
+        _row(2, avg_water_risk=None, max_coliform=None, avg_ph=None),  # no samples in the lookback
+        _row(3, cases_7d_avg=9.5),
+    ])
+    lookup = FeatureLookup(path)
+
+    assert list(lookup.table().index) == ["1", "3"]
+    assert lookup.get(3)["cases_7d_avg"] == 9.5
+    with pytest.raises(KeyError):
+        lookup.get(2)
+
+
+def test_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "latest.parquet"
+    _write(path, [_row(1)])
+    lookup = FeatureLookup(path)
+    assert lookup.get(1)["avg_ph"] == 7.1
+
+    _write(path, [_row(1, avg_ph=6.4)])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert lookup.get(1)["avg_ph"] == 6.4
+
+
+def test_missing_store(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        FeatureLookup(tmp_path / "latest.parquet").table()
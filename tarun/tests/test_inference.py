@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import joblib
+import numpy as np
+import pytest
+
+from rupesh.export_model import export_model
+from tarun import inference
+from tarun.inference import InferenceExecutor, MicroBatcher
+
+
+class FakeExecutor:
+    """Scores rows as their first feature; records the size of every batch."""
+
+    def __init__(self, compute_s: float = 0.0):
+        self.compute_s = compute_s
+        self.batches = []
+
+    async def submit(self, fn, family, horizon, X):
+        self.batches.append(len(X))
+        await asyncio.sleep(self.compute_s)
+        return X[:, 0], f"{family}_h{horizon}_test"
+
+
+def _row(value: float) -> np.ndarray:
+    return np.array([[value, 0.0, 0.0, 7.0]])
+
+
+def test_lone_request_does_not_wait_for_the_window():
+    async def scenario():
+        batcher = MicroBatcher(FakeExecutor(), max_rows=64, max_wait_ms=200)
+        started = time.perf_counter()
+        result = await batcher.predict("xgb", 7, _row(0.4))
+        return result, time.perf_counter() - started
+
+    result, elapsed = asyncio.run(scenario())
+    assert result == (0.4, "xgb_h7_test")
+    assert elapsed < 0.1
+
+
+def test_burst_from_idle_is_batched():
+    async def scenario():
+        executor = FakeExecutor()
+        batcher = MicroBatcher(executor, max_rows=64, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.predict("xgb", 7, _row(i / 10)) for i in range(10)))
+        return executor.batches, results
+
+    batches, results = asyncio.run(scenario())
+    assert batches == [10]
+    assert [p for p, _ in results] == [i / 10 for i in range(10)]
+
+
+def test_arrivals_while_a_batch_runs_are_collected():
+    async def scenario():
+        executor = FakeExecutor(compute_s=0.03)
+        batcher = MicroBatcher(executor, max_rows=64, max_wait_ms=50)
+
+        async def staggered(i):
+            await asyncio.sleep(0.002 * i)
+            return await batcher.predict("xgb", 7, _row(i))
+
+        await asyncio.gather(*(staggered(i) for i in range(12)))
+        return executor.batches
+
+    batches = asyncio.run(scenario())
+    assert batches[0] == 1  # nothing else pending yet: flushed at once
+    assert len(batches) <= 3 and max(batches[1:]) >= 5
+
+
+def test_batches_split_by_model_and_max_rows():
+    async def scenario():
+        executor = FakeExecutor()
+        batcher = MicroBatcher(executor, max_rows=4, max_wait_ms=20)
+        calls = [batcher.predict("xgb", 7, _row(i)) for i in range(6)] + [batcher.predict("rf", 14, _row(1))]
+        results = await asyncio.gather(*calls)
+        return sorted(executor.batches), results[-1], batcher.stats()
+
+    batches, rf_result, stats = asyncio.run(scenario())
+    assert batches == [1, 2, 4]
+    assert rf_result == (1.0, "rf_h14_test")
+    assert stats["rows"] == 7
+
+
+def test_process_mode_reports_versions_from_the_workers(tmp_path, monkeypatch):
+    ensemble = pytest.importorskip("sklearn.ensemble")
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    model = ensemble.RandomForestClassifier(n_estimators=5, max_depth=3, random_state=0).fit(X, X[:, 0] > 0)
+    joblib.dump(model, tmp_path / "rf_h7.pkl")
+    export_model(model, "rf", 7, tmp_path)
+
+    # Forked workers inherit the patched model directory; the parent registry stays empty
+    monkeypatch.setattr(inference.registry, "model_dir", tmp_path)
+    monkeypatch.setattr(inference.registry, "_models", {})
+    executor = InferenceExecutor("process", workers=1, queue_depth=1)
+    executor.start()
+    try:
+        versions = asyncio.run(executor.model_versions())
+    finally:
+        executor.shutdown()
+
+    assert inference.registry.loaded_versions() == {}
+    assert list(versions) == ["rf_h7.npz"]
+    assert versions["rf_h7.npz"].startswith("rf_h7_")
@@ -0,0 +1,187 @@
+import asyncio
+
+import pytest
+
+from tarun.llm import LLMGateway, Settings
+
+
+def _gateway(fake, **overrides) -> LLMGateway:
+    options = dict(
+        OPENAI_API_KEY="test",
+        OPENAI_BASE_URL=fake.url,
+        LLM_MODEL="test",
+        LLM_MAX_CONCURRENCY=3,
+        LLM_ROUTE_CONCURRENCY=2,
+        LLM_MAX_RETRIES=3,
+        LLM_BACKOFF_BASE_S=0.001,
+        LLM_BACKOFF_MAX_S=0.01,
+    )
+    options.update(overrides)
+    return LLMGateway(Settings(**options))
+
+
+def _run(fake, scenario, **overrides):
+    async def main():
+        gateway = _gateway(fake, **overrides)
+        try:
+            return await scenario(gateway)
+        finally:
+            await gateway.aclose()
+
+    return asyncio.run(main())
+
+
+async def _collect(chunks):
+    return [text async for text in chunks]
+
+
+def test_route_concurrency_is_capped(fake_openai):
+    fake_openai.delay = 0.05
+
+    async def scenario(gateway):
+        await asyncio.gather(*(gateway.chat_completion("chat", "hi", 5) for _ in range(8)))
+
+    _run(fake_openai, scenario)
+    assert fake_openai.requests == 8
+    assert fake_openai.max_in_flight == 2
+
+
+def test_global_concurrency_is_capped(fake_openai):
+    fake_openai.delay = 0.05
+
+    async def scenario(gateway):
+        await asyncio.gather(*(
+            gateway.chat_completion(route, "hi", 5) for route in ("chat", "explain", "recommend") for _ in range(4)
+        ))
+
+    _run(fake_openai, scenario)
+    assert fake_openai.requests == 12
+    assert fake_openai.max_in_flight == 3
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_retryable_status_is_retried_with_backoff(fake_openai, status):
+    fake_openai.failures.extend([status, status])
+    waits = []
+
+    async def scenario(gateway):
+        backoff = gateway._backoff
+        gateway._backoff = lambda attempt: waits.append(attempt) or backoff(attempt)
+        return await gateway.chat_completion("chat", "hi", 5), gateway.stats()["chat"]
+
+    text, stats = _run(fake_openai, scenario)
+    assert text == "ok"
+    assert fake_openai.requests == 3
+    assert waits == [0, 1]
+    assert stats["retries"] == 2 and stats["errors"] == 0 and stats["calls"] == 1
+    assert stats["prompt_tokens"] == 3 and stats["completion_tokens"] == 1
+
+
+def test_gives_up_after_max_retries(fake_openai):
+    import openai
+
+    fake_openai.failures.extend([503] * 10)
+
+    async def scenario(gateway):
+        with pytest.raises(openai.InternalServerError):
+            await gateway.chat_completion("chat", "hi", 5)
+        return gateway.stats()["chat"]
+
+    stats = _run(fake_openai, scenario, LLM_MAX_RETRIES=2)
+    assert fake_openai.requests == 3
+    assert stats["retries"] == 2 and stats["errors"] == 1
+
+
+def test_client_error_is_not_retried(fake_openai):
+    import openai
+
+    fake_openai.failures.append(400)
+
+    async def scenario(gateway):
+        with pytest.raises(openai.BadRequestError):
+            await gateway.chat_completion("chat", "hi", 5)
+
+    _run(fake_openai, scenario)
+    assert fake_openai.requests == 1
+
+
+def test_backoff_is_capped_full_jitter(fake_openai):
+    gateway = _gateway(fake_openai, LLM_BACKOFF_BASE_S=0.5, LLM_BACKOFF_MAX_S=8.0)
+    for attempt in range(8):
+        cap = min(8.0, 0.5 * 2 ** attempt)
+        assert all(0 <= gateway._backoff(attempt) <= cap for _ in range(50))
+
+
+def test_stream_open_is_retried(fake_openai):
+    fake_openai.failures.append(429)
+
+    async def scenario(gateway):
+        return await _collect(gateway.stream_chat_completion("chat", "hi", 5))
+
+    assert _run(fake_openai, scenario) == ["Boil ", "water ", "first."]
+    assert fake_openai.requests == 2
+
+
+def test_stream_is_not_retried_after_first_chunk(fake_openai):
+    fake_openai.break_stream = True
+    received = []
+
+    async def scenario(gateway):
+        with pytest.raises(Exception):
+            async for text in gateway.stream_chat_completion("chat", "hi", 5):
+                received.append(text)
+        return gateway.stats()["chat"]
+
+    stats = _run(fake_openai, scenario)
+    assert received == ["Boil "]
+    assert fake_openai.requests == 1
+    assert stats["retries"] == 0
+
+
+def test_client_is_built_once_and_reused(fake_openai):
+    async def scenario(gateway):
+        client = gateway.client
+        for _ in range(5):
+            await gateway.chat_completion("chat", "hi", 5)
+        await _collect(gateway.stream_chat_completion("explain", "hi", 5))
+        return client is gateway.client
+
+    assert _run(fake_openai, scenario)
+    assert fake_openai.requests == 6
+    assert len(fake_openai.peers) == 1  # one pooled keep-alive connection
+
+
+def test_stream_records_token_usage(fake_openai):
+    async def scenario(gateway):
+        chunks = await _collect(gateway.stream_chat_completion("explain", "hi", 5))
+        return chunks, gateway.stats()["explain"]
+
+    chunks, stats = _run(fake_openai, scenario)
+    assert chunks == ["Boil ", "water ", "first."]
+    assert stats["prompt_tokens"] == 3
+    assert stats["completion_tokens"] == 3
+
+
+def test_chat_routes_record_token_usage(fake_openai, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from tarun.routers import chat
+
+    gateway = _gateway(fake_openai)
+    monkeypatch.setattr(chat, "gateway", gateway)
+    chat.get_chain.cache_clear()
+    app = FastAPI()
+    app.include_router(chat.router, prefix="/chat")
+    try:
+        with TestClient(app) as client:
+            assert client.post("/chat/", json={"question": "hi"}).json()["answer"] == " ok "
+            assert gateway.stats()["chat"]["prompt_tokens"] == 3
+            assert gateway.stats()["chat"]["completion_tokens"] == 1
+
+            body = client.post("/chat/stream", json={"question": "hi"}).text
+            assert "Boil " in body
+            assert gateway.stats()["chat"]["prompt_tokens"] == 6
+            assert gateway.stats()["chat"]["completion_tokens"] == 4
+    finally:
+        chat.get_chain.cache_clear()
@@ -0,0 +1,113 @@
+import asyncio
+import socket
+from types import SimpleNamespace
+
+import pytest
+
+from tarun import response_cache as module
+from tarun.response_cache import MemoryBackend, RedisBackend, ResponseCache, round_contributions
+from tarun.routers.recommend import RecommendRequest, _cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_key_ignores_argument_order():
+    a = ResponseCache.make_key("explain", ward_id=3, horizon=7, shap={"ph": 0.1, "coliform": 0.4})
+    b = ResponseCache.make_key("explain", shap={"coliform": 0.4, "ph": 0.1}, horizon=7, ward_id=3)
+    assert a == b
+    assert a.startswith("kavalan:explain:")
+    assert a != ResponseCache.make_key("recommend", ward_id=3, horizon=7, shap={"ph": 0.1, "coliform": 0.4})
+    assert a != ResponseCache.make_key("explain", ward_id=3, horizon=14, shap={"ph": 0.1, "coliform": 0.4})
+
+
+def test_shap_noise_below_rounding_shares_a_key():
+    key = lambda shap: ResponseCache.make_key("explain", ward_id=1, horizon=7, shap=round_contributions(shap))
+    assert key({"avg_ph": 0.1234, "max_coliform": -0.4}) == key({"avg_ph": 0.1241, "max_coliform": -0.4004})
+    assert key({"avg_ph": 0.12}) != key({"avg_ph": 0.13})
+
+
+def test_recommend_key_normalises_free_text_and_ignores_raw_score():
+    base = dict(risk_score=71.2, risk_band="High", ward_name="Ward 12", top_risk_factor="Coliform", horizon_days=7)
+    a = _cache_key(12, RecommendRequest(**base))
+    b = _cache_key(12, RecommendRequest(**{**base, "risk_score": 73.9, "top_risk_factor": "  coliform "}))
+    assert a == b
+    assert a != _cache_key(12, RecommendRequest(**{**base, "risk_band": "Critical"}))
+
+
+def test_entries_expire_after_ttl(clock):
+    async def scenario():
+        cache = ResponseCache(MemoryBackend(10), ttl=60)
+        await cache.set("k", {"text": "boil water"})
+        clock.now += 59
+        fresh = await cache.get("k")
+        clock.now += 2
+        return fresh, await cache.get("k"), cache.stats()
+
+    fresh, expired, stats = asyncio.run(scenario())
+    assert fresh == {"text": "boil water"}
+    assert expired is None
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    async def scenario():
+        backend = MemoryBackend(2)
+        await backend.set("a", "1", 60)
+        await backend.set("b", "2", 60)
+        await backend.get("a")  # b is now the least recently used
+        await backend.set("c", "3", 60)
+        return [await backend.get(k) for k in "abc"]
+
+    assert asyncio.run(scenario()) == ["1", None, "3"]
+
+
+def test_falls_back_to_memory_while_redis_is_down(clock):
+    pytest.importorskip("redis")
+
+    async def scenario():
+        cache = ResponseCache(
+            RedisBackend(f"redis://127.0.0.1:{_closed_port()}/0"), ttl=60,
+            fallback=MemoryBackend(10), retry_after=30,
+        )
+        calls = []
+        created = await cache.get_or_create("k", lambda: calls.append(1) or asyncio.sleep(0, "fresh"))
+        again = await cache.get_or_create("k", lambda: calls.append(1) or asyncio.sleep(0, "fresh"))
+        degraded = cache.stats()
+        clock.now += 31  # retry window over: Redis is tried (and fails) once more
+        await cache.get("k")
+        return created, again, calls, degraded, cache.stats()
+
+    created, again, calls, degraded, stats = asyncio.run(scenario())
+    assert created == again == "fresh"
+    assert calls == [1]  # second lookup was served from the in-memory fallback
+    assert degraded["backend"] == "MemoryBackend" and degraded["errors"] == 1
+    assert stats["errors"] == 2 and stats["hits"] == 2
+
+
+def test_backend_error_without_fallback_is_a_miss():
+    class Broken:
+        async def get(self, key):
+            raise ConnectionError
+
+        async def set(self, key, value, ttl):
+            raise ConnectionError
+
+    async def scenario():
+        cache = ResponseCache(Broken(), ttl=60)
+        value = await cache.get_or_create("k", lambda: asyncio.sleep(0, "fresh"))
+        return value, cache.stats()
+
+    value, stats = asyncio.run(scenario())
+    assert value == "fresh"
+    assert stats["errors"] == 2 and stats["misses"] == 1
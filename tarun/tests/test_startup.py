@@ -0,0 +1,19 @@
+import pytest
+
+from tarun.check_startup import BUDGET_MS, HEAVY_MODULES, SCENARIOS, probe
+
+REPEATS = 3
+
+
+@pytest.mark.parametrize("routers", SCENARIOS.values(), ids=SCENARIOS.keys())
+def test_import_stays_lazy_and_within_budget(routers):
+    runs = [probe(routers) for _ in range(REPEATS)]
+
+    loaded = sorted({m for run in runs for m in run["loaded"]})
+    assert loaded == [], f"imported at startup: {', '.join(loaded)}"
+    best = min(run["ms"] for run in runs)
+    assert best <= BUDGET_MS, f"import tarun.main took {best:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_heavy_modules_cover_the_model_and_llm_stacks():
+    assert {"sklearn", "xgboost", "shap", "langchain"} <= set(HEAVY_MODULES)
@@ -0,0 +1,67 @@
+import joblib
+import numpy as np
+import pytest
+
+from rupesh.export_model import export_model
+from tarun.model_registry import ModelRegistry
+from tarun.tree_predictor import TreeEnsemble
+
+
+def _data(seed=0, n=400):
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([
+        rng.gamma(2.0, 3.0, n),       # cases_7d_avg
+        rng.uniform(0, 100, n),       # avg_water_risk
+        rng.exponential(40.0, n),     # max_coliform
+        rng.normal(7.2, 0.6, n),      # avg_ph
+    ])
+    y = (0.08 * X[:, 0] + 0.03 * X[:, 1] + 0.01 * X[:, 2] + rng.normal(0, 0.5, n) > 2.2).astype(int)
+    return X, y
+
+
+def _xgb():
+    xgboost = pytest.importorskip("xgboost")
+    X, y = _data()
+    return xgboost.XGBClassifier(n_estimators=25, max_depth=4, learning_rate=0.3).fit(X, y)
+
+
+def _rf():
+    ensemble = pytest.importorskip("sklearn.ensemble")
+    X, y = _data()
+    return ensemble.RandomForestClassifier(n_estimators=15, max_depth=6, random_state=0).fit(X, y)
+
+
+def _export(tmp_path, model, family, horizon=7):
+    joblib.dump(model, tmp_path / f"{family}_h{horizon}.pkl")
+    export_model(model, family, horizon, tmp_path)
+    return tmp_path / f"{family}_h{horizon}.npz"
+
+
+@pytest.mark.parametrize("family, build", [("xgb", _xgb), ("rf", _rf)])
+def test_compiled_predictions_match(tmp_path, family, build):
+    model = build()
+    compiled = TreeEnsemble.load(_export(tmp_path, model, family))
+    X, _ = _data(seed=1, n=500)
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-6)
+
+
+def test_compiled_xgb_handles_missing_values(tmp_path):
+    model = _xgb()
+    compiled = TreeEnsemble.load(_export(tmp_path, model, "xgb"))
+    X, _ = _data(seed=2, n=200)
+    X[::3, 1] = np.nan
+    X[::5, 2] = np.nan
+    np.testing.assert_allclose(compiled.predict_proba(X), model.predict_proba(X), rtol=0, atol=1e-6)
+
+
+@pytest.mark.parametrize("family, build", [("xgb", _xgb), ("rf", _rf)])
+def test_npz_and_pkl_report_the_same_version(tmp_path, family, build):
+    _export(tmp_path, build(), family)
+    registry = ModelRegistry(tmp_path)
+    compiled = registry.get(family, 7, compiled=True)
+    pickled = registry.get(family, 7, compiled=False)
+
+    assert compiled.path.suffix == ".npz" and pickled.path.suffix == ".pkl"
+    assert compiled.checksum != pickled.checksum
+    assert compiled.version == pickled.version
+
@@ -0,0 +1,57 @@
+# ─────────────────────────────────────────────────────────────
+#  TARUN — Compiled Tree Predictor
+#  Numpy-only scoring of rupesh/export_model.py .npz exports
+# ─────────────────────────────────────────────────────────────
+#
+#  Loading is a single np.load — no sklearn / XGBoost import and
+#  no unpickling. Prediction walks every (row, tree) pair one
+#  level per step, `depth` vectorised steps in total; leaves point
+#  to themselves so finished paths simply stay put.
+# ─────────────────────────────────────────────────────────────
+
+from pathlib import Path
+
+import numpy as np
+
+
+class TreeEnsemble:
+    def __init__(self, arrays):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        # children[2 * node + went_left] → one gather per level instead of two
+        self.children = np.stack([arrays["right"], arrays["left"]], axis=1).ravel()
+        self.default_left = arrays["default_left"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.depth = int(arrays["depth"])
+        self.link = str(arrays["link"])
+        self.base_margin = float(arrays["base_margin"])
+        # SHA-256 of the .pkl this was compiled from ("" for older exports)
+        self.source_sha256 = str(arrays["source_sha256"]) if "source_sha256" in arrays else ""
+
+    @classmethod
+    def load(cls, path: Path) -> "TreeEnsemble":
+        with np.load(path) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Same contract as the sklearn classifiers: columns [P(0), P(1)]."""
+        # Both training libraries compare float32 inputs
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        has_nan = np.isnan(X).any()
+        flat = X.ravel()
+        row_offset = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        for _ in range(self.depth):
+            x = flat[row_offset + self.feature[nodes]]
+            go_left = x < self.threshold[nodes]
+            if has_nan:
+                go_left = np.where(np.isnan(x), self.default_left[nodes], go_left)
+            nodes = self.children[2 * nodes + go_left]
+
+        leaves = self.value[nodes]
+        if self.link == "logistic":
+            p = 1.0 / (1.0 + np.exp(-(self.base_margin + leaves.sum(axis=1))))
+        else:
+            p = leaves.mean(axis=1)
+        return np.column_stack([1.0 - p, p])